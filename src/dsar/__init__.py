@@ -1,22 +1,85 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from dsar.core import DSAR
-from dsar.frequency_bands import FrequencyBands
-from dsar.plot import PlotDsar
-from dsar.sds import SDS
-from importlib.metadata import version
+# Standard library imports
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from dsar.cache import WaveformCache
+    from dsar.changepoint import CusumDetector
+    from dsar.continuous import ContinuousSeries
+    from dsar.core import DSAR
+    from dsar.frequency_bands import FrequencyBands
+    from dsar.masking import TransientMask
+    from dsar.planner import Planner
+    from dsar.plot import PlotDsar, PlotDsarBatch
+    from dsar.pyramid import AggregatePyramid
+    from dsar.quality import QualityRules
+    from dsar.sds import SDS
+    from dsar.spectral import SpectralEstimator
+    from dsar.store import ResultStore
+    from dsar.sweep import BandSweep
 
-__version__ = version("dsar")
 __author__ = "Martanto"
 __author_email__ = "martanto@live.com"
 __license__ = "MIT"
 __copyright__ = "Copyright (c) 2024"
 __url__ = "https://github.com/martanto/dsar"
 
+# Public names and the submodule defining them. Submodules are imported on first
+# attribute access (PEP 562), so ``import dsar`` stays cheap and matplotlib is only
+# loaded when plotting.
+_exports: dict[str, str] = {
+    "AggregatePyramid": "dsar.pyramid",
+    "BandSweep": "dsar.sweep",
+    "ContinuousSeries": "dsar.continuous",
+    "CusumDetector": "dsar.changepoint",
+    "DSAR": "dsar.core",
+    "FrequencyBands": "dsar.frequency_bands",
+    "Planner": "dsar.planner",
+    "PlotDsar": "dsar.plot",
+    "PlotDsarBatch": "dsar.plot",
+    "QualityRules": "dsar.quality",
+    "ResultStore": "dsar.store",
+    "SDS": "dsar.sds",
+    "SpectralEstimator": "dsar.spectral",
+    "TransientMask": "dsar.masking",
+    "WaveformCache": "dsar.cache",
+}
+
 __all__ = [
+    "AggregatePyramid",
+    "BandSweep",
+    "ContinuousSeries",
+    "CusumDetector",
     "FrequencyBands",
     "DSAR",
+    "Planner",
     "PlotDsar",
+    "PlotDsarBatch",
+    "QualityRules",
+    "ResultStore",
     "SDS",
+    "SpectralEstimator",
+    "TransientMask",
+    "WaveformCache",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "__version__":
+        from importlib.metadata import version
+
+        value = version("dsar")
+    elif name in _exports:
+        value = getattr(import_module(_exports[name]), name)
+    else:
+        raise AttributeError(f"module 'dsar' has no attribute '{name}'")
+
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_exports, "__version__"})
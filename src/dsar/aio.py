@@ -0,0 +1,107 @@
+# Standard library imports
+import asyncio
+from collections.abc import AsyncIterator, Iterable
+from concurrent.futures import Executor
+
+# Third party imports
+import pandas as pd
+
+# Project imports
+from dsar.core import DSAR
+
+
+async def iter_stations(
+    dsars: Iterable[DSAR],
+    max_concurrency: int = 4,
+    save: bool = False,
+    executor: Executor = None,
+) -> AsyncIterator[tuple[str, str, dict[str, pd.DataFrame]]]:
+    """Yield the day results of many DSAR runs as soon as each day is computed.
+
+    Every run goes through :meth:`DSAR.aiter_days`, so its days stay in order
+    and the event loop is never blocked. At most ``max_concurrency`` runs are
+    active at once; the others wait for a free slot. Reading a day of one run
+    overlaps with computing the days of the others. At most ``max_concurrency``
+    days wait to be consumed; runs pause until the consumer catches up.
+
+    If a run raises, the other runs are cancelled and the error is raised here.
+    Closing or cancelling the iterator cancels every run.
+
+    Args:
+        dsars (Iterable[DSAR]): Runs to compute, e.g. one per station.
+        max_concurrency (int, optional): Maximum number of runs active at once.
+            Defaults to 4.
+        save (bool, optional): Also save each day with :meth:`DSAR.save`.
+            Defaults to False.
+        executor (Executor, optional): Executor the blocking work of every run
+            runs in. Defaults to None (the event loop's default thread pool).
+
+    Yields:
+        tuple[str, str, dict[str, pd.DataFrame]]: The NSLC of the run, the date
+            in ``YYYY-MM-DD`` format and the mapping of NSLC to that day's DSAR
+            DataFrame.
+
+    Raises:
+        AssertionError: If ``max_concurrency`` is lower than 1.
+
+    Example:
+        >>> async for nslc, date_str, dfs in iter_stations(dsars, max_concurrency=2):
+        ...     await publish(nslc, date_str, dfs)
+    """
+    assert (
+        max_concurrency >= 1
+    ), f"\u274c max_concurrency must be at least 1. Got {max_concurrency}"
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    # Day results, errors, and a None from every run once it is over. Bounded,
+    # so runs wait for the consumer instead of piling up days in memory.
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_concurrency)
+
+    async def produce(dsar: DSAR) -> None:
+        try:
+            async with semaphore:
+                async for date_str, dfs in dsar.aiter_days(
+                    save=save, executor=executor
+                ):
+                    await queue.put((dsar.nslc, date_str, dfs))
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(None)
+
+    tasks = [asyncio.ensure_future(produce(dsar)) for dsar in dsars]
+    try:
+        running = len(tasks)
+        while running > 0:
+            item = await queue.get()
+            if item is None:
+                running -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def run_stations(
+    dsars: Iterable[DSAR], max_concurrency: int = 4, executor: Executor = None
+) -> None:
+    """Run and save many DSAR runs concurrently, like :meth:`DSAR.arun`.
+
+    Args:
+        dsars (Iterable[DSAR]): Runs to compute, e.g. one per station.
+        max_concurrency (int, optional): Maximum number of runs active at once.
+            Defaults to 4.
+        executor (Executor, optional): Executor the blocking work of every run
+            runs in. Defaults to None (the event loop's default thread pool).
+
+    Example:
+        >>> await run_stations([dsar_ojn, dsar_lek], max_concurrency=2)
+    """
+    async for _ in iter_stations(
+        dsars, max_concurrency=max_concurrency, save=True, executor=executor
+    ):
+        pass
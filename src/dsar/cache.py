@@ -0,0 +1,274 @@
+# Standard library imports
+import hashlib
+import json
+import os
+from glob import glob
+from typing import Any
+
+# Third party imports
+import numpy as np
+from obspy import Stream, Trace, UTCDateTime
+
+# Project imports
+from dsar.utilities import atomic_write, file_lock
+
+# Fraction of max_bytes the cache is brought down to when it goes over the cap,
+# so the cache directory is only scanned again after another tenth was written
+_evict_fraction: float = 0.9
+
+
+class WaveformCache:
+    """On-disk cache of merged miniSEED days as memory-mappable NumPy arrays.
+
+    Each cached day is stored as ``{key}.npy`` with the samples of every trace
+    concatenated in their original dtype, an optional ``{key}.mask.npy`` with the
+    gap mask of masked traces, and a ``{key}.json`` header with the source file's
+    size and modification time and the ID, start time, sampling rate, offset and
+    filled spans (see :func:`~dsar.utilities.merge_stream`) of every trace. Later
+    reads memory-map the arrays instead of decoding Steim frames again.
+
+    An entry is dropped as soon as its source file's size or modification time
+    changes. Entries are written through unique temporary files under a lock on
+    the entry (a ``{key}.lock`` file), which :meth:`get` also takes, so workers
+    caching the same day never mix each other's arrays and header. The size of
+    the cache is tracked as entries are written; when it goes over ``max_bytes``
+    the least recently used entries are evicted down to 90 % of it. Only the
+    trace ID, start time, sampling rate and filled spans of each trace are
+    restored; other miniSEED header fields are not kept.
+
+    Attributes:
+        cache_dir (str): Directory holding the cached arrays.
+        max_bytes (int): Size cap of the cache.
+
+    Example:
+        >>> cache = WaveformCache("output/cache", max_bytes=20 * 1024**3)
+        >>> dsar = DSAR(..., cache=cache)
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 10 * 1024**3):
+        """Initialize the cache.
+
+        Args:
+            cache_dir (str): Directory holding the cached arrays. Created if it
+                does not exist.
+            max_bytes (int, optional): Size cap of the cache in bytes. Defaults to
+                10 GiB.
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+        # Size of the cache as last scanned plus the entries written since
+        self._size: int | None = None
+
+    def __repr__(self) -> str:
+        return f"WaveformCache(cache_dir={self.cache_dir}, max_bytes={self.max_bytes})"
+
+    def _path(self, filepath: str, fill_value: Any) -> str:
+        """Return the path of an entry without extension."""
+        key = hashlib.sha1(
+            f"{os.path.abspath(filepath)}|{fill_value!r}".encode()
+        ).hexdigest()
+        return os.path.join(self.cache_dir, key)
+
+    @staticmethod
+    def _source(filepath: str) -> dict[str, int]:
+        stat = os.stat(filepath)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _remove(self, path: str) -> None:
+        for suffix in (".json", ".npy", ".mask.npy"):
+            try:
+                os.remove(f"{path}{suffix}")
+            except FileNotFoundError:
+                pass
+
+    def get(self, filepath: str, fill_value: Any = "interpolate") -> Stream | None:
+        """Return the cached merged stream of a miniSEED file.
+
+        Args:
+            filepath (str): Path of the source miniSEED file.
+            fill_value (Any, optional): Value the stream was merged with.
+                Defaults to ``"interpolate"``.
+
+        Returns:
+            Stream | None: Stream whose trace data are copy-on-write memory maps,
+                or None if the file is not cached or changed since.
+        """
+        path = self._path(filepath, fill_value)
+
+        with file_lock(path):
+            try:
+                with open(f"{path}.json", encoding="utf-8") as f:
+                    header = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                return None
+
+            # Entries written before filled spans were recorded are decoded again
+            stale = fill_value is not None and any(
+                "filled" not in info for info in header["traces"]
+            )
+            if stale or header["source"] != self._source(filepath):
+                self._remove(path)
+                return None
+
+            try:
+                data = np.load(f"{path}.npy", mmap_mode="c")
+                mask = (
+                    np.load(f"{path}.mask.npy", mmap_mode="r")
+                    if header["masked"]
+                    else None
+                )
+            except (FileNotFoundError, ValueError):
+                self._remove(path)
+                return None
+
+            # Touch the header so eviction sees this entry as recently used
+            os.utime(f"{path}.json")
+
+        stream = Stream()
+        for info in header["traces"]:
+            start, end = info["offset"], info["offset"] + info["npts"]
+            samples = data[start:end]
+            if mask is not None and mask[start:end].any():
+                samples = np.ma.masked_array(samples, mask=mask[start:end])
+
+            network, station, location, channel = info["id"].split(".")
+            stream.append(
+                Trace(
+                    data=samples,
+                    header={
+                        "network": network,
+                        "station": station,
+                        "location": location,
+                        "channel": channel,
+                        "starttime": UTCDateTime(info["starttime"]),
+                        "sampling_rate": info["sampling_rate"],
+                        "filled": info.get("filled", []),
+                    },
+                )
+            )
+
+        return stream
+
+    def put(
+        self, filepath: str, stream: Stream, fill_value: Any = "interpolate"
+    ) -> None:
+        """Store the merged stream of a miniSEED file and enforce the size cap.
+
+        Args:
+            filepath (str): Path of the source miniSEED file.
+            stream (Stream): Merged stream read from ``filepath``.
+            fill_value (Any, optional): Value the stream was merged with.
+                Defaults to ``"interpolate"``.
+        """
+        if len(stream) == 0:
+            return
+
+        path = self._path(filepath, fill_value)
+
+        traces: list[dict[str, Any]] = []
+        offset = 0
+        for trace in stream:
+            traces.append(
+                {
+                    "id": trace.id,
+                    "starttime": str(trace.stats.starttime),
+                    "sampling_rate": trace.stats.sampling_rate,
+                    "npts": trace.stats.npts,
+                    "offset": offset,
+                    "filled": trace.stats.get("filled", []),
+                }
+            )
+            offset += trace.stats.npts
+
+        data = np.concatenate([np.ma.getdata(trace.data) for trace in stream])
+        masked = any(np.ma.is_masked(trace.data) for trace in stream)
+
+        header = {
+            "source": self._source(filepath),
+            "filepath": os.path.abspath(filepath),
+            "fill_value": repr(fill_value),
+            "masked": masked,
+            "traces": traces,
+        }
+
+        with file_lock(path):
+            with atomic_write(f"{path}.npy", "wb") as f:
+                np.save(f, data)
+
+            if masked:
+                mask = np.concatenate(
+                    [np.ma.getmaskarray(trace.data) for trace in stream]
+                )
+                with atomic_write(f"{path}.mask.npy", "wb") as f:
+                    np.save(f, mask)
+
+            with atomic_write(f"{path}.json", encoding="utf-8") as f:
+                json.dump(header, f)
+
+        if self._size is None:
+            self._size = self.size()
+        else:
+            self._size += data.nbytes + (data.size if masked else 0)
+
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def size(self) -> int:
+        """Return the total size of the cached arrays in bytes.
+
+        Returns:
+            int: Size in bytes.
+        """
+        return sum(
+            os.path.getsize(path)
+            for path in glob(os.path.join(self.cache_dir, "*.npy"))
+        )
+
+    def evict(self) -> list[str]:
+        """Drop least recently used entries if the cache is over ``max_bytes``.
+
+        Entries are dropped until the cache is below 90 % of ``max_bytes``, so
+        :meth:`put` does not scan the cache again for every new entry.
+
+        Returns:
+            list[str]: Source files whose entries were dropped.
+        """
+        entries: list[tuple[float, str, int, str]] = []
+        for header_file in glob(os.path.join(self.cache_dir, "*.json")):
+            path = header_file[: -len(".json")]
+            try:
+                size = sum(
+                    os.path.getsize(f"{path}{suffix}")
+                    for suffix in (".npy", ".mask.npy")
+                    if os.path.exists(f"{path}{suffix}")
+                )
+                with open(header_file, encoding="utf-8") as f:
+                    source = json.load(f)["filepath"]
+                entries.append((os.path.getmtime(header_file), path, size, source))
+            except (FileNotFoundError, json.JSONDecodeError):
+                # Removed by another worker while scanning
+                continue
+
+        total = sum(size for _, _, size, _ in entries)
+
+        evicted: list[str] = []
+        if total > self.max_bytes:
+            for _, path, size, source in sorted(entries):
+                if total <= _evict_fraction * self.max_bytes:
+                    break
+                with file_lock(path):
+                    self._remove(path)
+                total -= size
+                evicted.append(source)
+
+        self._size = total
+        return evicted
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        for header_file in glob(os.path.join(self.cache_dir, "*.json")):
+            self._remove(header_file[: -len(".json")])
+        self._size = None
@@ -0,0 +1,308 @@
+# Standard library imports
+import json
+import math
+import os
+from collections.abc import Callable
+from typing import Any
+
+# Third party imports
+import pandas as pd
+from typing_extensions import Self
+
+# Project imports
+from dsar.utilities import atomic_write
+
+
+class CusumDetector:
+    """Online two-sided CUSUM change-point detector for DSAR series.
+
+    Keeps a constant-size state per NSLC: an exponentially weighted baseline
+    mean and variance of the (log) DSAR value and the two cumulative sums. Every
+    new value updates that state in O(1), so evaluating alerts across stations
+    does not depend on the length of the history. The state can be persisted to a
+    JSON file and reloaded by the next run.
+
+    An alert is raised when the upward (or downward) cumulative sum of the
+    standardized deviations exceeds ``threshold``. The baseline then restarts at
+    the new level, so a single change raises a single alert. Optionally, an alert
+    is also raised whenever the raw value crosses above ``level``.
+
+    Attributes:
+        alerts (list[dict[str, Any]]): Alerts raised since the detector was created.
+        states (dict[str, dict[str, Any]]): Detector state of every NSLC.
+
+    Example:
+        >>> detector = CusumDetector(threshold=8.0, state_file="output/cusum.json")
+        >>> for _, dfs in dsar.iter_days():
+        ...     for nslc, df in dfs.items():
+        ...         detector.update_frame(nslc, df)
+        >>> detector.save()
+    """
+
+    def __init__(
+        self,
+        threshold: float = 8.0,
+        drift: float = 0.5,
+        column: str = "DSAR_24h_median",
+        span: int = 1008,
+        warmup: int = 144,
+        min_std: float = 0.05,
+        direction: str = "up",
+        level: float = None,
+        log: bool = True,
+        state_file: str = None,
+        callback: Callable[[dict[str, Any]], None] = None,
+    ):
+        """Initialize the detector.
+
+        Args:
+            threshold (float, optional): Cumulative sum, in baseline standard
+                deviations, above which an alert is raised. Defaults to 8.0.
+            drift (float, optional): Deviation, in baseline standard deviations,
+                tolerated per value before it accumulates. Defaults to 0.5.
+            column (str, optional): DataFrame column consumed by
+                :meth:`update_frame`. Defaults to ``"DSAR_24h_median"``.
+            span (int, optional): Span, in values, of the exponentially weighted
+                baseline. Defaults to 1008 (one week of 10-minute values).
+            warmup (int, optional): Number of values used to settle the baseline
+                before alerts are raised. Defaults to 144.
+            min_std (float, optional): Lower bound of the baseline standard
+                deviation, so a very smooth series does not turn tiny wiggles into
+                large standardized deviations. In log units with ``log=True``
+                (0.05 is about 5 %). Defaults to 0.05.
+            direction (str, optional): ``"up"``, ``"down"`` or ``"both"``.
+                Defaults to ``"up"``.
+            level (float, optional): Raise an alert when the raw value crosses
+                above this level. Defaults to None.
+            log (bool, optional): Track the logarithm of the value, so rises are
+                measured as ratios. Defaults to True.
+            state_file (str, optional): JSON file used by :meth:`load` and
+                :meth:`save`. Loaded on creation when it exists. Defaults to None.
+            callback (Callable[[dict[str, Any]], None], optional): Function called
+                with every alert. Defaults to None.
+
+        Raises:
+            ValueError: If ``direction`` is not ``"up"``, ``"down"`` or ``"both"``.
+        """
+        if direction not in ("up", "down", "both"):
+            raise ValueError(
+                f"direction must be 'up', 'down' or 'both'. Got '{direction}'"
+            )
+
+        self.threshold = threshold
+        self.drift = drift
+        self.column = column
+        self.alpha = 2 / (span + 1)
+        self.warmup = warmup
+        self.min_std = min_std
+        self.direction = direction
+        self.level = level
+        self.log = log
+        self.state_file = state_file
+        self.callback = callback
+
+        self.states: dict[str, dict[str, Any]] = {}
+        self.alerts: list[dict[str, Any]] = []
+
+        if state_file is not None and os.path.exists(state_file):
+            self.load()
+
+    def __repr__(self) -> str:
+        return (
+            f"CusumDetector(threshold={self.threshold}, drift={self.drift}, "
+            f"column={self.column}, direction={self.direction}, level={self.level}, "
+            f"stations={list(self.states)})"
+        )
+
+    def _new_state(self) -> dict[str, Any]:
+        return {
+            "count": 0,
+            "mean": 0.0,
+            "var": 0.0,
+            "positive": 0.0,
+            "negative": 0.0,
+            "above_level": False,
+            "last_time": None,
+        }
+
+    def _alert(
+        self, nslc: str, kind: str, timestamp: pd.Timestamp, value: float, score: float
+    ) -> dict[str, Any]:
+        alert = {
+            "nslc": nslc,
+            "kind": kind,
+            "datetime": str(timestamp),
+            "value": value,
+            "score": score,
+        }
+        print(f"\U0001f6a8 {nslc} : {kind} alert at {timestamp} (value={value:.3f})")
+
+        self.alerts.append(alert)
+        if self.callback is not None:
+            self.callback(alert)
+
+        return alert
+
+    def update(
+        self, nslc: str, timestamp: pd.Timestamp, value: float
+    ) -> list[dict[str, Any]]:
+        """Feed a single value and return the alerts it raises.
+
+        Values that are not newer than the last value seen for ``nslc`` or not
+        finite are ignored, so overlapping reruns do not count values twice.
+
+        Args:
+            nslc (str): NSLC identifier of the series.
+            timestamp (pd.Timestamp): Time of the value.
+            value (float): DSAR value.
+
+        Returns:
+            list[dict[str, Any]]: Alerts with ``nslc``, ``kind`` (``"rise"``,
+                ``"drop"`` or ``"level"``), ``datetime``, ``value`` and ``score``.
+
+        Example:
+            >>> detector.update("VG.OJN.00.EHZ", pd.Timestamp("2025-01-01"), 150.0)
+        """
+        state = self.states.setdefault(nslc, self._new_state())
+        timestamp = pd.Timestamp(timestamp)
+
+        if state["last_time"] is not None and timestamp <= pd.Timestamp(
+            state["last_time"]
+        ):
+            return []
+        if not math.isfinite(value) or (self.log and value <= 0):
+            return []
+
+        state["last_time"] = str(timestamp)
+        alerts: list[dict[str, Any]] = []
+
+        if self.level is not None:
+            above = value > self.level
+            if above and not state["above_level"]:
+                alerts.append(self._alert(nslc, "level", timestamp, value, value))
+            state["above_level"] = above
+
+        x = math.log(value) if self.log else value
+        state["count"] += 1
+
+        if state["count"] == 1:
+            state["mean"] = x
+            return alerts
+
+        deviation = x - state["mean"]
+
+        if state["count"] > self.warmup:
+            z = deviation / max(math.sqrt(state["var"]), self.min_std)
+            state["positive"] = max(0.0, state["positive"] + z - self.drift)
+            state["negative"] = max(0.0, state["negative"] - z - self.drift)
+
+            kind = None
+            if self.direction in ("up", "both") and state["positive"] > self.threshold:
+                kind, score = "rise", state["positive"]
+            elif (
+                self.direction in ("down", "both")
+                and state["negative"] > self.threshold
+            ):
+                kind, score = "drop", state["negative"]
+
+            if kind is not None:
+                alerts.append(self._alert(nslc, kind, timestamp, value, score))
+                state["positive"] = 0.0
+                state["negative"] = 0.0
+                state["mean"] = x
+                return alerts
+
+        state["mean"] += self.alpha * deviation
+        state["var"] = (1 - self.alpha) * (
+            state["var"] + self.alpha * deviation * deviation
+        )
+
+        return alerts
+
+    def update_frame(self, nslc: str, df: pd.DataFrame) -> list[dict[str, Any]]:
+        """Feed the new values of a DSAR DataFrame and return the alerts raised.
+
+        Only rows newer than the last value seen for ``nslc`` are consumed.
+
+        Args:
+            nslc (str): NSLC identifier of the series.
+            df (pd.DataFrame): DataFrame with a datetime index and ``self.column``.
+
+        Returns:
+            list[dict[str, Any]]: Alerts raised by the new values.
+
+        Example:
+            >>> detector.update_frame(dsar.nslc, dsar.dfs[dsar.nslc])
+        """
+        if df.empty or self.column not in df.columns:
+            return []
+
+        series = df[self.column].sort_index()
+
+        last_time = self.states.get(nslc, {}).get("last_time")
+        if last_time is not None:
+            series = series[series.index > pd.Timestamp(last_time)]
+
+        alerts: list[dict[str, Any]] = []
+        for timestamp, value in series.items():
+            alerts.extend(self.update(nslc, timestamp, float(value)))
+
+        return alerts
+
+    def reset(self, nslc: str = None) -> None:
+        """Forget the state of one NSLC, or of every NSLC.
+
+        Args:
+            nslc (str, optional): NSLC to reset. Defaults to None (all).
+        """
+        if nslc is None:
+            self.states = {}
+        else:
+            self.states.pop(nslc, None)
+
+    def load(self, state_file: str = None) -> Self:
+        """Load the detector state from a JSON file.
+
+        Args:
+            state_file (str, optional): Path of the state file. Defaults to
+                ``self.state_file``.
+
+        Returns:
+            Self: The current CusumDetector instance.
+        """
+        state_file = self.state_file if state_file is None else state_file
+
+        with open(state_file, encoding="utf-8") as f:
+            self.states = json.load(f)
+
+        return self
+
+    def save(self, state_file: str = None) -> str:
+        """Persist the detector state to a JSON file.
+
+        The file is written to a unique temporary path first and then renamed, so
+        an interrupted save never leaves a truncated state behind and workers
+        saving at the same time never write to the same temporary file.
+
+        Args:
+            state_file (str, optional): Path of the state file. Defaults to
+                ``self.state_file``.
+
+        Returns:
+            str: Path of the saved state file.
+
+        Raises:
+            ValueError: If no state file is configured.
+        """
+        state_file = self.state_file if state_file is None else state_file
+        if state_file is None:
+            raise ValueError("No state_file configured")
+
+        directory = os.path.dirname(state_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with atomic_write(state_file, encoding="utf-8") as f:
+            json.dump(self.states, f, indent=2)
+
+        return state_file
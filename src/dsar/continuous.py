@@ -0,0 +1,254 @@
+# Standard library imports
+import os
+import re
+from glob import glob
+
+# Third party imports
+import pandas as pd
+
+# Project imports
+from dsar.utilities import atomic_write, combine_csv_files, file_lock
+
+# Suffix of the monthly CSV files
+_month_pattern = re.compile(r"^\d{4}-\d{2}\.csv$")
+
+# Centered rolling medians of the DSAR ratio and their window lengths
+smoothing_windows: dict[str, str] = {
+    "DSAR_6h_median": "6h",
+    "DSAR_24h_median": "24h",
+}
+
+
+def smooth(df: pd.DataFrame, column: str) -> pd.DataFrame:
+    """Add the centered rolling medians of ``smoothing_windows`` to a DataFrame.
+
+    Args:
+        df (pd.DataFrame): DSAR results with a sorted DatetimeIndex.
+        column (str): Column smoothed, e.g. ``"DSAR_10min"``.
+
+    Returns:
+        pd.DataFrame: ``df`` with one column per smoothing window.
+    """
+    for name, window in smoothing_windows.items():
+        df[name] = df[column].rolling(window, center=True).median()
+    return df
+
+
+class ContinuousSeries:
+    """Continuous DSAR series of one NSLC, smoothed across day boundaries.
+
+    :meth:`DSAR.calculate` smooths every day on its own, so the rolling medians
+    near midnight only see half a window. This store keeps the whole series in
+    one CSV file per month::
+
+        {dsar_dir}/{nslc}/{resample}/continuous/{nslc}_{resample}_{YYYY-MM}.csv
+
+    and recomputes the rolling medians whenever a day is appended or replaced
+    with :meth:`update`. Only the rows within half the longest window (12 hours)
+    of the new day change, so only those are recomputed, reading one more half
+    window of context on each side, and only the monthly files holding them are
+    rewritten: usually one, two around the turn of a month. Updates of the same series
+    are serialized by a lock on its ``continuous`` directory (a
+    ``continuous.lock`` file next to it), so workers saving neighbouring days
+    do not overwrite each other's rows.
+
+    Example:
+        >>> series = ContinuousSeries("output/dsar", "VG.OJN.00.EHZ")
+        >>> series.update(dsar.dfs["VG.OJN.00.EHZ"])
+        >>> df = series.read("2025-01-01", "2025-02-01")
+    """
+
+    def __init__(self, dsar_dir: str, nslc: str, resample: str = "10min"):
+        """Initialize the series.
+
+        Args:
+            dsar_dir (str): DSAR output directory.
+            nslc (str): NSLC identifier (e.g., ``"VG.OJN.00.EHZ"``).
+            resample (str, optional): Resample interval of the daily CSV files.
+                Defaults to ``"10min"``.
+        """
+        self.dsar_dir = dsar_dir
+        self.nslc = nslc
+        self.resample = resample
+
+    def __repr__(self) -> str:
+        return (
+            f"ContinuousSeries(dsar_dir={self.dsar_dir}, nslc={self.nslc}, "
+            f"resample={self.resample})"
+        )
+
+    @property
+    def column(self) -> str:
+        """Return the DSAR column smoothed.
+
+        Returns:
+            str: ``DSAR_{resample}``.
+        """
+        return f"DSAR_{self.resample}"
+
+    @property
+    def margin(self) -> pd.Timedelta:
+        """Return half the longest smoothing window.
+
+        Returns:
+            pd.Timedelta: Reach of a change on the smoothed columns.
+        """
+        return max(pd.Timedelta(window) for window in smoothing_windows.values()) / 2
+
+    @property
+    def csv_dir(self) -> str:
+        """Return the directory of the monthly CSV files.
+
+        Returns:
+            str: ``{dsar_dir}/{nslc}/{resample}/continuous``.
+        """
+        return os.path.join(self.dsar_dir, self.nslc, self.resample, "continuous")
+
+    def month_path(self, month: str) -> str:
+        """Return the CSV file of one month.
+
+        Args:
+            month (str): Month of the rows in ``YYYY-MM`` format.
+
+        Returns:
+            str: Path of the CSV file.
+        """
+        return os.path.join(self.csv_dir, f"{self.nslc}_{self.resample}_{month}.csv")
+
+    def months(self) -> list[str]:
+        """List the months stored.
+
+        Returns:
+            list[str]: Sorted months in ``YYYY-MM`` format.
+        """
+        if not os.path.isdir(self.csv_dir):
+            return []
+
+        prefix = f"{self.nslc}_{self.resample}_"
+        return sorted(
+            name[len(prefix) : -len(".csv")]
+            for name in os.listdir(self.csv_dir)
+            if name.startswith(prefix) and _month_pattern.match(name[len(prefix) :])
+        )
+
+    def _read_month(self, month: str) -> pd.DataFrame:
+        csv_file = self.month_path(month)
+        if not os.path.exists(csv_file):
+            return pd.DataFrame()
+        return pd.read_csv(csv_file, index_col="datetime", parse_dates=True)
+
+    def _write_month(self, month: str, df: pd.DataFrame) -> str:
+        csv_file = self.month_path(month)
+        os.makedirs(self.csv_dir, exist_ok=True)
+
+        df.index.name = "datetime"
+        with atomic_write(csv_file, newline="") as f:
+            df.to_csv(f, index=True)
+
+        return csv_file
+
+    def read(self, start: str = None, end: str = None) -> pd.DataFrame:
+        """Read the series between two dates.
+
+        Args:
+            start (str, optional): Start of the range, inclusive. Defaults to None.
+            end (str, optional): End of the range, inclusive. Defaults to None.
+
+        Returns:
+            pd.DataFrame: Rows of the range sorted by datetime, or an empty
+                DataFrame if there are none.
+        """
+        first = f"{pd.Timestamp(start):%Y-%m}" if start is not None else None
+        last = f"{pd.Timestamp(end):%Y-%m}" if end is not None else None
+
+        df_list: list[pd.DataFrame] = []
+        for month in self.months():
+            if (first is not None and month < first) or (
+                last is not None and month > last
+            ):
+                continue
+            df_list.append(self._read_month(month))
+
+        df_list = [df for df in df_list if not df.empty]
+        if len(df_list) == 0:
+            return pd.DataFrame()
+
+        return pd.concat(df_list).sort_index().loc[start:end]
+
+    def update(self, df: pd.DataFrame) -> list[str]:
+        """Append or replace the days covered by ``df`` and re-smooth around them.
+
+        Every row of the calendar days spanned by ``df`` is replaced by ``df``.
+        The smoothed columns are then recomputed for the rows within
+        :attr:`margin` of those days, from a context of twice the margin on each
+        side, and only the monthly files holding those rows are rewritten.
+
+        Args:
+            df (pd.DataFrame): DSAR results of one or more days, e.g. a day of
+                ``dsar.dfs``.
+
+        Returns:
+            list[str]: Paths of the CSV files written.
+
+        Example:
+            >>> series.update(dsar.dfs["VG.OJN.00.EHZ"])
+        """
+        if df.empty:
+            return []
+
+        start = df.index.min().floor("D")
+        end = df.index.max().floor("D") + pd.Timedelta("1D")
+        margin = self.margin
+
+        csv_files: list[str] = []
+        with file_lock(self.csv_dir):
+            context = self.read(start - 2 * margin, end + 2 * margin)
+            if not context.empty:
+                context = context.loc[(context.index < start) | (context.index >= end)]
+            context = pd.concat([context, df]).sort_index()
+
+            affected = smooth(context, self.column).loc[
+                start - margin : end + margin - pd.Timedelta(1, "ns")
+            ]
+
+            for month, rows in affected.groupby(affected.index.strftime("%Y-%m")):
+                existing = self._read_month(month)
+                if not existing.empty:
+                    replaced = (existing.index >= start) & (existing.index < end)
+                    existing = existing.loc[
+                        ~replaced & ~existing.index.isin(rows.index)
+                    ]
+                    rows = pd.concat([existing, rows]).sort_index()
+                csv_files.append(self._write_month(month, rows))
+
+        return csv_files
+
+    def build(self) -> list[str]:
+        """(Re)build the series from the daily CSV files already on disk.
+
+        Returns:
+            list[str]: Paths of the CSV files written.
+
+        Raises:
+            FileNotFoundError: If there are no daily CSV files.
+        """
+        csv_path = os.path.join(self.dsar_dir, self.nslc, self.resample)
+        csv_files = glob(os.path.join(csv_path, "*.csv"))
+        if len(csv_files) == 0:
+            raise FileNotFoundError(f"No CSV files found in {csv_path}")
+
+        df = smooth(combine_csv_files(csv_files), self.column)
+
+        with file_lock(self.csv_dir):
+            for csv_file in glob(os.path.join(self.csv_dir, "*.csv")):
+                os.remove(csv_file)
+
+            written = [
+                self._write_month(month, rows)
+                for month, rows in df.groupby(df.index.strftime("%Y-%m"))
+            ]
+
+        print(
+            f"\u2705 {self.nslc} : Continuous series built from {len(csv_files)} days"
+        )
+        return written
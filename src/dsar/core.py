@@ -1,16 +1,41 @@
 # Standard library imports
+import asyncio
 import os
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import datetime
+from typing import TYPE_CHECKING
 
 # Third party imports
+import numpy as np
 import pandas as pd
-from obspy import Stream
+from obspy import Stream, UTCDateTime
 from typing_extensions import List, Self
 
 # Project imports
+from dsar.changepoint import CusumDetector
+from dsar.continuous import ContinuousSeries, smooth, smoothing_windows
 from dsar.frequency_bands import FrequencyBands, default_bands
+from dsar.masking import TransientMask
+from dsar.metrics import DayData, FilterState, Metric, get_metric
+from dsar.processing import contiguous_segments, decimate, decimation_factor
+from dsar.pyramid import AggregatePyramid
+from dsar.quality import QualityRules
+from dsar.reducer import WindowReducer
 from dsar.sds import SDS
-from dsar.utilities import trace_to_series
+from dsar.spectral import SpectralEstimator
+from dsar.store import ResultStore
+from dsar.utilities import atomic_write, filled_samples, stream_to_array
+
+# The FDSN client (requests, urllib3), the job queue, the planner, the band sweep,
+# and the storage and cache backends are only needed by some runs, so they are
+# imported on first use.
+if TYPE_CHECKING:
+    from dsar.cache import WaveformCache
+    from dsar.fdsn import FDSNClient
+    from dsar.jobs import JobQueue
+    from dsar.storage import Storage
+    from dsar.sweep import BandSweep
 
 
 class DSAR:
@@ -50,6 +75,27 @@ class DSAR:
         directory_structure: str = "sds",
         output_dir: str = None,
         resample: str = None,
+        statistics: list[str] = None,
+        components: list[str] = None,
+        gap_aware: bool = False,
+        min_segment_length: float = 600.0,
+        taper_percentage: float = 0.05,
+        taper_max_length: float = 60.0,
+        min_coverage: float = 0.0,
+        mask: TransientMask = None,
+        quality: QualityRules = None,
+        detector: CusumDetector = None,
+        pyramid_levels: list[str] = None,
+        continuous: bool = False,
+        continue_filters: bool = False,
+        estimator: str = "time",
+        metrics: list[Metric | str] = None,
+        decimate: bool = False,
+        decimation_oversampling: float = 5.0,
+        cache: "WaveformCache" = None,
+        n_threads: int = 1,
+        storage: "Storage" = None,
+        source: "FDSNClient" = None,
         verbose: bool = False,
         debug: bool = False,
     ):
@@ -60,7 +106,8 @@ class DSAR:
             channel (str): Channel code (e.g., ``"EHZ"``).
             network (str): Network code (e.g., ``"VG"``).
             location (str): Location code (e.g., ``"00"``).
-            input_dir (str): Path to the root SDS data directory.
+            input_dir (str): Path to the root SDS data directory, or URL of the
+                archive in object storage (e.g. ``"s3://bucket/sds"``).
             start_date (str): Start date in ``YYYY-MM-DD`` format.
             end_date (str): End date in ``YYYY-MM-DD`` format.
             directory_structure (str, optional): Type of directory structure to use.
@@ -69,12 +116,111 @@ class DSAR:
                 ``<cwd>/output/dsar``.
             resample (str, optional): Pandas offset alias for the resampling interval.
                 Defaults to ``"10min"``.
+            statistics (list[str], optional): Window statistics of the absolute
+                displacement computed for every band, see :class:`WindowReducer`.
+                The first one is the band amplitude used for the DSAR ratio, the
+                others are saved as ``{band}_{statistic}`` columns. Defaults to
+                ``["median"]``, or ``["rms"]`` with the spectral estimator.
+            components (list[str], optional): Component codes processed together,
+                e.g. ``["Z", "N", "E"]``. Channels are built from the first two
+                letters of ``channel`` (``"EHZ"`` gives ``EHZ``, ``EHN``, ``EHE``).
+                Each component gets its own DSAR, plus a combined DSAR of the
+                vector-sum displacement saved as ``{network}.{station}.{location}``
+                ``.{band}{components}`` (e.g. ``VG.OJN.00.EHZNE``). Defaults to None
+                (single channel).
+            gap_aware (bool, optional): Keep data gaps instead of interpolating them
+                and process every contiguous segment separately. Windows get a
+                ``coverage`` column with the fraction of samples actually recorded.
+                Defaults to False.
+            min_segment_length (float, optional): Minimum duration in seconds of a
+                contiguous segment in gap-aware mode. Shorter segments are skipped.
+                Defaults to 600.
+            taper_percentage (float, optional): Fraction of each segment tapered at
+                both ends in gap-aware mode. Defaults to 0.05.
+            taper_max_length (float, optional): Longest taper at each end of a
+                segment in seconds, like the ``max_length`` of ``Trace.taper``.
+                The band values of the windows overlapping a taper are masked.
+                Defaults to 60.
+            min_coverage (float, optional): Windows with a lower ``coverage`` are
+                masked in gap-aware mode. Defaults to 0.0.
+            mask (TransientMask, optional): Detector of transients such as
+                earthquakes, rockfalls and spikes, run once per day on the
+                demeaned velocity of every channel. The samples it flags are left
+                out of the windows of every band, and a ``masked_fraction``
+                column records the fraction of each window masked. Only
+                supported by the ``"time"`` estimator. Defaults to None.
+            quality (QualityRules, optional): Per-window data-quality metrics
+                computed from the raw samples of every trace: ``coverage``,
+                ``filled_fraction``, ``flatline`` and, with a ``clip_level``,
+                ``clipped`` columns are saved next to the bands, and
+                :meth:`calculate` drops the windows failing its rules. Defaults
+                to None.
+            detector (CusumDetector, optional): Online change-point detector fed
+                with every day's results as they are computed, see
+                :meth:`update_detector`. Its state is saved after each day when it
+                has a ``state_file``. Not supported by :meth:`work`. Defaults to
+                None.
+            pyramid_levels (list[str], optional): Levels of the aggregate pyramid
+                updated by :meth:`save` next to the daily CSV files, e.g.
+                ``["1h", "6h", "1d"]``. See :class:`AggregatePyramid`. Defaults to
+                None (no pyramid).
+            continuous (bool, optional): Also keep a continuous series per NSLC,
+                updated by :meth:`save`, whose rolling medians are recomputed
+                across day boundaries. See :class:`ContinuousSeries`. Defaults to
+                False.
+            continue_filters (bool, optional): Start the filters and integrals of
+                every day from the state left at the end of the previous day, when
+                the data is contiguous, instead of from rest. Removes the
+                transient at midnight without reading any padding from the
+                neighbouring days. They restart at gaps and whenever a day does
+                not follow the previous one. Only days processed in order by
+                :meth:`iter_days` (and :meth:`run`, :meth:`compute`) continue.
+                Defaults to False.
+            estimator (str, optional): ``"time"`` filters and integrates a time
+                series per band. ``"spectral"`` computes one displacement spectrum
+                per window and derives every band from it, see
+                :class:`SpectralEstimator`. Only a single ``rms``, ``median`` or
+                ``mean`` statistic is supported then, and ``statistics``
+                defaults to ``["rms"]``: ``median`` and ``mean`` assume Gaussian
+                noise and are biased low for tonal signals such as tremor.
+                Defaults to ``"time"``.
+            metrics (list[Metric | str], optional): Additional metrics computed
+                from the same decoded day, such as ``"rsam"``, ``"ssam"`` or
+                ``"frequency_index"`` (see :mod:`dsar.metrics`). They share the
+                demeaned, integrated and spectral intermediates with DSAR and are
+                saved next to the DSAR output directory. Defaults to None.
+            decimate (bool, optional): Low-pass filter and downsample each day to
+                the lowest rate that keeps the highest band corner (and every
+                metric band) intact before any band processing, see
+                :func:`decimation_factor`. Defaults to False.
+            decimation_oversampling (float, optional): Minimum ratio between the
+                decimated sampling rate and the highest band corner, at least
+                2.5. Smaller values decimate further but bias the highest band
+                low, see :func:`decimation_factor`. Defaults to 5.
+            cache (WaveformCache, optional): On-disk cache of decoded miniSEED
+                days shared by every channel. Reruns memory-map the cached
+                samples instead of decoding the files again. Defaults to None.
+            n_threads (int, optional): Number of threads filtering, integrating
+                and reducing the bands of a day concurrently. They share the
+                decoded day and its intermediates without copying. Useful to
+                update the latest day quickly; use :meth:`compute` with several
+                processes to run many days. Defaults to 1.
+            storage (Storage, optional): Store the SDS archive is read from, such
+                as an :class:`~dsar.storage.S3Storage` with a local read-through
+                cache. Defaults to None (``input_dir`` is a local directory, or a
+                URL read with fsspec).
+            source (FDSNClient, optional): FDSN web service the days are fetched
+                from instead of the SDS archive in ``input_dir``. Every channel
+                and day of the run is requested in bulk, several days per
+                request. Defaults to None (read ``input_dir``).
             verbose (bool, optional): Enable verbose logging. Defaults to False.
             debug (bool, optional): Enable debug logging. Defaults to False.
 
         Raises:
             AssertionError: If ``start_date`` is after ``end_date``.
             FileNotFoundError: If ``input_dir`` does not exist.
+            ValueError: If a statistic or the estimator is not supported, or
+                ``mask`` is used with the spectral estimator.
 
         Example:
             >>> dsar = DSAR(
@@ -99,23 +245,111 @@ class DSAR:
         self.channel = channel
         self.network = network
         self.location = location
+        if statistics is None and estimator == "spectral":
+            statistics = ["rms"]
+        self.reducer = WindowReducer(self.resample, statistics)
+        self.components = components
+        self.gap_aware = gap_aware
+        self.min_segment_length = min_segment_length
+        self.taper_percentage = taper_percentage
+        self.taper_max_length = taper_max_length
+        self.min_coverage = min_coverage
+        self.mask = mask
+        self.quality = quality
+        self.detector = detector
+        self.pyramid_levels = pyramid_levels
+        self.continuous = continuous
+        self.continue_filters = continue_filters
+        self.estimator = estimator
+
+        self.metrics: list[Metric] = [get_metric(metric) for metric in metrics or []]
+        for metric in self.metrics:
+            metric.resample = self.resample
+        self.metric_dfs: dict[str, dict[str, pd.DataFrame]] = {}
+        self.decimate = decimate
+        self.decimation_oversampling = decimation_oversampling
+        self.cache = cache
+        self.n_threads = n_threads
+
+        self.spectral: SpectralEstimator | None = None
+        if estimator == "spectral":
+            if len(self.reducer.statistics) > 1:
+                raise ValueError(
+                    "The spectral estimator computes a single statistic. "
+                    f"Got {self.reducer.statistics}"
+                )
+            if mask is not None:
+                raise ValueError("The spectral estimator does not support mask")
+            self.spectral = SpectralEstimator(
+                self.resample, statistic=self.reducer.primary
+            )
+        elif estimator != "time":
+            raise ValueError(
+                f"estimator must be 'time' or 'spectral'. Got '{estimator}'"
+            )
 
         self.nslc = f"{self.network}.{self.station}.{self.location}.{self.channel}"
         self.start_date_obj = datetime.strptime(start_date, "%Y-%m-%d")
         self.end_date_obj = datetime.strptime(end_date, "%Y-%m-%d")
-        self.sds = SDS(
-            input_dir,
-            network=self.network,
-            station=self.station,
-            channel=self.channel,
-            location=self.location,
-            verbose=verbose,
-            debug=debug,
-        )
+
+        self.channels: list[str] = [self.channel]
+        self.combined_id: str | None = None
+        if components is not None:
+            self.channels = [f"{self.channel[:2]}{c}" for c in components]
+            self.combined_id = (
+                f"{self.network}.{self.station}.{self.location}."
+                f"{self.channel[:2]}{''.join(components)}"
+            )
+
+        self.source = source
+        if source is not None:
+            from dsar.fdsn import FDSNSource
+
+        self.sources: list[SDS | FDSNSource] = []
+        for channel in self.channels:
+            if source is not None:
+                source.add(
+                    f"{self.network}.{self.station}.{self.location}.{channel}",
+                    self.dates,
+                )
+                self.sources.append(
+                    FDSNSource(
+                        source,
+                        network=self.network,
+                        station=self.station,
+                        channel=channel,
+                        location=self.location,
+                        fill_value=None if gap_aware else "interpolate",
+                        verbose=verbose,
+                        debug=debug,
+                    )
+                )
+                continue
+
+            self.sources.append(
+                SDS(
+                    input_dir,
+                    network=self.network,
+                    station=self.station,
+                    channel=channel,
+                    location=self.location,
+                    fill_value=None if gap_aware else "interpolate",
+                    cache=cache,
+                    storage=storage,
+                    verbose=verbose,
+                    debug=debug,
+                )
+            )
+        self.sds = self.sources[0]
 
         assert (
             self.start_date_obj <= self.end_date_obj
         ), f"\u274c start_date must be before end_date"
+        assert decimation_oversampling >= 2.5, (
+            "\u274c decimation_oversampling must be at least 2.5. "
+            f"Got {decimation_oversampling}"
+        )
+        assert n_threads >= 1, f"\u274c n_threads must be at least 1. Got {n_threads}"
 
         self.dfs: dict[str, pd.DataFrame] = {}
 
@@ -125,12 +359,19 @@ class DSAR:
         self._second_label: str | None = None
         self._second_bands: dict[str, List[float]] | None = None
 
+        self._filter_state: FilterState | None = None
+
     def __repr__(self) -> str:
         return (
             f"DSAR(input_dir={self.input_dir}, start_date={self.start_date}, "
             f"end_date={self.end_date}, directory_structure={self.directory_structure}, "
-            f"resample={self.resample}, first_bands={self._first_bands}, "
-            f"second_bands={self._second_bands}, bands={self.bands})"
+            f"resample={self.resample}, statistics={self.reducer.statistics}, "
+            f"components={self.components}, gap_aware={self.gap_aware}, "
+            f"estimator={self.estimator}, metrics={self.metrics}, "
+            f"decimate={self.decimate}, "
+            f"decimation_oversampling={self.decimation_oversampling}, "
+            f"first_bands={self._first_bands}, second_bands={self._second_bands}, "
+            f"bands={self.bands})"
         )
 
     def first_bands(
@@ -208,17 +449,37 @@ class DSAR:
         return bands
 
     @staticmethod
-    def process(stream: Stream, band_frequencies: list[float]) -> Stream:
+    def process(
+        stream: Stream,
+        band_frequencies: list[float],
+        gap_aware: bool = False,
+        min_segment_length: float = 0.0,
+        taper_percentage: float = 0.05,
+        taper_max_length: float = 60.0,
+    ) -> Stream:
         """Process a seismic stream for a given frequency band.
 
         Applies demean detrending, a high-pass filter, integration to displacement,
         and bandpass filtering using the provided frequency triplet.
 
+        In gap-aware mode the stream is split at its gaps instead of being merged
+        with zeros. Every contiguous segment at least ``min_segment_length`` seconds
+        long is tapered and processed on its own; shorter segments are dropped.
+        The samples within a taper are attenuated and should not be used.
+
         Args:
             stream (Stream): ObsPy Stream to process.
             band_frequencies (list[float]): List of exactly three frequencies in Hz:
                 ``[high_pass, bandpass_low, bandpass_high]``.
                 Example: ``[0.1, 8.0, 16.0]``.
+            gap_aware (bool, optional): Process contiguous segments separately.
+                Defaults to False.
+            min_segment_length (float, optional): Minimum segment duration in
+                seconds in gap-aware mode. Defaults to 0.
+            taper_percentage (float, optional): Fraction of each segment tapered at
+                both ends in gap-aware mode. Defaults to 0.05.
+            taper_max_length (float, optional): Longest taper at each end of a
+                segment in seconds in gap-aware mode. Defaults to 60.
 
         Returns:
             Stream: Processed ObsPy Stream containing displacement data.
@@ -233,20 +494,93 @@ class DSAR:
             f"\u274c band_frequencies must contain exactly 3 values. "
             f"Example: [0.1, 8.0, 16.0]"
         )
-        stream.merge(fill_value=0)
-        stream.detrend("demean")
+        if gap_aware:
+            stream = stream.split()
+            for trace in [
+                trace
+                for trace in stream
+                if trace.stats.npts * trace.stats.delta < min_segment_length
+            ]:
+                stream.remove(trace)
+            stream.detrend("demean")
+            stream.taper(max_percentage=taper_percentage, max_length=taper_max_length)
+        else:
+            stream.merge(fill_value=0)
+            stream.detrend("demean")
+
         stream.filter("highpass", freq=band_frequencies[0])
         stream.integrate()
         stream.filter("highpass", freq=band_frequencies[1])
         stream.filter("lowpass", freq=band_frequencies[2])
         return stream
 
+    def _mask_coverage(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Mask band values of windows below ``min_coverage`` in gap-aware mode.
+
+        Args:
+            df (pd.DataFrame): Window statistics of one trace with a ``coverage``
+                column.
+
+        Returns:
+            pd.DataFrame: The DataFrame with masked windows set to ``NaN``.
+        """
+        if not self.gap_aware or self.min_coverage <= 0:
+            return df
+
+        columns = [
+            column
+            for column in df.columns
+            if column not in ("coverage", "masked_fraction")
+        ]
+        df.loc[df["coverage"] < self.min_coverage, columns] = np.nan
+        return df
+
+    def _mask_tapered(self, df: pd.DataFrame, day: DayData) -> pd.DataFrame:
+        """Mask band values of windows overlapping the taper of a segment.
+
+        Args:
+            df (pd.DataFrame): Window statistics of one trace.
+            day (DayData): Day the statistics were computed from.
+
+        Returns:
+            pd.DataFrame: The DataFrame with masked windows set to ``NaN``.
+        """
+        tapered = day.tapered_windows(self.reducer.window_ns)
+        if len(tapered) == 0:
+            return df
+
+        columns = [
+            column
+            for column in df.columns
+            if column not in ("coverage", "masked_fraction")
+        ]
+        df.loc[df.index.isin(tapered), columns] = np.nan
+        return df
+
+    def _band_column(self, band_name: str, statistic: str) -> str:
+        """Return the column name of a band statistic.
+
+        Args:
+            band_name (str): Label of the frequency band (e.g., ``"LF"``).
+            statistic (str): Window statistic (e.g., ``"p90"``).
+
+        Returns:
+            str: ``band_name`` for the primary statistic, otherwise
+                ``{band_name}_{statistic}``.
+        """
+        if statistic == self.reducer.primary:
+            return band_name
+        return f"{band_name}_{statistic}"
+
     def calculate(self, dfs: dict[str, pd.DataFrame]) -> Self:
         """Calculate DSAR values and rolling median smoothings.
 
         Computes the ratio of the first to the second frequency band amplitudes,
-        then applies 6-hour and 24-hour centered rolling medians. Duplicate indices
-        are removed and gaps are interpolated.
+        then applies 6-hour and 24-hour centered rolling medians within the day
+        (see :class:`ContinuousSeries` to smooth across days). Duplicate indices
+        are removed and gaps are interpolated. For every additional window statistic
+        (except ``count``) the ratio is also stored as ``DSAR_{resample}_{statistic}``.
+        With ``quality``, windows failing its rules are dropped first.
 
         Args:
             dfs (dict[str, pd.DataFrame]): Dictionary mapping station NSLC identifiers
@@ -264,13 +598,19 @@ class DSAR:
         for station, df in dfs.items():
             default_name: str = "DSAR_{}".format(self.resample)
 
+            if self.quality is not None:
+                df = dfs[station] = df.loc[self.quality.passes(df)].copy()
+
             dfs[station][default_name] = df[first_label] / df[second_label]
-            dfs[station]["DSAR_6h_median"] = (
-                df[default_name].rolling("6h", center=True).median()
-            )
-            dfs[station]["DSAR_24h_median"] = (
-                df[default_name].rolling("24h", center=True).median()
-            )
+            dfs[station] = smooth(dfs[station], default_name)
+
+            for statistic in self.reducer.statistics[1:]:
+                if statistic == "count":
+                    continue
+                dfs[station][f"{default_name}_{statistic}"] = (
+                    df[self._band_column(first_label, statistic)]
+                    / df[self._band_column(second_label, statistic)]
+                )
 
             dfs[station] = dfs[station].dropna()
             dfs[station] = dfs[station].loc[~dfs[station].index.duplicated(), :]
@@ -280,87 +620,918 @@ class DSAR:
 
         return self
 
-    def save(self, date_str: str) -> str | None:
-        """Save the daily DSAR calculation results to a CSV file.
+    def _save_csv(
+        self, output_directory: str, station: str, df: pd.DataFrame, date_str: str
+    ) -> str:
+        """Write one day of results to ``{output_directory}/{station}/{resample}``.
+
+        The file is written to a unique temporary path first and then renamed, so
+        a crash never leaves a truncated CSV behind and two workers running the
+        same day never share a temporary file.
+        """
+        date: str = str(df.first_valid_index()).split(" ")[0]
+
+        csv_directory: str = os.path.join(output_directory, station, self.resample)
+        os.makedirs(csv_directory, exist_ok=True)
+
+        csv_file: str = os.path.join(csv_directory, f"{station}_{date}.csv")
+
+        with atomic_write(csv_file, newline="") as f:
+            df.to_csv(f, index=True)
+        print(f"\U0001f4be {date_str} : Saved to {csv_file}")
+
+        return csv_file
+
+    @property
+    def output_directory(self) -> str:
+        """Return the directory the DSAR CSV files are saved to.
+
+        Returns:
+            str: ``output_dir``, or ``<cwd>/output/dsar`` (created if needed).
+        """
+        if self.output_dir is not None:
+            return self.output_dir
+
+        output_directory = os.path.join(os.getcwd(), "output", "dsar")
+        os.makedirs(output_directory, exist_ok=True)
+        return output_directory
+
+    def update_detector(self, date_str: str, saved: bool = False) -> None:
+        """Feed the results of a day to ``detector`` and save its state.
+
+        The daily rolling medians only see the hours of their own day near
+        midnight. When the continuous series of every NSLC is kept
+        (``continuous=True``) and the day was saved, a smoothed ``detector``
+        column is read from it instead, up to half the longest smoothing window
+        before the end of the day: those rows no longer change when the next day
+        is added, and the rest follow with the next day. Days must be fed in
+        order, as older values are ignored by the detector.
+
+        Args:
+            date_str (str): Date in ``YYYY-MM-DD`` format.
+            saved (bool, optional): Whether the day was saved with :meth:`save`,
+                which updates the continuous series. Defaults to False.
+        """
+        from_series = (
+            self.continuous and saved and self.detector.column in smoothing_windows
+        )
+
+        for nslc, df in self.dfs.items():
+            if from_series:
+                series = ContinuousSeries(self.output_directory, nslc, self.resample)
+                start = pd.Timestamp(date_str) - series.margin
+                end = start + pd.Timedelta("1D") - pd.Timedelta(1, "ns")
+                df = series.read(start, end)
+            self.detector.update_frame(nslc, df)
+
+        if self.detector.state_file is not None:
+            self.detector.save()
+
+    def save(self, date_str: str) -> list[str]:
+        """Save the daily DSAR calculation results to CSV files.
+
+        One CSV file is written per NSLC in ``self.dfs`` (e.g. each component and
+        the combined vector sum in multi-component mode). With ``pyramid_levels``,
+        the aggregate pyramid of the band amplitudes and the DSAR ratio is updated
+        with the same day. The results of every configured metric are saved with
+        the same layout in a sibling directory named after the metric (e.g.
+        ``output/rsam`` next to ``output/dsar``).
 
         Args:
             date_str (str): Date string in ``YYYY-MM-DD`` format, used for log messages.
 
         Returns:
-            str | None: Path to the saved CSV file if successful; a warning message
-                string if the DataFrame is empty; or ``None`` if ``self.dfs`` is empty.
+            list[str]: Paths to the saved CSV files. Empty DataFrames are skipped
+                with a warning.
 
         Example:
-            >>> path = dsar.save("2025-01-01")
+            >>> paths = dsar.save("2025-01-01")
         """
-        output_directory = self.output_dir
-
-        if output_directory is None:
-            output_directory: str = os.path.join(os.getcwd(), "output", "dsar")
-            os.makedirs(output_directory, exist_ok=True)
+        output_directory = self.output_directory
+        csv_files: list[str] = []
 
         for station, df in self.dfs.items():
-            if not df.empty:
-                date: str = str(df.first_valid_index()).split(" ")[0]
+            if df.empty:
+                print(
+                    f"\u26a0\ufe0f {date_str} : Not saved. Not enough data for {station}"
+                )
+                continue
+
+            csv_files.append(self._save_csv(output_directory, station, df, date_str))
+
+            if self.pyramid_levels is not None:
+                AggregatePyramid(
+                    output_directory,
+                    station,
+                    resample=self.resample,
+                    levels=self.pyramid_levels,
+                    columns=[*self.bands, f"DSAR_{self.resample}"],
+                ).update(df)
+
+            if self.continuous:
+                ContinuousSeries(output_directory, station, self.resample).update(df)
+
+        parent_directory = os.path.dirname(os.path.normpath(output_directory))
+        for name, dfs in self.metric_dfs.items():
+            for station, df in dfs.items():
+                if df.empty:
+                    continue
+                csv_files.append(
+                    self._save_csv(
+                        os.path.join(parent_directory, name), station, df, date_str
+                    )
+                )
+
+        return csv_files
+
+    def load(self, date: datetime) -> Stream:
+        """Load the stream of every configured channel for a single day.
+
+        Args:
+            date (datetime): Day to load.
+
+        Returns:
+            Stream: Traces of all channels, or an empty Stream if none was found.
+        """
+        stream = Stream()
+        for sds in self.sources:
+            stream += sds.get(date)
+        return stream
+
+    async def aload(self, date: datetime, executor: Executor = None) -> Stream:
+        """Load the stream of every configured channel without blocking the loop.
+
+        Every channel is read in ``executor`` at the same time.
+
+        Args:
+            date (datetime): Day to load.
+            executor (Executor, optional): Executor the reads run in. Defaults to
+                None (the event loop's default thread pool).
+
+        Returns:
+            Stream: Traces of all channels, or an empty Stream if none was found.
+
+        Example:
+            >>> stream = await dsar.aload(datetime(2025, 1, 1))
+        """
+        loop = asyncio.get_running_loop()
+        streams = await asyncio.gather(
+            *(loop.run_in_executor(executor, sds.get, date) for sds in self.sources)
+        )
+
+        stream = Stream()
+        for channel_stream in streams:
+            stream += channel_stream
+        return stream
+
+    def decimation_factor(
+        self, sampling_rate: float, bands: dict[str, list[float]] = None
+    ) -> int:
+        """Return the decimation factor applied to data at ``sampling_rate``.
+
+        Args:
+            sampling_rate (float): Native sampling rate in Hz.
+            bands (dict[str, list[float]], optional): Bands to keep intact.
+                Defaults to :attr:`bands`.
+
+        Returns:
+            int: 1 unless ``decimate`` is enabled, otherwise the largest factor
+                keeping the highest band corner and every metric band intact.
+        """
+        if not self.decimate:
+            return 1
+
+        bands = self.bands if bands is None else bands
+        frequencies = [band_frequencies[2] for band_frequencies in bands.values()]
+        for metric in self.metrics:
+            if metric.max_frequency is None:
+                return 1
+            frequencies.append(metric.max_frequency)
+
+        return decimation_factor(
+            sampling_rate, max(frequencies), self.decimation_oversampling
+        )
+
+    @staticmethod
+    def _decimate(
+        data: np.ndarray, segments: list[tuple[int, int]], factor: int
+    ) -> tuple[np.ndarray, list[tuple[int, int]]]:
+        """Decimate every contiguous segment onto the ``factor`` times coarser grid.
+
+        Segments are trimmed to start on a multiple of ``factor`` so the decimated
+        samples keep their original timestamps.
+
+        Args:
+            data (np.ndarray): ``(n_rows, npts)`` samples.
+            segments (list[tuple[int, int]]): ``[start, end)`` bounds of the
+                contiguous segments.
+            factor (int): Decimation factor.
+
+        Returns:
+            tuple[np.ndarray, list[tuple[int, int]]]: Decimated samples (``NaN``
+                outside the segments) and the segment bounds on the new grid.
+        """
+        decimated = np.full(data.shape[:-1] + (-(-data.shape[-1] // factor),), np.nan)
+        decimated_segments: list[tuple[int, int]] = []
+
+        for start, end in segments:
+            start = -(-start // factor) * factor
+            # Too short for the zero-phase anti-alias filter
+            if end - start < 64 * factor:
+                continue
+
+            values = decimate(data[:, start:end], factor)
+            first = start // factor
+            decimated[:, first : first + values.shape[-1]] = values
+            decimated_segments.append((first, first + values.shape[-1]))
+
+        return decimated, decimated_segments
+
+    def prepare_day(
+        self,
+        date_str: str,
+        stream: Stream,
+        bands: dict[str, list[float]] = None,
+        state: FilterState = None,
+    ) -> DayData | None:
+        """Align, segment and optionally decimate the samples of a single day.
+
+        Args:
+            date_str (str): Date string in ``YYYY-MM-DD`` format, used for log messages.
+            stream (Stream): Stream returned by :meth:`load`.
+            bands (dict[str, list[float]], optional): Bands the day is prepared
+                for, which limit the decimation. Defaults to :attr:`bands`.
+            state (FilterState, optional): Final state of the previous day,
+                continued if the day follows it. Defaults to None.
+
+        Returns:
+            DayData | None: Decoded day shared by every band and metric, or None if
+                no segment is long enough.
+        """
+        data, starttime, sampling_rate, ids = stream_to_array(stream)
+
+        quality = None
+        if self.quality is not None:
+            quality = self.window_quality(date_str, stream, data, starttime, ids)
+
+        if self.gap_aware:
+            segments = contiguous_segments(
+                np.isfinite(data).all(axis=0),
+                min_length=int(self.min_segment_length * sampling_rate),
+            )
+        else:
+            data = np.nan_to_num(data, nan=0.0)
+            segments = [(0, data.shape[-1])]
+
+        factor = self.decimation_factor(sampling_rate, bands)
+        if factor > 1:
+            print(
+                f"\U0001f53b {date_str} : Decimating by {factor} to "
+                f"{sampling_rate / factor:g} Hz"
+            )
+            data, segments = self._decimate(data, segments, factor)
+            sampling_rate = sampling_rate / factor
+
+        if len(segments) == 0:
+            return None
+
+        return DayData(
+            data,
+            starttime=pd.Timestamp(starttime.datetime),
+            sampling_rate=sampling_rate,
+            ids=ids,
+            segments=segments,
+            taper_percentage=self.taper_percentage if self.gap_aware else 0.0,
+            taper_max_length=self.taper_max_length,
+            quality=quality,
+            state=state,
+            continuation=self.continue_filters,
+        )
+
+    def window_quality(
+        self,
+        date_str: str,
+        stream: Stream,
+        data: np.ndarray,
+        starttime: UTCDateTime,
+        ids: list[str],
+    ) -> dict[str, pd.DataFrame]:
+        """Compute the quality metrics of every window from the raw samples.
+
+        Samples missing from ``data`` count as filled unless the day is processed
+        gap-aware, where they are left out of ``coverage`` instead.
+
+        Args:
+            date_str (str): Date string in ``YYYY-MM-DD`` format, used for log messages.
+            stream (Stream): Stream returned by :meth:`load`.
+            data (np.ndarray): ``(n_rows, npts)`` samples aligned by
+                :func:`stream_to_array`.
+            starttime (UTCDateTime): Time of the first sample.
+            ids (list[str]): Trace ID of every row.
+
+        Returns:
+            dict[str, pd.DataFrame]: Mapping of NSLC to the quality metrics of
+                every window, see :class:`QualityRules`.
+        """
+        print(f"\U0001f9ee {date_str} : Calculating window quality of {', '.join(ids)}")
+
+        filled = filled_samples(stream, starttime, data.shape[-1], ids)
+        if not self.gap_aware:
+            filled |= np.isnan(data)
+
+        trace_ids = list(ids)
+        combined = self.combined_id is not None and len(ids) == len(self.channels)
+        if combined:
+            trace_ids.append(self.combined_id)
+
+        quality_dfs = self.quality.compute(
+            data,
+            filled,
+            starttime=pd.Timestamp(starttime.datetime),
+            sampling_rate=stream[0].stats.sampling_rate,
+            reducer=self.reducer,
+            combined=combined,
+        )
+        return dict(zip(trace_ids, quality_dfs, strict=True))
+
+    def reduce_bands(
+        self, date_str: str, day: DayData, bands: dict[str, list[float]]
+    ) -> dict[str, pd.DataFrame]:
+        """Compute the window statistics of every band of a decoded day.
+
+        Every band is filtered, integrated and reduced along the time axis in one
+        vectorized call per contiguous segment, sharing the intermediates cached
+        by ``day``. In multi-component mode the vector sum of the component
+        displacements is reduced as an extra row. With the spectral estimator,
+        every band is derived from one spectrum per window instead.
+
+        Args:
+            date_str (str): Date string in ``YYYY-MM-DD`` format, used for log messages.
+            day (DayData): Day returned by :meth:`prepare_day`.
+            bands (dict[str, list[float]]): Mapping of band name to its frequency
+                triplet, e.g. :attr:`bands`.
+
+        Returns:
+            dict[str, pd.DataFrame]: Mapping of NSLC to the window statistics of
+                every band.
+        """
+        dfs: dict[str, pd.DataFrame] = {
+            trace_id: pd.DataFrame() for trace_id in day.ids
+        }
+
+        combined: bool = self.combined_id is not None and len(day.ids) == len(
+            self.channels
+        )
+        if combined:
+            dfs[self.combined_id] = pd.DataFrame()
+
+        if self.spectral is not None:
+            print(
+                f"\U0001f9ee {date_str} : Calculating {', '.join(dfs)} for "
+                f"{', '.join(bands)} from spectra"
+            )
+
+            band_dfs = self.spectral.reduce_bands(
+                day.masked,
+                starttime=day.starttime,
+                sampling_rate=day.sampling_rate,
+                bands=bands,
+                combined=combined,
+                coverage=self.gap_aware or self.quality is not None,
+                spectrum=day.spectrum(self.spectral),
+            )
+            return {
+                trace_id: self._mask_coverage(df)
+                for trace_id, df in zip(list(dfs), band_dfs, strict=True)
+            }
+
+        mask = None
+        if self.mask is not None:
+            mask = day.transient_mask(self.mask)
+            print(
+                f"\U0001f9ee {date_str} : Masked {mask.mean():.2%} of samples "
+                f"as transients"
+            )
 
-                csv_directory: str = os.path.join(
-                    output_directory, station, self.resample
+        def reduce_band(band_frequencies: list[float]) -> list[pd.DataFrame]:
+            displacement = day.band_displacement(band_frequencies)
+
+            if combined:
+                displacement = np.vstack(
+                    [displacement, np.sqrt(np.sum(displacement**2, axis=0))]
+                )
+
+            return self.reducer.reduce_rows(
+                displacement,
+                starttime=day.starttime,
+                sampling_rate=day.sampling_rate,
+                coverage=self.gap_aware or self.quality is not None,
+                mask=mask,
+            )
+
+        # Bands run on a thread pool sharing the read-only day; NumPy and the
+        # SciPy filters release the GIL for their array work.
+        with ThreadPoolExecutor(max_workers=self.n_threads) as executor:
+            futures = {}
+            for band_name, band_frequencies in bands.items():
+                print(
+                    f"\U0001f9ee {date_str} : Calculating {', '.join(dfs)} for {band_name}"
                 )
-                os.makedirs(csv_directory, exist_ok=True)
+                futures[band_name] = executor.submit(reduce_band, band_frequencies)
+
+            for band_name, future in futures.items():
+                for trace_id, df in zip(list(dfs), future.result(), strict=True):
+                    # Shared by every band, kept once per trace
+                    shared = {
+                        column: df.pop(column)
+                        for column in ("coverage", "masked_fraction")
+                        if column in df
+                    }
+                    df = df.rename(
+                        columns={
+                            statistic: self._band_column(band_name, statistic)
+                            for statistic in df.columns
+                        }
+                    )
+                    for column, values in shared.items():
+                        if column not in dfs[trace_id]:
+                            df[column] = values
+                    dfs[trace_id] = pd.concat([dfs[trace_id], df], axis=1)
+
+        return {
+            trace_id: self._mask_coverage(self._mask_tapered(df, day))
+            for trace_id, df in dfs.items()
+        }
+
+    def process_day(self, date_str: str, stream: Stream) -> dict[str, pd.DataFrame]:
+        """Compute the band amplitudes of every channel for a single day.
+
+        All channels are aligned into one ``(n_channels, npts)`` array by
+        :meth:`prepare_day`, then every band is reduced by :meth:`reduce_bands` and
+        every configured metric is computed from the same decoded day. With
+        ``continue_filters``, the day continues the filter state of the day
+        processed before it when it follows that day without a gap.
+
+        Args:
+            date_str (str): Date string in ``YYYY-MM-DD`` format, used for log messages.
+            stream (Stream): Stream returned by :meth:`load`.
+
+        Returns:
+            dict[str, pd.DataFrame]: Mapping of NSLC to the window statistics of
+                every band. Empty if no segment is long enough.
+        """
+        self.metric_dfs = {}
+
+        day = self.prepare_day(date_str, stream, state=self._filter_state)
+        if day is None:
+            self._filter_state = None
+            return {}
+
+        if day.continued:
+            print(f"\u231b {date_str} : Filters continued from the previous day")
+        elif self._filter_state is not None:
+            print(
+                f"\u26a0\ufe0f {date_str} : Not contiguous with the previous day. "
+                f"Filters restarted"
+            )
+
+        dfs = self.reduce_bands(date_str, day, self.bands)
+        if day.quality is not None:
+            dfs = {
+                trace_id: df.join(day.quality[trace_id]) for trace_id, df in dfs.items()
+            }
+        self.compute_metrics(date_str, day)
+
+        self._filter_state = day.final_state()
+
+        return dfs
+
+    def compute_metrics(
+        self, date_str: str, day: DayData
+    ) -> dict[str, dict[str, pd.DataFrame]]:
+        """Compute every configured metric from a decoded day.
+
+        Args:
+            date_str (str): Date string in ``YYYY-MM-DD`` format, used for log messages.
+            day (DayData): Decoded day shared with the DSAR bands.
+
+        Returns:
+            dict[str, dict[str, pd.DataFrame]]: Mapping of metric name to the
+                window values of every trace ID, also stored in
+                ``self.metric_dfs``.
+        """
+        self.metric_dfs = {}
+
+        for metric in self.metrics:
+            print(f"\U0001f9ee {date_str} : Calculating {metric.name}")
+            self.metric_dfs[metric.name] = {
+                trace_id: df.dropna(how="all")
+                for trace_id, df in zip(day.ids, metric.compute(day), strict=True)
+            }
+
+        return self.metric_dfs
+
+    def iter_days(
+        self, save: bool = False
+    ) -> Iterator[tuple[str, dict[str, pd.DataFrame]]]:
+        """Yield the DSAR results of every day as soon as they are computed.
+
+        Iterates day by day from ``start_date`` to ``end_date``, loading seismic
+        streams from the SDS archive, processing each frequency band and computing
+        DSAR ratios. Days without data are skipped. Writing CSV files is optional.
+
+        Args:
+            save (bool, optional): Also save each day with :meth:`save`.
+                Defaults to False.
+
+        Yields:
+            tuple[str, dict[str, pd.DataFrame]]: The date in ``YYYY-MM-DD`` format
+                and the mapping of NSLC to that day's DSAR DataFrame.
+
+        Example:
+            >>> for date_str, dfs in dsar.iter_days():
+            ...     print(date_str, dfs[dsar.nslc]["DSAR_24h_median"].mean())
+        """
+        for date_str in self.dates:
+            dfs = self.run_date(date_str, save=save)
+            if dfs is not None:
+                yield date_str, dfs
+
+    async def aiter_days(
+        self, save: bool = False, executor: Executor = None
+    ) -> AsyncIterator[tuple[str, dict[str, pd.DataFrame]]]:
+        """Asynchronous :meth:`iter_days` for use in an asyncio event loop.
+
+        Reading, decoding, filtering and saving run in ``executor``, so the event
+        loop is never blocked. Days are processed in order, one at a time, while
+        the next day is already being read, so reading overlaps with computing.
+
+        Cancelling the consumer stops the iteration: the read of the next day is
+        cancelled and no other day is started. A day already being processed
+        cannot be interrupted and finishes in its worker; its files are written
+        atomically.
+
+        Args:
+            save (bool, optional): Also save each day with :meth:`save`.
+                Defaults to False.
+            executor (Executor, optional): Executor the blocking work runs in,
+                e.g. a ``ThreadPoolExecutor`` shared by several stations. NumPy,
+                SciPy and the miniSEED decoder release the GIL for most of it.
+                Defaults to None (the event loop's default thread pool).
+
+        Yields:
+            tuple[str, dict[str, pd.DataFrame]]: The date in ``YYYY-MM-DD`` format
+                and the mapping of NSLC to that day's DSAR DataFrame.
+
+        Example:
+            >>> async for date_str, dfs in dsar.aiter_days():
+            ...     await publish(date_str, dfs[dsar.nslc])
+        """
+        loop = asyncio.get_running_loop()
+        dates = self.dates
+
+        def read(index: int) -> asyncio.Future:
+            date = datetime.strptime(dates[index], "%Y-%m-%d")
+            return asyncio.ensure_future(self.aload(date, executor))
+
+        upcoming = read(0) if dates else None
+        try:
+            for index, date_str in enumerate(dates):
+                print("==============================")
+                print(f"\u231b {date_str} : Get stream for {date_str}")
+                stream = await upcoming
+                upcoming = read(index + 1) if index + 1 < len(dates) else None
+
+                dfs = await loop.run_in_executor(
+                    executor, self.run_stream, date_str, stream, save
+                )
+                if dfs is not None:
+                    yield date_str, dfs
+        finally:
+            if upcoming is not None:
+                upcoming.cancel()
+
+    @property
+    def dates(self) -> list[str]:
+        """Return every date from ``start_date`` to ``end_date``.
+
+        Returns:
+            list[str]: Dates in ``YYYY-MM-DD`` format.
+        """
+        return [
+            date_obj.strftime("%Y-%m-%d")
+            for date_obj in pd.date_range(self.start_date, self.end_date, freq="D")
+        ]
+
+    def run_date(
+        self, date_str: str, save: bool = False, raise_errors: bool = False
+    ) -> dict[str, pd.DataFrame] | None:
+        """Compute (and optionally save) the DSAR results of a single day.
+
+        Args:
+            date_str (str): Date in ``YYYY-MM-DD`` format.
+            save (bool, optional): Also save the day with :meth:`save`.
+                Defaults to False.
+            raise_errors (bool, optional): Raise the errors of reading and
+                processing the day instead of skipping it. Days without data are
+                still skipped. Defaults to False.
+
+        Returns:
+            dict[str, pd.DataFrame] | None: Mapping of NSLC to that day's DSAR
+                DataFrame, or None if the day was skipped.
+
+        Example:
+            >>> dfs = dsar.run_date("2025-01-01", save=True)
+        """
+        print("==============================")
+        print(f"\u231b {date_str} : Get stream for {date_str}")
+
+        raise_read_errors = [source.raise_errors for source in self.sources]
+        for source in self.sources:
+            source.raise_errors = raise_errors or source.raise_errors
+        try:
+            stream: Stream = self.load(datetime.strptime(date_str, "%Y-%m-%d"))
+        finally:
+            for source, raise_read_error in zip(
+                self.sources, raise_read_errors, strict=True
+            ):
+                source.raise_errors = raise_read_error
+
+        return self.run_stream(date_str, stream, save=save, raise_errors=raise_errors)
+
+    def run_stream(
+        self,
+        date_str: str,
+        stream: Stream,
+        save: bool = False,
+        raise_errors: bool = False,
+    ) -> dict[str, pd.DataFrame] | None:
+        """Compute (and optionally save) the DSAR results of a day already loaded.
+
+        Args:
+            date_str (str): Date in ``YYYY-MM-DD`` format.
+            stream (Stream): Stream of the day returned by :meth:`load`.
+            save (bool, optional): Also save the day with :meth:`save`.
+                Defaults to False.
+            raise_errors (bool, optional): Raise the errors of processing the day
+                instead of skipping it. Defaults to False.
+
+        Returns:
+            dict[str, pd.DataFrame] | None: Mapping of NSLC to that day's DSAR
+                DataFrame, or None if the day was skipped.
+        """
+        if stream.count() == 0:
+            print(f"\u274c {date_str} : No trace(s) found. Skipping")
+            return None
+
+        print(f"\u2705 {date_str} : Found {stream.count()} trace(s) in stream")
+
+        try:
+            dfs = self.process_day(date_str, stream)
+        except ValueError as e:
+            print(f"\u274c {date_str} : {e}. Skipping")
+            if raise_errors:
+                raise
+            return None
+
+        if len(dfs) == 0:
+            print(f"\u274c {date_str} : No segment long enough. Skipping")
+            return None
+
+        self.calculate(dfs=dfs)
+
+        if save:
+            self.save(date_str=date_str)
+
+        if self.detector is not None:
+            self.update_detector(date_str, saved=save)
+
+        return self.dfs
+
+    def enqueue(self, queue: "JobQueue") -> int:
+        """Add every day of the configured date range to a job queue.
+
+        Args:
+            queue (JobQueue): Queue shared by the workers.
+
+        Returns:
+            int: Number of jobs added. Days already queued are kept as they are.
+
+        Example:
+            >>> dsar.enqueue(JobQueue("output/jobs.sqlite"))
+        """
+        return queue.add(self.nslc, self.dates)
+
+    def work(self, queue: "JobQueue", worker: str = None, max_jobs: int = None) -> int:
+        """Claim and process days of this NSLC from a job queue until it is empty.
+
+        Run this on as many processes or machines as needed: every day is claimed
+        by a single worker, its lease is renewed while it runs, and days left
+        behind by a crashed worker are picked up again once their lease expires.
+        A day whose files cannot be read or processed fails and is retried up to
+        the queue's ``max_attempts``; a day without data is completed.
+
+        A ``detector`` is not supported: every worker would keep its own state
+        and see the days out of order. Feed it from the saved results once the
+        queue is drained instead.
+
+        Args:
+            queue (JobQueue): Queue filled with :meth:`enqueue`.
+            worker (str, optional): Worker name. Defaults to ``{hostname}:{pid}``.
+            max_jobs (int, optional): Stop after this many jobs. Defaults to None
+                (until the queue is empty).
+
+        Returns:
+            int: Number of jobs completed by this worker.
+
+        Raises:
+            ValueError: If a ``detector`` is configured.
+
+        Example:
+            >>> queue = JobQueue("/shared/output/jobs.sqlite")
+            >>> dsar.enqueue(queue)
+            >>> dsar.work(queue)
+        """
+        from dsar.jobs import Heartbeat
 
-                csv_file: str = os.path.join(csv_directory, f"{station}_{date}.csv")
+        if self.detector is not None:
+            raise ValueError(
+                "work() does not support a detector: workers process days out of "
+                "order. Feed the detector from the saved results instead"
+            )
+
+        completed = 0
+
+        while max_jobs is None or completed < max_jobs:
+            job = queue.claim(worker=worker, nslc=self.nslc)
+            if job is None:
+                break
+
+            try:
+                with Heartbeat(queue, job):
+                    self.run_date(job["date"], save=True, raise_errors=True)
+            except Exception as e:
+                print(f"\u274c {job['date']} : {e} (attempt {job['attempts']})")
+                queue.fail(job, repr(e))
+                continue
+
+            if queue.complete(job):
+                completed += 1
+
+        return completed
+
+    def plan(
+        self, calibration: dict[str, dict[str, float]] | str = None
+    ) -> pd.DataFrame:
+        """Estimate the cost of the configured run without decoding any sample.
+
+        Lists every day with its file sizes and sample counts read from the
+        miniSEED headers, and prints the estimated CPU time, peak memory per job
+        and recommended number of workers. See :class:`Planner`.
+
+        Args:
+            calibration (dict[str, dict[str, float]] | str, optional): Calibration
+                (or path of a saved calibration) of this machine. Defaults to None
+                (calibrated now).
 
-                df.to_csv(csv_file, index=True)
-                print(f"\U0001f4be {date_str} : Saved to {csv_file}")
+        Returns:
+            pd.DataFrame: One row per day with the estimated ``seconds`` and
+                ``memory`` of the job.
 
-                return csv_file
+        Example:
+            >>> jobs = dsar.plan()
+            >>> jobs[jobs["files"] == 0]["date"]  # missing days
+        """
+        from dsar.planner import Planner
 
-            return f"\u26a0\ufe0f {date_str} : Not saved. Not enough data for {station}"
+        planner = Planner(self, calibration=calibration)
+        jobs = planner.plan()
+        planner.summary(jobs)
+        return jobs
 
-        return None
+    def sweep(
+        self,
+        configurations: list[
+            tuple[FrequencyBands | list[float], FrequencyBands | list[float]]
+        ],
+        save: bool = False,
+    ) -> "BandSweep":
+        """Compute the ratio of many band pairs with a single decode of every day.
+
+        See :class:`BandSweep`. The bands set on this instance are not used.
+
+        Args:
+            configurations (list[tuple[FrequencyBands | list[float],
+                FrequencyBands | list[float]]]): First and second band of every
+                configuration, e.g. from :meth:`BandSweep.grid`.
+            save (bool, optional): Also write the ratios and the summary with
+                :meth:`BandSweep.save`. Defaults to False.
+
+        Returns:
+            BandSweep: The sweep with its ratios computed.
+
+        Example:
+            >>> sweep = dsar.sweep(BandSweep.grid(first=lf_bands, second=hf_bands))
+            >>> sweep.summary().head()
+        """
+        from dsar.sweep import BandSweep
+
+        return BandSweep(self, configurations).run(save=save)
+
+    def collect(
+        self,
+        nslcs: list[str] = None,
+        dtype: np.dtype = np.float64,
+        save: bool = False,
+    ) -> dict[str, ResultStore]:
+        """Compute DSAR over the configured date range into compact result stores.
+
+        Every day is written in place into one preallocated :class:`ResultStore`
+        per NSLC as soon as it is computed, so no daily DataFrame is kept.
+
+        Args:
+            nslcs (list[str], optional): NSLCs kept. Defaults to None (all of
+                them).
+            dtype (np.dtype, optional): Floating point dtype of the stored
+                columns. ``np.float32`` halves the memory. Defaults to
+                ``np.float64``.
+            save (bool, optional): Also save each day with :meth:`save`.
+                Defaults to False.
+
+        Returns:
+            dict[str, ResultStore]: Mapping of NSLC to its results. NSLCs without
+                any data are missing.
+
+        Example:
+            >>> stores = dsar.collect(dtype=np.float32)
+            >>> df = stores["VG.OJN.00.EHZ"].to_frame()
+        """
+        stores: dict[str, ResultStore] = {}
+
+        for _, dfs in self.iter_days(save=save):
+            for nslc, df in dfs.items():
+                if df.empty or (nslcs is not None and nslc not in nslcs):
+                    continue
+                if nslc not in stores:
+                    stores[nslc] = ResultStore(self.resample, dtype=dtype)
+                stores[nslc].append(df)
+
+        return stores
+
+    def compute(self, nslc: str = None, save: bool = False) -> pd.DataFrame:
+        """Compute DSAR over the configured date range and return it in memory.
+
+        Days are collected with :meth:`collect` instead of being concatenated.
+
+        Args:
+            nslc (str, optional): NSLC whose results are returned. Defaults to the
+                combined NSLC in multi-component mode, otherwise ``self.nslc``.
+            save (bool, optional): Also save each day with :meth:`save`.
+                Defaults to False.
+
+        Returns:
+            pd.DataFrame: Daily results sorted by datetime, with the same columns
+                as the daily CSV files as floating point values. Empty if no day
+                had data.
+
+        Example:
+            >>> df = dsar.compute()
+            >>> df["DSAR_24h_median"].plot()
+        """
+        if nslc is None:
+            nslc = self.nslc if self.combined_id is None else self.combined_id
+
+        stores = self.collect(nslcs=[nslc], save=save)
+        if nslc not in stores:
+            return pd.DataFrame()
+
+        return stores[nslc].to_frame(dropna=True)
 
     def run(self) -> None:
         """Run the full DSAR pipeline over the configured date range.
 
         Iterates day by day from ``start_date`` to ``end_date``, loading seismic
         streams from the SDS archive, processing each frequency band, computing
-        DSAR ratios, and saving daily CSV files.
+        DSAR ratios, and saving daily CSV files. Use :meth:`iter_days` or
+        :meth:`compute` to get the results without writing to disk.
 
         Example:
             >>> dsar.run()
         """
-        dates: pd.DatetimeIndex = pd.date_range(
-            self.start_date, self.end_date, freq="D"
-        )
+        for _ in self.iter_days(save=True):
+            pass
+
+    async def arun(self, executor: Executor = None) -> None:
+        """Asynchronous :meth:`run` for use in an asyncio event loop.
+
+        Computes and saves every day like :meth:`run`, through :meth:`aiter_days`.
 
-        for date_obj in dates:
-            dfs: dict[str, pd.DataFrame] = {}
-            date_str: str = date_obj.strftime("%Y-%m-%d")
-
-            print(f"==============================")
-            print(f"\u231b {date_str} : Get stream for {date_str}")
-
-            stream: Stream = self.sds.get(datetime.strptime(date_str, "%Y-%m-%d"))
-
-            if stream.count() > 0:
-                print(f"\u2705 {date_str} : Found {stream.count()} trace(s) in stream")
-                for trace in stream:
-                    dfs[trace.id]: pd.DataFrame = pd.DataFrame()
-
-                for band_name, band_frequencies in self.bands.items():
-                    for trace in self.process(stream.copy(), band_frequencies):
-                        print(
-                            f"\U0001f9ee {date_str} : Calculating {trace.id} for {band_name}"
-                        )
-                        series = (
-                            trace_to_series(trace=trace)
-                            .resample(self.resample)
-                            .median()
-                        )
-                        dfs[trace.id][
-                            band_name
-                        ]: pd.DataFrame = series.to_frame().sort_index()
-
-                self.calculate(dfs=dfs).save(date_str=date_str)
-            else:
-                print(f"\u274c {date_str} : No trace(s) found. Skipping")
+        Args:
+            executor (Executor, optional): Executor the blocking work runs in.
+                Defaults to None (the event loop's default thread pool).
+
+        Example:
+            >>> await dsar.arun()
+        """
+        async for _ in self.aiter_days(save=True, executor=executor):
+            pass
@@ -0,0 +1,441 @@
+# Standard library imports
+import io
+import os
+import threading
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta
+from typing import Any
+
+# Third party imports
+import requests
+from obspy import ObsPyReadingError, Stream, read
+from obspy.io.mseed.util import get_record_information
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Project imports
+from dsar.sds import SDS
+from dsar.utilities import atomic_write, merge_stream
+
+
+class FDSNClient:
+    """Fetch miniSEED days from an FDSN dataselect web service in bulk.
+
+    Days are requested with POST queries covering every registered NSLC for up
+    to ``days_per_request`` days at once. The response is streamed and split
+    into NSLC-days record by record, without decoding any sample, so a request
+    never holds more than its compressed records in memory. HTTP connections
+    are pooled and reused by every request, and failed requests are retried.
+
+    When ``sds_dir`` is set, fetched days are written to that SDS archive, and
+    days already in it are not requested again. Otherwise they are kept in
+    memory until read.
+
+    Attributes:
+        url (str): URL of the dataselect ``query`` endpoint.
+        days_per_request (int): Number of days covered by one request.
+        sds_dir (str | None): SDS archive the fetched days are written to.
+        session (requests.Session): Pooled HTTP session.
+
+    Example:
+        >>> client = FDSNClient("https://service.iris.edu", sds_dir="/data/sds")
+        >>> dsar = DSAR(..., source=client)
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        days_per_request: int = 7,
+        sds_dir: str = None,
+        timeout: float = 300.0,
+        max_connections: int = 4,
+        retries: int = 3,
+        chunk_size: int = 1024**2,
+        **query_options: Any,
+    ):
+        """Initialize the client.
+
+        Args:
+            base_url (str): Root URL of the FDSN web service (e.g.
+                ``"https://service.iris.edu"``), or the full URL of a dataselect
+                ``query`` endpoint.
+            days_per_request (int, optional): Number of days covered by one
+                request. Defaults to 7.
+            sds_dir (str, optional): SDS archive the fetched days are written to,
+                created if needed. Defaults to None (kept in memory).
+            timeout (float, optional): Timeout of a request in seconds. Defaults
+                to 300.
+            max_connections (int, optional): Size of the connection pool.
+                Defaults to 4.
+            retries (int, optional): Retries of a failed request (connection
+                errors, 429 and 5xx responses). Defaults to 3.
+            chunk_size (int, optional): Size of the streamed response chunks in
+                bytes. Defaults to 1 MiB.
+            **query_options (Any): Other dataselect parameters sent with every
+                request, e.g. ``quality="B"`` or ``minimumlength=0.0``.
+
+        Raises:
+            AssertionError: If ``days_per_request`` is lower than 1.
+        """
+        assert (
+            days_per_request >= 1
+        ), f"\u274c days_per_request must be at least 1. Got {days_per_request}"
+
+        base_url = base_url.rstrip("/")
+        self.url = (
+            base_url
+            if base_url.endswith("/query")
+            else f"{base_url}/fdsnws/dataselect/1/query"
+        )
+        self.days_per_request = days_per_request
+        self.sds_dir = sds_dir
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.query_options = query_options
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=max_connections,
+            pool_maxsize=max_connections,
+            max_retries=Retry(
+                total=retries,
+                backoff_factor=1.0,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=None,
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        if sds_dir is not None:
+            os.makedirs(sds_dir, exist_ok=True)
+
+        self.dates: dict[str, list[str]] = {}
+        self.archives: dict[str, SDS] = {}
+        self.records: dict[tuple[str, str], bytearray] = {}
+        self.fetched: set[tuple[str, str]] = set()
+        self._lock = threading.RLock()
+
+    def __repr__(self) -> str:
+        return (
+            f"FDSNClient(url={self.url}, days_per_request={self.days_per_request}, "
+            f"sds_dir={self.sds_dir}, nslc={list(self.dates)})"
+        )
+
+    def add(self, nslc: str, dates: list[str]) -> None:
+        """Register the days of an NSLC fetched together with the others.
+
+        Args:
+            nslc (str): NSLC identifier (e.g., ``"VG.OJN.00.EHZ"``).
+            dates (list[str]): Dates in ``YYYY-MM-DD`` format.
+        """
+        self.dates[nslc] = sorted(set(self.dates.get(nslc, [])) | set(dates))
+
+        if self.sds_dir is not None and nslc not in self.archives:
+            network, station, location, channel = nslc.split(".")
+            self.archives[nslc] = SDS(
+                self.sds_dir,
+                station=station,
+                channel=channel,
+                network=network,
+                location=location,
+            )
+
+    def filepath(self, nslc: str, date_str: str) -> str | None:
+        """Return the SDS path a day is written to.
+
+        Args:
+            nslc (str): NSLC identifier.
+            date_str (str): Date in ``YYYY-MM-DD`` format.
+
+        Returns:
+            str | None: Path in ``sds_dir``, or None without ``sds_dir``.
+        """
+        if self.sds_dir is None:
+            return None
+        return self.archives[nslc].get_filepath(datetime.strptime(date_str, "%Y-%m-%d"))
+
+    def query(self, days: Iterable[tuple[str, str]]) -> str:
+        """Return the body of a dataselect POST query.
+
+        Args:
+            days (Iterable[tuple[str, str]]): ``(nslc, date)`` pairs requested.
+
+        Returns:
+            str: Query options followed by one
+                ``NET STA LOC CHA START END`` line per NSLC-day.
+        """
+        lines = [f"{key}={value}" for key, value in self.query_options.items()]
+
+        for nslc, date_str in days:
+            network, station, location, channel = nslc.split(".")
+            start = datetime.strptime(date_str, "%Y-%m-%d")
+            end = start + timedelta(days=1)
+            lines.append(
+                f"{network} {station} {location or '--'} {channel} "
+                f"{start:%Y-%m-%dT%H:%M:%S} {end:%Y-%m-%dT%H:%M:%S}"
+            )
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def split_records(
+        chunks: Iterable[bytes],
+    ) -> Iterator[tuple[str, dict[str, Any], bytes]]:
+        """Split a stream of miniSEED bytes into records, without decoding them.
+
+        Args:
+            chunks (Iterable[bytes]): Consecutive chunks of miniSEED data.
+
+        Yields:
+            tuple[str, dict[str, Any], bytes]: NSLC, header information (see
+                ``obspy.io.mseed.util.get_record_information``) and bytes of
+                every record.
+        """
+        buffer = bytearray()
+
+        def records(final: bool) -> Iterator[tuple[str, dict[str, Any], bytes]]:
+            # A record header and its blockettes fit in 256 bytes
+            while len(buffer) >= 256 or (final and len(buffer) > 0):
+                info = get_record_information(io.BytesIO(buffer))
+                length = info["record_length"]
+                if len(buffer) < length:
+                    if final:
+                        raise ObsPyReadingError("Truncated miniSEED record")
+                    return
+
+                nslc = (
+                    f"{info['network']}.{info['station']}."
+                    f"{info['location']}.{info['channel']}"
+                )
+                yield nslc, info, bytes(buffer[:length])
+                del buffer[:length]
+
+        for chunk in chunks:
+            buffer += chunk
+            yield from records(final=False)
+
+        yield from records(final=True)
+
+    def fetch(self, days: list[tuple[str, str]]) -> int:
+        """Fetch NSLC-days with a single bulk request.
+
+        Args:
+            days (list[tuple[str, str]]): ``(nslc, date)`` pairs requested.
+
+        Returns:
+            int: Number of bytes received.
+
+        Raises:
+            requests.HTTPError: If the service answers with an error.
+        """
+        if len(days) == 0:
+            return 0
+
+        print(
+            f"\U0001f310 Requesting {len(days)} NSLC-day(s) from "
+            f"{days[0][1]} to {days[-1][1]} at {self.url}"
+        )
+
+        requested = set(days)
+        received: dict[tuple[str, str], bytearray] = {}
+        size = 0
+
+        with self.session.post(
+            self.url, data=self.query(days), stream=True, timeout=self.timeout
+        ) as response:
+            # 204 (or 404 with nodata=404): no data for any requested day
+            if response.status_code not in (204, 404):
+                response.raise_for_status()
+                for nslc, info, record in self.split_records(
+                    response.iter_content(chunk_size=self.chunk_size)
+                ):
+                    # A record starting before midnight belongs to the day it
+                    # ends in when only that day was requested
+                    key = (nslc, info["starttime"].strftime("%Y-%m-%d"))
+                    if key not in requested:
+                        key = (nslc, info["endtime"].strftime("%Y-%m-%d"))
+                    if key not in requested:
+                        continue
+
+                    received.setdefault(key, bytearray()).extend(record)
+                    size += len(record)
+
+        for key, data in received.items():
+            if self.sds_dir is None:
+                self.records.setdefault(key, bytearray()).extend(data)
+                continue
+
+            filepath = self.filepath(*key)
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            with atomic_write(filepath, "wb") as f:
+                f.write(data)
+
+        self.fetched.update(days)
+
+        return size
+
+    def get(self, nslc: str, date: datetime) -> str | io.BytesIO | None:
+        """Return the miniSEED data of a day, fetching it with the next days first.
+
+        On a miss, the requested day and the following registered days (up to
+        ``days_per_request``) of every registered NSLC are fetched together.
+
+        Channels can be read from several threads: they wait for each other, so
+        a bulk request is never sent twice.
+
+        Args:
+            nslc (str): NSLC identifier.
+            date (datetime): Day to read.
+
+        Returns:
+            str | io.BytesIO | None: Path of the day in ``sds_dir``, or its data in
+                memory, or None if the service has no data for it.
+        """
+        with self._lock:
+            return self._get(nslc, date)
+
+    def _get(self, nslc: str, date: datetime) -> str | io.BytesIO | None:
+        date_str = date.strftime("%Y-%m-%d")
+        if nslc not in self.dates:
+            self.add(nslc, [date_str])
+
+        filepath = self.filepath(nslc, date_str)
+        if filepath is not None and os.path.exists(filepath):
+            return filepath
+
+        if (nslc, date_str) not in self.fetched:
+            upcoming = [d for d in self.dates[nslc] if d > date_str]
+            dates = [date_str, *upcoming][: self.days_per_request]
+            self.fetch(
+                [
+                    (other, d)
+                    for d in sorted(dates)
+                    for other in self.dates
+                    if (other, d) not in self.fetched
+                    and not (
+                        self.sds_dir is not None
+                        and os.path.exists(self.filepath(other, d))
+                    )
+                ]
+            )
+
+        if filepath is not None:
+            return filepath if os.path.exists(filepath) else None
+
+        data = self.records.pop((nslc, date_str), None)
+        return None if data is None else io.BytesIO(data)
+
+
+class FDSNSource:
+    """Read the days of one channel from an :class:`FDSNClient`, like :class:`SDS`.
+
+    Args:
+        client (FDSNClient): Client shared by every channel of a run.
+        station (str): Station code (e.g. "OJN").
+        channel (str): Channel code (e.g. "EHZ").
+        network (str, optional): Network code. Defaults to "VG".
+        location (str, optional): Location code. Defaults to "00".
+        fill_value (str | float | None, optional): Value used to merge gaps, passed
+            to ``Stream.merge``. Defaults to "interpolate".
+        raise_errors (bool, optional): Raise failed requests and unreadable data
+            instead of returning an empty Stream, so a job queue can retry the
+            day. Defaults to False.
+        verbose (bool, optional): Enable verbose logging. Defaults to False.
+        debug (bool, optional): Enable debug logging. Defaults to False.
+
+    Attributes:
+        nslc (str): Network.Station.Location.Channel identifier.
+        files (list[dict[str, Any]]): Metadata of loaded days.
+
+    Examples:
+        >>> source = FDSNSource(client, station="OJN", channel="EHZ")
+        >>> stream = source.get(datetime(2025, 1, 1))
+    """
+
+    def __init__(
+        self,
+        client: FDSNClient,
+        station: str,
+        channel: str,
+        network: str = "VG",
+        location: str = "00",
+        fill_value: str | float | None = "interpolate",
+        raise_errors: bool = False,
+        verbose: bool = False,
+        debug: bool = False,
+    ):
+        self.client = client
+        self.station = station.upper()
+        self.channel = channel.upper()
+        self.network = network.upper()
+        self.location = location.upper()
+        self.fill_value = fill_value
+        self.raise_errors = raise_errors
+        self.verbose = verbose
+        self.debug = debug
+
+        self.nslc = f"{self.network}.{self.station}.{self.location}.{self.channel}"
+        self.files: list[dict[str, Any]] = []
+
+    def __repr__(self) -> str:
+        return f"FDSNSource(nslc={self.nslc}, client={self.client.url})"
+
+    def get(self, date: datetime) -> Stream:
+        """Retrieve the merged stream of a day.
+
+        Args:
+            date (datetime): Day to retrieve.
+
+        Returns:
+            Stream: Merged stream, or an empty Stream if the service has no data
+                or the request failed.
+
+        Raises:
+            TypeError: If date is not a datetime object.
+            requests.RequestException: If the request failed, only with
+                ``raise_errors``.
+            ObsPyReadingError: If the data cannot be read, only with
+                ``raise_errors``.
+        """
+        if not isinstance(date, datetime):
+            raise TypeError("Date must be a datetime object")
+
+        date_str = date.strftime("%Y-%m-%d")
+
+        try:
+            source = self.client.get(self.nslc, date)
+        except requests.RequestException as e:
+            print(f"{date_str} :: Request failed for {self.nslc}: {e}")
+            if self.raise_errors:
+                raise
+            return Stream()
+
+        if source is None:
+            if self.debug:
+                print(f"{date_str} :: No data for {self.nslc} at {self.client.url}")
+            return Stream()
+
+        try:
+            stream = merge_stream(
+                read(source, format="MSEED"), fill_value=self.fill_value
+            )
+        except ObsPyReadingError as e:
+            print(f"{date_str} :: Failed to read miniSEED data of {self.nslc}: {e}")
+            if self.raise_errors:
+                raise
+            return Stream()
+
+        self.files.append(
+            {
+                "date": date_str,
+                "filepath": source if isinstance(source, str) else self.client.url,
+                "n_traces": len(stream),
+                "loaded_at": datetime.now().isoformat(),
+            }
+        )
+
+        if self.verbose:
+            print(f"{date_str} :: {len(stream)} trace(s) loaded for {self.nslc}")
+
+        return stream
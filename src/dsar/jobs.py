@@ -0,0 +1,310 @@
+# Standard library imports
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Any
+
+# Third party imports
+from typing_extensions import Self
+
+job_statuses: tuple[str, ...] = ("pending", "running", "done", "failed")
+
+
+class JobQueue:
+    """SQLite-backed queue of station-days shared by many DSAR workers.
+
+    Workers claim one ``(nslc, date)`` job at a time. A claimed job is leased for
+    ``lease_seconds``; the worker renews the lease with :meth:`heartbeat` while it
+    runs. When a worker crashes, its lease expires and the job is handed to the
+    next worker that asks, until it has been tried ``max_attempts`` times. Every
+    state change runs in an immediate transaction, so two workers never claim the
+    same job.
+
+    The database can live on a filesystem shared by several machines as long as
+    that filesystem implements POSIX locks correctly (local disks and most NFSv4
+    mounts do; some network shares do not).
+
+    Attributes:
+        path (str): Path of the SQLite database.
+        lease_seconds (float): Lease duration of a claimed job.
+        max_attempts (int): Number of claims after which a job is failed.
+
+    Example:
+        >>> queue = JobQueue("output/jobs.sqlite")
+        >>> queue.add("VG.OJN.00.EHZ", ["2025-01-01", "2025-01-02"])
+        >>> job = queue.claim()
+        >>> queue.complete(job)
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 600.0, max_attempts: int = 3):
+        """Open (and create if needed) the queue database.
+
+        Args:
+            path (str): Path of the SQLite database.
+            lease_seconds (float, optional): Lease duration of a claimed job in
+                seconds. Defaults to 600.
+            max_attempts (int, optional): Number of claims after which a job is
+                marked as failed. Defaults to 3.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        with closing(self._connect()) as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    nslc TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    worker TEXT,
+                    lease_until REAL,
+                    error TEXT,
+                    updated_at REAL,
+                    PRIMARY KEY (nslc, date)
+                )
+                """)
+
+    def __repr__(self) -> str:
+        return (
+            f"JobQueue(path={self.path}, lease_seconds={self.lease_seconds}, "
+            f"max_attempts={self.max_attempts}, counts={self.counts()})"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def add(self, nslc: str, dates: list[str]) -> int:
+        """Add the station-days not already in the queue.
+
+        Args:
+            nslc (str): NSLC identifier (e.g., ``"VG.OJN.00.EHZ"``).
+            dates (list[str]): Dates in ``YYYY-MM-DD`` format.
+
+        Returns:
+            int: Number of jobs added.
+        """
+        now = time.time()
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            cursor = connection.executemany(
+                "INSERT OR IGNORE INTO jobs (nslc, date, updated_at) VALUES (?, ?, ?)",
+                [(nslc, date, now) for date in dates],
+            )
+            connection.execute("COMMIT")
+            return cursor.rowcount
+
+    def claim(self, worker: str = None, nslc: str = None) -> dict[str, Any] | None:
+        """Claim the next pending job, or a running job whose lease expired.
+
+        Args:
+            worker (str, optional): Worker name stored with the job. Defaults to
+                ``{hostname}:{pid}``.
+            nslc (str, optional): Only claim jobs of this NSLC. Defaults to None
+                (any NSLC).
+
+        Returns:
+            dict[str, Any] | None: The claimed job with ``nslc``, ``date``,
+                ``attempts`` and ``worker``, or None if there is nothing to do.
+        """
+        worker = f"{socket.gethostname()}:{os.getpid()}" if worker is None else worker
+        now = time.time()
+
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                """
+                SELECT nslc, date, attempts FROM jobs
+                WHERE (status = 'pending' OR (status = 'running' AND lease_until < ?))
+                  AND attempts < ?
+                  AND (? IS NULL OR nslc = ?)
+                ORDER BY date, nslc
+                LIMIT 1
+                """,
+                (now, self.max_attempts, nslc, nslc),
+            ).fetchone()
+
+            if row is None:
+                connection.execute(
+                    """
+                    UPDATE jobs SET status = 'failed', updated_at = ?
+                    WHERE status = 'running' AND lease_until < ? AND attempts >= ?
+                    """,
+                    (now, now, self.max_attempts),
+                )
+                connection.execute("COMMIT")
+                return None
+
+            connection.execute(
+                """
+                UPDATE jobs
+                SET status = 'running', attempts = attempts + 1, worker = ?,
+                    lease_until = ?, updated_at = ?
+                WHERE nslc = ? AND date = ?
+                """,
+                (worker, now + self.lease_seconds, now, row["nslc"], row["date"]),
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            raise
+        finally:
+            connection.close()
+
+        return {
+            "nslc": row["nslc"],
+            "date": row["date"],
+            "attempts": row["attempts"] + 1,
+            "worker": worker,
+        }
+
+    def _finish(
+        self, job: dict[str, Any], status: str, error: str = None, lease: float = None
+    ) -> bool:
+        with closing(self._connect()) as connection:
+            cursor = connection.execute(
+                """
+                UPDATE jobs SET status = ?, error = ?, lease_until = ?, updated_at = ?
+                WHERE nslc = ? AND date = ? AND worker = ? AND status = 'running'
+                """,
+                (
+                    status,
+                    error,
+                    lease,
+                    time.time(),
+                    job["nslc"],
+                    job["date"],
+                    job["worker"],
+                ),
+            )
+            return cursor.rowcount == 1
+
+    def heartbeat(self, job: dict[str, Any]) -> bool:
+        """Extend the lease of a running job.
+
+        Args:
+            job (dict[str, Any]): Job returned by :meth:`claim`.
+
+        Returns:
+            bool: False if the job is no longer held by this worker.
+        """
+        return self._finish(job, "running", lease=time.time() + self.lease_seconds)
+
+    def complete(self, job: dict[str, Any]) -> bool:
+        """Mark a job as done.
+
+        Args:
+            job (dict[str, Any]): Job returned by :meth:`claim`.
+
+        Returns:
+            bool: False if the job is no longer held by this worker.
+        """
+        return self._finish(job, "done")
+
+    def fail(self, job: dict[str, Any], error: str) -> bool:
+        """Record a failed attempt and put the job back unless it ran out of tries.
+
+        Args:
+            job (dict[str, Any]): Job returned by :meth:`claim`.
+            error (str): Error message stored with the job.
+
+        Returns:
+            bool: False if the job is no longer held by this worker.
+        """
+        status = "failed" if job["attempts"] >= self.max_attempts else "pending"
+        return self._finish(job, status, error=error)
+
+    def counts(self) -> dict[str, int]:
+        """Return the number of jobs in every status.
+
+        Returns:
+            dict[str, int]: Mapping of status to number of jobs.
+        """
+        counts = dict.fromkeys(job_statuses, 0)
+        with closing(self._connect()) as connection:
+            for row in connection.execute(
+                "SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"
+            ):
+                counts[row["status"]] = row["n"]
+        return counts
+
+    def jobs(self, status: str = None) -> list[dict[str, Any]]:
+        """List the jobs, optionally filtered by status.
+
+        Args:
+            status (str, optional): Only list jobs in this status. Defaults to None.
+
+        Returns:
+            list[dict[str, Any]]: Jobs ordered by date and NSLC.
+        """
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT * FROM jobs WHERE (? IS NULL OR status = ?) ORDER BY date, nslc",
+                (status, status),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def retry_failed(self) -> int:
+        """Put every failed job back into the queue with a fresh attempt count.
+
+        Returns:
+            int: Number of jobs reset.
+        """
+        with closing(self._connect()) as connection:
+            cursor = connection.execute(
+                """
+                UPDATE jobs SET status = 'pending', attempts = 0, updated_at = ?
+                WHERE status = 'failed'
+                """,
+                (time.time(),),
+            )
+            return cursor.rowcount
+
+
+class Heartbeat:
+    """Renew the lease of a job from a background thread while it runs.
+
+    Example:
+        >>> with Heartbeat(queue, job):
+        ...     dsar.run_date(job["date"], save=True)
+    """
+
+    def __init__(self, queue: JobQueue, job: dict[str, Any], interval: float = None):
+        """Initialize the heartbeat.
+
+        Args:
+            queue (JobQueue): Queue holding the job.
+            job (dict[str, Any]): Job returned by :meth:`JobQueue.claim`.
+            interval (float, optional): Seconds between two renewals. Defaults to
+                a third of the queue's lease.
+        """
+        self.queue = queue
+        self.job = job
+        self.interval = queue.lease_seconds / 3 if interval is None else interval
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            if not self.queue.heartbeat(self.job):
+                break
+
+    def __enter__(self) -> Self:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self._stop.set()
+        self._thread.join()
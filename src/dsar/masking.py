@@ -0,0 +1,228 @@
+# Third party imports
+import numpy as np
+
+# Detection methods supported by TransientMask
+mask_methods: tuple[str, ...] = ("sta_lta", "threshold")
+
+
+class TransientMask:
+    """Detector of transients (earthquakes, rockfalls, spikes) masked before reduction.
+
+    Runs once on the demeaned velocity of the whole day, every channel at once,
+    and returns a single sample mask shared by all DSAR bands. Masked samples are
+    left out of the band statistics of their window, so a transient no longer
+    inflates both band amplitudes.
+
+    Two detectors are available:
+
+    - ``"sta_lta"``: recursive STA/LTA of the squared velocity, computed with one
+      IIR filter call per average. The squared velocity is first averaged over
+      blocks of a tenth of ``sta``, so the filters run on a few hundred
+      thousand values per day whatever the sampling rate. A block is masked from
+      the moment the ratio rises above ``trigger_on`` until it falls below
+      ``trigger_off``.
+    - ``"threshold"``: samples whose absolute velocity exceeds ``threshold``
+      times the median absolute velocity of their segment.
+
+    A sample is masked when any channel triggers, and the mask is widened by
+    ``padding`` seconds on both sides to cover the onset and the coda.
+
+    Attributes:
+        method (str): ``"sta_lta"`` or ``"threshold"``.
+
+    Example:
+        >>> mask = TransientMask(sta=1.0, lta=60.0, trigger_on=4.0, trigger_off=1.5)
+        >>> dsar = DSAR(..., mask=mask)
+    """
+
+    def __init__(
+        self,
+        method: str = "sta_lta",
+        sta: float = 1.0,
+        lta: float = 60.0,
+        trigger_on: float = 4.0,
+        trigger_off: float = 1.5,
+        threshold: float = 10.0,
+        padding: float = 5.0,
+    ):
+        """Initialize the detector.
+
+        Args:
+            method (str, optional): ``"sta_lta"`` or ``"threshold"``. Defaults to
+                ``"sta_lta"``.
+            sta (float, optional): Short-term average length in seconds.
+                Defaults to 1.0.
+            lta (float, optional): Long-term average length in seconds. The first
+                ``lta`` seconds of every segment are never masked while the
+                average settles. Defaults to 60.0.
+            trigger_on (float, optional): STA/LTA ratio starting a transient.
+                Defaults to 4.0.
+            trigger_off (float, optional): STA/LTA ratio ending a transient.
+                Defaults to 1.5.
+            threshold (float, optional): Multiple of the median absolute velocity
+                above which a sample is masked with ``method="threshold"``.
+                Defaults to 10.0.
+            padding (float, optional): Seconds masked before and after every
+                detection. Defaults to 5.0.
+
+        Raises:
+            ValueError: If ``method`` is not supported.
+            AssertionError: If the averages or triggers are inconsistent.
+        """
+        if method not in mask_methods:
+            raise ValueError(
+                f"method must be one of {', '.join(mask_methods)}. Got '{method}'"
+            )
+        assert 0 < sta < lta, (
+            f"\u274c sta must be positive and shorter than lta. "
+            f"Got sta={sta}, lta={lta}"
+        )
+        assert 0 < trigger_off < trigger_on, (
+            f"\u274c trigger_off must be positive and below trigger_on. "
+            f"Got trigger_on={trigger_on}, trigger_off={trigger_off}"
+        )
+        assert threshold > 0, f"\u274c threshold must be positive. Got {threshold}"
+        assert padding >= 0, f"\u274c padding must not be negative. Got {padding}"
+
+        self.method = method
+        self.sta = sta
+        self.lta = lta
+        self.trigger_on = trigger_on
+        self.trigger_off = trigger_off
+        self.threshold = threshold
+        self.padding = padding
+
+    def __repr__(self) -> str:
+        if self.method == "threshold":
+            return (
+                f"TransientMask(method={self.method}, threshold={self.threshold}, "
+                f"padding={self.padding})"
+            )
+        return (
+            f"TransientMask(method={self.method}, sta={self.sta}, lta={self.lta}, "
+            f"trigger_on={self.trigger_on}, trigger_off={self.trigger_off}, "
+            f"padding={self.padding})"
+        )
+
+    def block_length(self, sampling_rate: float) -> int:
+        """Return the number of samples averaged into one STA/LTA value.
+
+        Args:
+            sampling_rate (float): Sampling rate in Hz.
+
+        Returns:
+            int: A tenth of ``sta`` in samples, at least 1.
+        """
+        return max(int(self.sta * sampling_rate) // 10, 1)
+
+    def sta_lta(self, energy: np.ndarray, rate: float) -> np.ndarray:
+        """Compute the recursive STA/LTA ratio of every row, like ObsPy does.
+
+        Args:
+            energy (np.ndarray): ``(n_rows, n)`` squared samples without gaps.
+            rate (float): Rate of ``energy`` in Hz.
+
+        Returns:
+            np.ndarray: ``(n_rows, n)`` ratio, 0 for the first ``lta`` seconds.
+        """
+        from scipy.signal import lfilter
+
+        nsta = max(int(self.sta * rate), 1)
+        nlta = max(int(self.lta * rate), 1)
+
+        sta = lfilter([1.0 / nsta], [1.0, 1.0 / nsta - 1.0], energy, axis=-1)
+        lta = lfilter([1.0 / nlta], [1.0, 1.0 / nlta - 1.0], energy, axis=-1)
+
+        ratio = np.divide(sta, lta, out=np.zeros_like(sta), where=lta > 0)
+        ratio[..., :nlta] = 0.0
+        return ratio
+
+    def triggered(self, ratio: np.ndarray) -> np.ndarray:
+        """Apply the ``trigger_on``/``trigger_off`` hysteresis to a ratio.
+
+        A sample is triggered when the last crossing before it, of either
+        ``trigger_on`` upwards or ``trigger_off`` downwards, was the upward one.
+
+        Args:
+            ratio (np.ndarray): STA/LTA ratio with time on the last axis.
+
+        Returns:
+            np.ndarray: Boolean flag per sample.
+        """
+        on = ratio > self.trigger_on
+        off = ratio < self.trigger_off
+
+        positions = np.arange(ratio.shape[-1])
+        last = np.maximum.accumulate(np.where(on | off, positions, -1), axis=-1)
+
+        return (last >= 0) & np.take_along_axis(on, np.maximum(last, 0), axis=-1)
+
+    def detect(self, data: np.ndarray, sampling_rate: float) -> np.ndarray:
+        """Flag the transient samples of one contiguous segment.
+
+        Args:
+            data (np.ndarray): ``(n_rows, npts)`` demeaned samples without gaps.
+            sampling_rate (float): Sampling rate in Hz.
+
+        Returns:
+            np.ndarray: ``(npts,)`` boolean flag, True where any row triggers.
+        """
+        if self.method == "threshold":
+            amplitude = np.abs(data)
+            # Every 10th sample is plenty for a robust amplitude scale
+            scale = np.median(amplitude[..., ::10], axis=-1, keepdims=True)
+            return (amplitude > self.threshold * scale).any(axis=0)
+
+        block = self.block_length(sampling_rate)
+        npts = data.shape[-1]
+        n_blocks = -(-npts // block)
+
+        energy = np.zeros(data.shape[:-1] + (n_blocks * block,))
+        np.multiply(data, data, out=energy[..., :npts])
+        energy = energy.reshape(data.shape[:-1] + (n_blocks, block)).mean(axis=-1)
+
+        triggered = self.triggered(self.sta_lta(energy, sampling_rate / block))
+        return np.repeat(triggered.any(axis=0), block)[:npts]
+
+    def compute(
+        self,
+        data: np.ndarray,
+        sampling_rate: float,
+        segments: list[tuple[int, int]],
+    ) -> np.ndarray:
+        """Compute the transient mask of a day.
+
+        Args:
+            data (np.ndarray): ``(n_rows, npts)`` demeaned samples, e.g.
+                :attr:`DayData.demeaned`.
+            sampling_rate (float): Sampling rate in Hz.
+            segments (list[tuple[int, int]]): ``[start, end)`` bounds of the
+                contiguous segments processed.
+
+        Returns:
+            np.ndarray: ``(npts,)`` boolean mask shared by every row and band.
+                Samples outside the segments are never masked.
+
+        Example:
+            >>> mask = TransientMask().compute(day.demeaned, 100.0, day.segments)
+        """
+        npts = data.shape[-1]
+        detected = np.zeros(npts, dtype=bool)
+        for start, end in segments:
+            detected[start:end] = self.detect(data[:, start:end], sampling_rate)
+
+        pad = min(int(round(self.padding * sampling_rate)), npts - 1)
+        if pad > 0 and detected.any():
+            # Detections within ``pad`` samples, from a running count on both sides
+            counts = np.cumsum(detected, dtype=np.int32)
+            after = np.full(npts, counts[-1])
+            after[: npts - pad] = counts[pad:]
+            before = np.zeros(npts, dtype=np.int32)
+            before[pad + 1 :] = counts[: npts - pad - 1]
+            detected = after > before
+
+        inside = np.zeros(npts, dtype=bool)
+        for start, end in segments:
+            inside[start:end] = True
+
+        return detected & inside
@@ -0,0 +1,773 @@
+# Standard library imports
+import threading
+from collections.abc import Callable
+from functools import cached_property
+
+# Third party imports
+import numpy as np
+import pandas as pd
+
+# Project imports
+from dsar.masking import TransientMask
+from dsar.processing import (
+    filter_state,
+    highpass,
+    integrate,
+    lowpass,
+    taper,
+    taper_length,
+)
+from dsar.reducer import WindowReducer
+from dsar.spectral import SpectralEstimator
+
+
+class FilterState:
+    """State of the causal filters and integrals at the end of a day.
+
+    Lets the next day start its high-pass and low-pass filters and its
+    integrated displacement where the previous day stopped instead of from
+    rest, so a contiguous series has no transient at midnight. The demean
+    offset of the first day of a contiguous run is kept as well, as a step
+    between two daily offsets would also ring through the filters.
+
+    Attributes:
+        next_time (pd.Timestamp): Time of the sample following the day.
+        sampling_rate (float): Sampling rate in Hz.
+        ids (list[str]): Trace ID of every row.
+        values (dict[tuple, object]): State of every intermediate, by the key it
+            is cached under in :class:`DayData`.
+    """
+
+    def __init__(
+        self,
+        next_time: pd.Timestamp,
+        sampling_rate: float,
+        ids: list[str],
+        values: dict[tuple, object],
+    ):
+        """Initialize the state.
+
+        Args:
+            next_time (pd.Timestamp): Time of the sample following the day.
+            sampling_rate (float): Sampling rate in Hz.
+            ids (list[str]): Trace ID of every row.
+            values (dict[tuple, object]): State of every intermediate.
+        """
+        self.next_time = next_time
+        self.sampling_rate = sampling_rate
+        self.ids = ids
+        self.values = values
+
+    def __repr__(self) -> str:
+        return (
+            f"FilterState(next_time={self.next_time}, "
+            f"sampling_rate={self.sampling_rate}, ids={self.ids}, "
+            f"values={len(self.values)})"
+        )
+
+    def continues(
+        self, starttime: pd.Timestamp, sampling_rate: float, ids: list[str]
+    ) -> bool:
+        """Return whether a day starts right where this state ended.
+
+        Args:
+            starttime (pd.Timestamp): Time of the first sample of the day.
+            sampling_rate (float): Sampling rate of the day in Hz.
+            ids (list[str]): Trace ID of every row of the day.
+
+        Returns:
+            bool: True if the rows and rate match and the first sample is within
+                half a sample of :attr:`next_time`.
+        """
+        tolerance = pd.Timedelta(seconds=0.5 / sampling_rate)
+        return (
+            list(ids) == list(self.ids)
+            and sampling_rate == self.sampling_rate
+            and abs(pd.Timestamp(starttime) - self.next_time) < tolerance
+        )
+
+
+class DayData:
+    """Decoded samples of one day and the intermediates shared between metrics.
+
+    Holds the ``(n_rows, npts)`` velocity samples of every channel and builds the
+    demeaned samples, band-passed velocities, integrated displacements and window
+    spectra on first use. Each of them is cached, so DSAR bands sharing a
+    high-pass corner and metrics sharing a spectrum only pay for it once. Every
+    operation is applied per contiguous segment; samples outside the segments
+    are ``NaN``.
+
+    A day can be shared by several threads: each intermediate is computed by the
+    first thread asking for it while the others wait for the result.
+
+    Attributes:
+        data (np.ndarray): ``(n_rows, npts)`` raw samples.
+        starttime (pd.Timestamp): Time of the first sample.
+        sampling_rate (float): Sampling rate in Hz.
+        ids (list[str]): Trace ID of every row.
+        segments (list[tuple[int, int]]): ``[start, end)`` bounds of the
+            contiguous segments processed.
+        quality (dict[str, pd.DataFrame] | None): Window quality metrics of every
+            trace ID, see :class:`~dsar.quality.QualityRules`.
+        continuation (bool): Keep the final state of the filters and integrals
+            for the next day.
+        initial_state (dict[tuple, object]): State continued from the previous
+            day, empty if the day starts at rest.
+
+    Example:
+        >>> day = DayData(data, starttime, 100.0, ids, [(0, data.shape[-1])])
+        >>> displacement = day.displacement(0.1)
+    """
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        starttime: pd.Timestamp,
+        sampling_rate: float,
+        ids: list[str],
+        segments: list[tuple[int, int]],
+        taper_percentage: float = 0.0,
+        taper_max_length: float = None,
+        quality: dict[str, pd.DataFrame] = None,
+        state: "FilterState" = None,
+        continuation: bool = False,
+    ):
+        """Initialize the day.
+
+        Args:
+            data (np.ndarray): ``(n_rows, npts)`` samples. ``NaN`` samples mark
+                gaps.
+            starttime (pd.Timestamp): Time of the first sample.
+            sampling_rate (float): Sampling rate in Hz.
+            ids (list[str]): Trace ID of every row.
+            segments (list[tuple[int, int]]): ``[start, end)`` bounds of the
+                contiguous segments processed.
+            taper_percentage (float, optional): Fraction of each segment tapered
+                at both ends after demeaning. Defaults to 0.0 (no taper).
+            taper_max_length (float, optional): Longest taper at each end of a
+                segment in seconds. Defaults to None (no limit).
+            quality (dict[str, pd.DataFrame], optional): Window quality metrics of
+                every trace ID, computed from the samples before decimation.
+                Defaults to None.
+            state (FilterState, optional): Final state of the previous day. Used
+                only if this day starts where it ended, with the same trace IDs
+                and sampling rate. Defaults to None.
+            continuation (bool, optional): Keep the final state of the filters
+                and integrals for the next day, see :meth:`final_state`.
+                Defaults to False.
+        """
+        self.data = data
+        self.starttime = starttime
+        self.sampling_rate = sampling_rate
+        self.ids = ids
+        self.segments = segments
+        self.taper_percentage = taper_percentage
+        self.taper_max_length = taper_max_length
+        self.quality = quality
+        self.continuation = continuation
+
+        self.initial_state: dict[tuple, object] = {}
+        if state is not None and state.continues(starttime, sampling_rate, ids):
+            self.initial_state = state.values
+        self._final_state: dict[tuple, object] = {}
+
+        self._cache: dict[tuple, object] = {}
+        self._locks: dict[tuple, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return (
+            f"DayData(ids={self.ids}, starttime={self.starttime}, "
+            f"sampling_rate={self.sampling_rate}, segments={len(self.segments)})"
+        )
+
+    @property
+    def continued(self) -> bool:
+        """Return whether the day continues the state of the previous day.
+
+        Returns:
+            bool: True if a :class:`FilterState` was given and matches this day.
+        """
+        return len(self.initial_state) > 0
+
+    def final_state(self) -> "FilterState | None":
+        """Return the state left at the end of the day by the filters run so far.
+
+        Call it once every band and metric is computed.
+
+        Returns:
+            FilterState | None: State continued by the next day, or None without
+                ``continuation`` or if the last sample of the day is in a gap.
+        """
+        if not self.continuation or len(self._final_state) == 0:
+            return None
+
+        npts = self.data.shape[-1]
+        return FilterState(
+            next_time=self.starttime + pd.Timedelta(seconds=npts / self.sampling_rate),
+            sampling_rate=self.sampling_rate,
+            ids=self.ids,
+            values=dict(self._final_state),
+        )
+
+    def per_segment(
+        self, data: np.ndarray, func: Callable[[np.ndarray], np.ndarray]
+    ) -> np.ndarray:
+        """Apply ``func`` to every contiguous segment of ``data``.
+
+        Args:
+            data (np.ndarray): ``(n_rows, npts)`` samples.
+            func (Callable[[np.ndarray], np.ndarray]): Function applied along the
+                time axis of each segment.
+
+        Returns:
+            np.ndarray: Result with ``NaN`` outside the segments.
+        """
+        result = np.full(data.shape, np.nan)
+        for start, end in self.segments:
+            result[:, start:end] = func(data[:, start:end])
+        return result
+
+    def _cached(self, key: tuple, func: Callable[[], object]) -> object:
+        if key in self._cache:
+            return self._cache[key]
+
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+
+        with lock:
+            if key not in self._cache:
+                self._cache[key] = func()
+        return self._cache[key]
+
+    @cached_property
+    def masked(self) -> np.ndarray:
+        """Return the raw samples with ``NaN`` outside the segments.
+
+        Returns:
+            np.ndarray: ``(n_rows, npts)`` samples.
+        """
+        return self.per_segment(self.data, lambda segment: segment)
+
+    def _taper_sides(self, start: int, end: int) -> tuple[bool, bool]:
+        """Return whether a segment is tapered at its start and at its end.
+
+        A segment continuing the previous day is not tapered at its start. With
+        ``continuation``, a segment reaching the end of the day is not tapered at
+        its end, so the next day can continue it.
+
+        Args:
+            start (int): First sample of the segment.
+            end (int): Sample after the last one of the segment.
+
+        Returns:
+            tuple[bool, bool]: Taper at the start, taper at the end.
+        """
+        if self.taper_percentage <= 0:
+            return False, False
+
+        left = start > 0 or ("offset",) not in self.initial_state
+        right = not (self.continuation and end == self.data.shape[-1])
+        return left, right
+
+    @property
+    def _taper_npts(self) -> int | None:
+        """Return the longest taper in samples, or None without a limit."""
+        if self.taper_max_length is None:
+            return None
+        return int(self.taper_max_length * self.sampling_rate)
+
+    @cached_property
+    def tapered(self) -> np.ndarray:
+        """Return the samples inside the taper of a segment.
+
+        Returns:
+            np.ndarray: ``(npts,)`` boolean flag shared by every row.
+        """
+        flag = np.zeros(self.data.shape[-1], dtype=bool)
+
+        for start, end in self.segments:
+            left, right = self._taper_sides(start, end)
+            wlen = taper_length(end - start, self.taper_percentage, self._taper_npts)
+            if left:
+                flag[start : start + wlen] = True
+            if right:
+                flag[end - wlen : end] = True
+
+        return flag
+
+    def tapered_windows(self, window_ns: int) -> pd.DatetimeIndex:
+        """Return the start of the windows overlapping the taper of a segment.
+
+        The filters are still settling there and the taper attenuates the
+        samples, so their amplitudes are not comparable to the other windows.
+
+        Args:
+            window_ns (int): Window length in nanoseconds.
+
+        Returns:
+            pd.DatetimeIndex: Start times of the tapered windows.
+        """
+        if not self.tapered.any():
+            return pd.DatetimeIndex([], name="datetime")
+
+        offsets = np.round(np.flatnonzero(self.tapered) * (1e9 / self.sampling_rate))
+        bins = np.unique((self.starttime.value + offsets.astype(np.int64)) // window_ns)
+        return pd.DatetimeIndex(
+            (bins * window_ns).view("datetime64[ns]"), name="datetime"
+        )
+
+    @cached_property
+    def demeaned(self) -> np.ndarray:
+        """Return the demeaned (and optionally tapered) samples of every segment.
+
+        A segment continuing the previous day keeps the offset removed there. See
+        :meth:`_taper_sides` for the ends tapered.
+
+        Returns:
+            np.ndarray: ``(n_rows, npts)`` samples.
+        """
+        npts = self.data.shape[-1]
+        result = np.full(self.data.shape, np.nan)
+
+        for start, end in self.segments:
+            segment = self.data[:, start:end]
+            offset = self.initial_state.get(("offset",)) if start == 0 else None
+            if offset is None:
+                offset = segment.mean(axis=-1, keepdims=True)
+            segment = segment - offset
+
+            left, right = self._taper_sides(start, end)
+            if left or right:
+                segment = taper(
+                    segment,
+                    max_percentage=self.taper_percentage,
+                    side="both" if left and right else "left" if left else "right",
+                    max_npts=self._taper_npts,
+                )
+
+            result[:, start:end] = segment
+            if self.continuation and end == npts:
+                self._final_state[("offset",)] = offset
+
+        return result
+
+    def per_segment_continued(
+        self,
+        data: np.ndarray,
+        key: tuple,
+        func: Callable[[np.ndarray, object], tuple[np.ndarray, object]],
+    ) -> np.ndarray:
+        """Apply a causal ``func`` to every contiguous segment, continuing days.
+
+        ``func(segment, state)`` returns the processed segment and its final
+        state, starting at rest when ``state`` is None. The first segment starts
+        from the state left by the previous day when the day continues it, and
+        with ``continuation`` the final state of the segment reaching the end of
+        the day is kept for the next one.
+
+        Args:
+            data (np.ndarray): ``(n_rows, npts)`` samples.
+            key (tuple): Key of the state in :class:`FilterState`.
+            func (Callable[[np.ndarray, object], tuple[np.ndarray, object]]):
+                Function applied along the time axis of each segment.
+
+        Returns:
+            np.ndarray: Result with ``NaN`` outside the segments.
+        """
+        npts = data.shape[-1]
+        result = np.full(data.shape, np.nan)
+        for start, end in self.segments:
+            state = self.initial_state.get(key) if start == 0 else None
+            result[:, start:end], final = func(data[:, start:end], state)
+            if self.continuation and end == npts:
+                self._final_state[key] = final
+        return result
+
+    def bandpassed(self, freqmin: float = None, freqmax: float = None) -> np.ndarray:
+        """Return the demeaned velocity high- and/or low-pass filtered.
+
+        Args:
+            freqmin (float, optional): High-pass corner in Hz. Defaults to None.
+            freqmax (float, optional): Low-pass corner in Hz. Defaults to None.
+
+        Returns:
+            np.ndarray: ``(n_rows, npts)`` filtered samples.
+        """
+
+        def apply(
+            segment: np.ndarray, state: tuple[np.ndarray, np.ndarray] | None
+        ) -> tuple[np.ndarray, tuple[np.ndarray, np.ndarray]]:
+            zi_high, zi_low = (None, None) if state is None else state
+            if freqmin is not None:
+                segment, zi_high = highpass(
+                    segment,
+                    freqmin,
+                    self.sampling_rate,
+                    zi=filter_state(segment) if zi_high is None else zi_high,
+                )
+            if freqmax is not None:
+                segment, zi_low = lowpass(
+                    segment,
+                    freqmax,
+                    self.sampling_rate,
+                    zi=filter_state(segment) if zi_low is None else zi_low,
+                )
+            return segment, (zi_high, zi_low)
+
+        key = ("bandpassed", freqmin, freqmax)
+        return self._cached(
+            key, lambda: self.per_segment_continued(self.demeaned, key, apply)
+        )
+
+    def displacement(self, freq: float) -> np.ndarray:
+        """Return the displacement integrated after a high-pass at ``freq``.
+
+        Args:
+            freq (float): High-pass corner applied to the velocity in Hz.
+
+        Returns:
+            np.ndarray: ``(n_rows, npts)`` displacement samples.
+        """
+
+        def apply(
+            segment: np.ndarray, previous: tuple[np.ndarray, np.ndarray] | None
+        ) -> tuple[np.ndarray, tuple[np.ndarray, np.ndarray]]:
+            integrated = integrate(segment, self.sampling_rate, previous=previous)
+            return integrated, (segment[:, -1].copy(), integrated[:, -1].copy())
+
+        key = ("displacement", freq)
+        return self._cached(
+            key,
+            lambda: self.per_segment_continued(
+                self.bandpassed(freqmin=freq), key, apply
+            ),
+        )
+
+    def band_displacement(self, band_frequencies: list[float]) -> np.ndarray:
+        """Return the displacement of a DSAR band, like :meth:`DSAR.process`.
+
+        The integrated displacement is shared by every band with the same
+        high-pass corner.
+
+        Args:
+            band_frequencies (list[float]): ``[high_pass, bandpass_low,
+                bandpass_high]`` in Hz.
+
+        Returns:
+            np.ndarray: ``(n_rows, npts)`` band-passed displacement samples.
+
+        Raises:
+            AssertionError: If ``band_frequencies`` does not contain exactly 3
+                values.
+        """
+        assert len(band_frequencies) == 3, (
+            "\u274c band_frequencies must contain exactly 3 values. "
+            "Example: [0.1, 8.0, 16.0]"
+        )
+        highpass_freq, freqmin, freqmax = band_frequencies
+
+        def apply(
+            segment: np.ndarray, state: tuple[np.ndarray, np.ndarray] | None
+        ) -> tuple[np.ndarray, tuple[np.ndarray, np.ndarray]]:
+            zi_high, zi_low = (
+                (filter_state(segment), filter_state(segment))
+                if state is None
+                else state
+            )
+            segment, zi_high = highpass(
+                segment, freqmin, self.sampling_rate, zi=zi_high
+            )
+            segment, zi_low = lowpass(segment, freqmax, self.sampling_rate, zi=zi_low)
+            return segment, (zi_high, zi_low)
+
+        return self.per_segment_continued(
+            self.displacement(highpass_freq),
+            ("band", highpass_freq, freqmin, freqmax),
+            apply,
+        )
+
+    def release(self, freq: float) -> None:
+        """Drop the velocity and displacement cached for the high-pass corner ``freq``.
+
+        Lets a caller going through many bands keep only the intermediates of the
+        corner it is working on.
+
+        Args:
+            freq (float): High-pass corner in Hz.
+        """
+        with self._lock:
+            for key in (("bandpassed", freq, None), ("displacement", freq)):
+                self._cache.pop(key, None)
+                self._locks.pop(key, None)
+
+    def transient_mask(self, mask: TransientMask) -> np.ndarray:
+        """Return the samples flagged by a transient detector, cached per detector.
+
+        Args:
+            mask (TransientMask): Detector run on the demeaned samples.
+
+        Returns:
+            np.ndarray: ``(npts,)`` boolean mask shared by every row and band.
+        """
+        return self._cached(
+            ("transient_mask", repr(mask)),
+            lambda: mask.compute(self.demeaned, self.sampling_rate, self.segments),
+        )
+
+    def spectrum(
+        self, estimator: SpectralEstimator
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return the velocity spectrum of every window, cached per estimator.
+
+        Args:
+            estimator (SpectralEstimator): Estimator defining the windows and the
+                segment length.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Frequencies,
+                ``(n_rows, n_windows, n_freqs)`` PSD, window start times and
+                coverage.
+        """
+        return self._cached(
+            ("spectrum", estimator.reducer.resample, estimator.segment_length),
+            lambda: estimator.psd(self.masked, self.starttime, self.sampling_rate),
+        )
+
+
+class Metric:
+    """Base class of the metrics computed from the same decoded day as DSAR.
+
+    Subclasses set :attr:`name`, which is also the name of their output
+    directory, and implement :meth:`compute`. Register them with
+    :func:`register_metric` to make them available by name.
+
+    Attributes:
+        name (str): Name of the metric.
+        resample (str): Window length, set by :class:`DSAR`.
+    """
+
+    name: str = ""
+    resample: str = "10min"
+
+    @property
+    def max_frequency(self) -> float | None:
+        """Return the highest frequency the metric needs, used to limit decimation.
+
+        Returns:
+            float | None: Frequency in Hz, or None if the metric needs the full
+                bandwidth.
+        """
+        return None
+
+    def compute(self, day: DayData) -> list[pd.DataFrame]:
+        """Compute the metric of every row of a day.
+
+        Args:
+            day (DayData): Decoded day and its shared intermediates.
+
+        Returns:
+            list[pd.DataFrame]: Window values of every row, in row order, with a
+                ``"datetime"``-named DatetimeIndex.
+        """
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(resample={self.resample})"
+
+
+metric_registry: dict[str, type[Metric]] = {}
+
+
+def register_metric(metric_class: type[Metric]) -> type[Metric]:
+    """Register a metric class under its name.
+
+    Args:
+        metric_class (type[Metric]): Metric subclass.
+
+    Returns:
+        type[Metric]: The same class, so this can be used as a decorator.
+
+    Example:
+        >>> @register_metric
+        ... class PeakAmplitude(Metric):
+        ...     name = "peak"
+    """
+    metric_registry[metric_class.name] = metric_class
+    return metric_class
+
+
+def get_metric(metric: Metric | str) -> Metric:
+    """Return a metric instance from an instance or a registered name.
+
+    Args:
+        metric (Metric | str): Metric instance, or name of a registered metric
+            created with its default parameters.
+
+    Returns:
+        Metric: The metric instance.
+
+    Raises:
+        ValueError: If the name is not registered.
+    """
+    if isinstance(metric, Metric):
+        return metric
+
+    if metric not in metric_registry:
+        raise ValueError(
+            f"Unknown metric '{metric}'. Use one of {list(metric_registry)}"
+        )
+    return metric_registry[metric]()
+
+
+@register_metric
+class RSAM(Metric):
+    """Real-time Seismic Amplitude Measurement.
+
+    Mean absolute velocity per window, optionally band-passed first.
+
+    Example:
+        >>> RSAM(freqmin=1.0, freqmax=10.0)
+    """
+
+    name = "rsam"
+
+    def __init__(
+        self, freqmin: float = None, freqmax: float = None, statistic: str = "mean"
+    ):
+        """Initialize RSAM.
+
+        Args:
+            freqmin (float, optional): High-pass corner in Hz. Defaults to None.
+            freqmax (float, optional): Low-pass corner in Hz. Defaults to None.
+            statistic (str, optional): Window statistic of the absolute velocity,
+                see :class:`WindowReducer`. Defaults to ``"mean"``.
+        """
+        self.freqmin = freqmin
+        self.freqmax = freqmax
+        self.statistic = statistic
+
+    @property
+    def max_frequency(self) -> float | None:
+        return self.freqmax
+
+    def compute(self, day: DayData) -> list[pd.DataFrame]:
+        reducer = WindowReducer(self.resample, [self.statistic])
+        dfs = reducer.reduce_rows(
+            day.bandpassed(self.freqmin, self.freqmax),
+            starttime=day.starttime,
+            sampling_rate=day.sampling_rate,
+        )
+
+        tapered = day.tapered_windows(reducer.window_ns)
+        for df in dfs:
+            df.loc[df.index.isin(tapered)] = np.nan
+        return [df.rename(columns={self.statistic: "RSAM"}) for df in dfs]
+
+
+@register_metric
+class SSAM(Metric):
+    """Spectral Seismic Amplitude Measurement.
+
+    Mean spectral amplitude of the velocity in each frequency band per window.
+    Columns are named ``SSAM_{freqmin}-{freqmax}Hz``.
+
+    Example:
+        >>> SSAM(bands=[(0.5, 2.0), (2.0, 8.0)])
+    """
+
+    name = "ssam"
+
+    def __init__(
+        self,
+        bands: list[tuple[float, float]] = None,
+        segment_length: float = 20.48,
+    ):
+        """Initialize SSAM.
+
+        Args:
+            bands (list[tuple[float, float]], optional): Frequency bands in Hz.
+                Defaults to octaves from 0.5 to 16 Hz.
+            segment_length (float, optional): Length of a spectral segment in
+                seconds, see :class:`SpectralEstimator`. Defaults to 20.48.
+        """
+        self.bands = (
+            [(0.5, 1.0), (1.0, 2.0), (2.0, 4.0), (4.0, 8.0), (8.0, 16.0)]
+            if bands is None
+            else bands
+        )
+        self.segment_length = segment_length
+
+    @property
+    def max_frequency(self) -> float | None:
+        return max(freqmax for _, freqmax in self.bands)
+
+    def compute(self, day: DayData) -> list[pd.DataFrame]:
+        estimator = SpectralEstimator(self.resample, self.segment_length)
+        freqs, psd, windows, _ = day.spectrum(estimator)
+        amplitude = np.sqrt(psd)
+
+        columns = {
+            f"SSAM_{freqmin:g}-{freqmax:g}Hz": amplitude[
+                ..., (freqs >= freqmin) & (freqs < freqmax)
+            ].mean(axis=-1)
+            for freqmin, freqmax in self.bands
+        }
+
+        index = pd.DatetimeIndex(windows.view("datetime64[ns]"), name="datetime")
+        return [
+            pd.DataFrame(
+                {column: values[row] for column, values in columns.items()},
+                index=index,
+            )
+            for row in range(psd.shape[0])
+        ]
+
+
+@register_metric
+class FrequencyIndex(Metric):
+    """Frequency index of Buurman and West (2010).
+
+    ``FI = log10(mean(A_upper) / mean(A_lower))`` with ``A`` the spectral
+    amplitude of the velocity in the upper and lower frequency bands.
+
+    Example:
+        >>> FrequencyIndex(lower=(1.0, 2.0), upper=(10.0, 20.0))
+    """
+
+    name = "frequency_index"
+
+    def __init__(
+        self,
+        lower: tuple[float, float] = (1.0, 2.0),
+        upper: tuple[float, float] = (10.0, 20.0),
+        segment_length: float = 20.48,
+    ):
+        """Initialize the frequency index.
+
+        Args:
+            lower (tuple[float, float], optional): Lower band in Hz.
+                Defaults to ``(1.0, 2.0)``.
+            upper (tuple[float, float], optional): Upper band in Hz.
+                Defaults to ``(10.0, 20.0)``.
+            segment_length (float, optional): Length of a spectral segment in
+                seconds, see :class:`SpectralEstimator`. Defaults to 20.48.
+        """
+        self.lower = lower
+        self.upper = upper
+        self.segment_length = segment_length
+
+    @property
+    def max_frequency(self) -> float | None:
+        return max(self.lower[1], self.upper[1])
+
+    def compute(self, day: DayData) -> list[pd.DataFrame]:
+        ssam = SSAM(bands=[self.lower, self.upper], segment_length=self.segment_length)
+        ssam.resample = self.resample
+
+        dfs: list[pd.DataFrame] = []
+        for df in ssam.compute(day):
+            lower, upper = df.columns
+            dfs.append(np.log10(df[upper] / df[lower]).to_frame("FI"))
+
+        return dfs
@@ -0,0 +1,397 @@
+# Standard library imports
+import contextlib
+import copy
+import io
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+# Third party imports
+import numpy as np
+import pandas as pd
+from obspy import Stream, Trace, UTCDateTime, read
+
+# Project imports
+from dsar.sds import SDS
+from dsar.utilities import atomic_write
+
+if TYPE_CHECKING:
+    from dsar.core import DSAR
+
+# Headroom kept free when sizing the number of workers to the available memory
+memory_headroom: float = 0.8
+
+
+def available_memory() -> int | None:
+    """Return the physical memory currently available in bytes.
+
+    Returns:
+        int | None: Available memory, or None if the platform does not report it.
+    """
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+class Planner:
+    """Estimate the cost of a DSAR run before launching it.
+
+    :meth:`scan` lists every station-day with the size and sample count of its
+    miniSEED files, read from the record headers without decoding any sample.
+    Files in object storage are fetched (and kept in the store's read-through
+    cache when it has one) to read their headers.
+    :meth:`calibrate` times the decoding of one real file and the processing of
+    a synthetic stream with each DSAR's bands, statistics and metrics on this
+    machine, and records the peak memory of the processing. :meth:`plan` scales
+    the calibration to every job, and :meth:`summary` adds up the runtime and
+    recommends a number of workers that fits the available memory.
+
+    Attributes:
+        dsars (list[DSAR]): Configured DSAR calculators, one per station.
+        calibration (dict[str, dict[str, float]]): Calibration per NSLC.
+
+    Example:
+        >>> planner = Planner([dsar_ojn, dsar_pgt])
+        >>> jobs = planner.plan()
+        >>> planner.summary(jobs)
+    """
+
+    def __init__(
+        self,
+        dsars: "DSAR | list[DSAR]",
+        calibration: dict[str, dict[str, float]] | str = None,
+    ):
+        """Initialize the planner.
+
+        Args:
+            dsars (DSAR | list[DSAR]): Configured DSAR calculator(s).
+            calibration (dict[str, dict[str, float]] | str, optional): Calibration
+                returned by :meth:`calibrate`, or the path of a JSON file written
+                by :meth:`save_calibration`. Defaults to None (calibrated on the
+                first call to :meth:`plan`).
+        """
+        if not isinstance(dsars, list):
+            dsars = [dsars]
+
+        if isinstance(calibration, str):
+            with open(calibration, encoding="utf-8") as f:
+                calibration = json.load(f)
+
+        self.dsars = dsars
+        self.calibration: dict[str, dict[str, float]] = calibration or {}
+
+    def __repr__(self) -> str:
+        return (
+            f"Planner(nslc={[dsar.nslc for dsar in self.dsars]}, "
+            f"calibrated={sorted(self.calibration)})"
+        )
+
+    @staticmethod
+    def scan(dsar: "DSAR") -> pd.DataFrame:
+        """List the files of every day of a DSAR run without decoding them.
+
+        Args:
+            dsar (DSAR): Configured DSAR calculator.
+
+        Returns:
+            pd.DataFrame: One row per date with the NSLC, the number of channel
+                files found, the missing channels, the total file size in bytes,
+                the number of traces and samples from the record headers, and
+                the highest sampling rate.
+        """
+        assert all(isinstance(sds, SDS) for sds in dsar.sources), (
+            f"\u274c Planning requires an SDS archive. {dsar.nslc} is read from "
+            f"an FDSN web service"
+        )
+
+        rows: list[dict[str, Any]] = []
+
+        for date_str in dsar.dates:
+            date = datetime.strptime(date_str, "%Y-%m-%d")
+            row: dict[str, Any] = {
+                "date": date_str,
+                "nslc": dsar.nslc,
+                "files": 0,
+                "missing": [],
+                "size": 0,
+                "n_traces": 0,
+                "npts": 0,
+                "sampling_rate": np.nan,
+            }
+
+            for sds in dsar.sources:
+                filepath = sds.get_filepath(date)
+                if not sds.storage.exists(filepath):
+                    row["missing"].append(sds.channel)
+                    continue
+
+                try:
+                    stream = read(
+                        sds.storage.open(filepath), format="MSEED", headonly=True
+                    )
+                except Exception as e:
+                    print(f"\u26a0\ufe0f {date_str} : Cannot read {filepath}: {e}")
+                    row["missing"].append(sds.channel)
+                    continue
+
+                row["files"] += 1
+                row["size"] += sds.storage.info(filepath)["size"]
+                row["n_traces"] += len(stream)
+                row["npts"] += sum(trace.stats.npts for trace in stream)
+                row["sampling_rate"] = np.nanmax(
+                    [row["sampling_rate"]]
+                    + [trace.stats.sampling_rate for trace in stream]
+                )
+
+            rows.append(row)
+
+        return pd.DataFrame(rows)
+
+    @staticmethod
+    def _measure(dsar: "DSAR", sampling_rate: float, duration: float) -> tuple:
+        """Process ``duration`` seconds of synthetic noise on every channel.
+
+        Returns:
+            tuple: Number of samples, wall time in seconds and peak traced memory
+                in bytes.
+        """
+        npts = int(duration * sampling_rate)
+        rng = np.random.default_rng(0)
+        starttime = UTCDateTime(dsar.dates[0])
+        stream = Stream(
+            [
+                Trace(
+                    data=rng.standard_normal(npts),
+                    header={
+                        "network": dsar.network,
+                        "station": dsar.station,
+                        "location": dsar.location,
+                        "channel": sds.channel,
+                        "starttime": starttime,
+                        "sampling_rate": sampling_rate,
+                    },
+                )
+                for sds in dsar.sources
+            ]
+        )
+
+        # Work on a copy so the calibration leaves the calculator's results alone
+        worker = copy.copy(dsar)
+        tracemalloc.start()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            dfs = worker.process_day(starttime.strftime("%Y-%m-%d"), stream)
+            worker.calculate(dfs=dfs)
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return npts * len(stream), seconds, peak
+
+    def calibrate(
+        self,
+        dsar: "DSAR",
+        sampling_rate: float = None,
+        durations: tuple[float, float] = (3600.0, 4 * 3600.0),
+    ) -> dict[str, float]:
+        """Measure decoding and processing costs of a DSAR run on this machine.
+
+        Decoding is timed on the largest channel file of the first day with data.
+        Processing runs :meth:`DSAR.process_day` and :meth:`DSAR.calculate` on
+        synthetic noise of both ``durations`` on every channel, after a short
+        warm-up, and records their wall time and peak memory (traced
+        allocations, which include every NumPy array). A line through both
+        measurements separates the fixed cost of a job from its cost per sample.
+
+        Args:
+            dsar (DSAR): Configured DSAR calculator.
+            sampling_rate (float, optional): Sampling rate of the synthetic
+                stream. Defaults to the rate found in the archive, or 100 Hz.
+            durations (tuple[float, float], optional): Durations of the two
+                synthetic streams in seconds. Defaults to 1 and 4 hours.
+
+        Returns:
+            dict[str, float]: Decoding seconds per file byte, fixed and per-sample
+                processing seconds, and fixed and per-sample peak bytes. Also
+                stored in ``self.calibration`` under the NSLC.
+        """
+        scan = self.scan_head(dsar)
+        if sampling_rate is None:
+            rates = scan["sampling_rate"].dropna()
+            sampling_rate = float(rates.max()) if len(rates) else 100.0
+
+        decode_seconds_per_byte = 0.0
+        existing = scan[scan["files"] > 0]
+        if len(existing) > 0:
+            date = datetime.strptime(existing["date"].iloc[0], "%Y-%m-%d")
+            sds, filepath = max(
+                (
+                    (sds, sds.get_filepath(date))
+                    for sds in dsar.sources
+                    if sds.storage.exists(sds.get_filepath(date))
+                ),
+                key=lambda item: item[0].storage.info(item[1])["size"],
+            )
+            source = sds.storage.open(filepath)
+            start = time.perf_counter()
+            read(source, format="MSEED")
+            decode_seconds_per_byte = (time.perf_counter() - start) / max(
+                sds.storage.info(filepath)["size"], 1
+            )
+
+        # Warm-up: lazy imports and first-call overheads are not part of a job
+        self._measure(dsar, sampling_rate, min(durations) / 4)
+        short, long = sorted(durations)
+        n_short, seconds_short, peak_short = self._measure(dsar, sampling_rate, short)
+        n_long, seconds_long, peak_long = self._measure(dsar, sampling_rate, long)
+
+        seconds_per_sample = max(seconds_long - seconds_short, 0.0) / (n_long - n_short)
+        bytes_per_sample = max(peak_long - peak_short, 0) / (n_long - n_short)
+
+        calibration = {
+            "decode_seconds_per_byte": decode_seconds_per_byte,
+            "process_seconds": max(seconds_short - seconds_per_sample * n_short, 0.0),
+            "process_seconds_per_sample": seconds_per_sample,
+            "peak_bytes": max(peak_short - bytes_per_sample * n_short, 0.0),
+            "peak_bytes_per_sample": bytes_per_sample,
+            "sampling_rate": sampling_rate,
+        }
+        self.calibration[dsar.nslc] = calibration
+
+        return calibration
+
+    @staticmethod
+    def scan_head(dsar: "DSAR", days: int = 3) -> pd.DataFrame:
+        """Scan only the first days of a DSAR run.
+
+        Args:
+            dsar (DSAR): Configured DSAR calculator.
+            days (int, optional): Number of days scanned. Defaults to 3.
+
+        Returns:
+            pd.DataFrame: Same columns as :meth:`scan`.
+        """
+        head = copy.copy(dsar)
+        head.end_date = min(
+            dsar.end_date,
+            (pd.Timestamp(dsar.start_date) + pd.Timedelta(days=days - 1)).strftime(
+                "%Y-%m-%d"
+            ),
+        )
+        return Planner.scan(head)
+
+    def save_calibration(self, path: str) -> str:
+        """Save the calibration to a JSON file, to reuse it in later plans.
+
+        Args:
+            path (str): Path of the JSON file.
+
+        Returns:
+            str: Path of the JSON file.
+        """
+        with atomic_write(path, encoding="utf-8") as f:
+            json.dump(self.calibration, f, indent=2)
+
+        return path
+
+    def plan(self) -> pd.DataFrame:
+        """List every job of every DSAR run with its estimated cost.
+
+        DSAR runs without a calibration are calibrated first.
+
+        Returns:
+            pd.DataFrame: :meth:`scan` rows of every run, plus the estimated
+                ``seconds`` and peak ``memory`` (bytes) of every job. Days
+                without any file have zero cost.
+        """
+        plans: list[pd.DataFrame] = []
+
+        for dsar in self.dsars:
+            print(
+                f"\u231b Planning {dsar.nslc} from {dsar.start_date} to {dsar.end_date}"
+            )
+            if dsar.nslc not in self.calibration:
+                self.calibrate(dsar)
+            calibration = self.calibration[dsar.nslc]
+
+            df = self.scan(dsar)
+            has_data = df["files"] > 0
+            df["seconds"] = has_data * (
+                calibration["process_seconds"]
+                + df["size"] * calibration["decode_seconds_per_byte"]
+                + df["npts"] * calibration["process_seconds_per_sample"]
+            )
+            # The decoded samples are held as well as the processing intermediates
+            df["memory"] = (
+                has_data
+                * (
+                    calibration["peak_bytes"]
+                    + df["npts"] * (calibration["peak_bytes_per_sample"] + 8)
+                )
+            ).astype(np.int64)
+            plans.append(df)
+
+        return pd.concat(plans, ignore_index=True)
+
+    @staticmethod
+    def summary(plan: pd.DataFrame, max_workers: int = None) -> dict[str, Any]:
+        """Summarize a plan and recommend a number of workers.
+
+        Args:
+            plan (pd.DataFrame): Plan returned by :meth:`plan`.
+            max_workers (int, optional): Upper bound of the recommendation.
+                Defaults to the number of CPUs.
+
+        Returns:
+            dict[str, Any]: Number of jobs and missing days, estimated total
+                CPU time, peak memory of the largest job, available memory,
+                recommended workers and the resulting wall time.
+        """
+        max_workers = max_workers or os.cpu_count() or 1
+        memory = available_memory()
+        peak = int(plan["memory"].max()) if len(plan) else 0
+
+        workers = max_workers
+        if memory is not None and peak > 0:
+            workers = max(1, min(max_workers, int(memory * memory_headroom // peak)))
+
+        jobs = plan[plan["files"] > 0]
+        total_seconds = float(plan["seconds"].sum())
+
+        summary = {
+            "jobs": len(jobs),
+            "missing_days": int((plan["files"] == 0).sum()),
+            "incomplete_days": int(
+                ((plan["files"] > 0) & (plan["missing"].str.len() > 0)).sum()
+            ),
+            "samples": int(plan["npts"].sum()),
+            "cpu_seconds": total_seconds,
+            "peak_memory": peak,
+            "available_memory": memory,
+            "workers": workers,
+            "wall_seconds": (
+                max(total_seconds / workers, float(plan["seconds"].max()))
+                if len(plan)
+                else 0.0
+            ),
+        }
+
+        print(
+            f"\U0001f9ee {summary['jobs']} job(s), {summary['missing_days']} missing "
+            f"day(s), {summary['incomplete_days']} day(s) with missing channels"
+        )
+        print(
+            f"\U0001f9ee Estimated {pd.Timedelta(seconds=round(total_seconds))} "
+            f"CPU time, "
+            f"{peak / 1024**2:.0f} MiB peak per job"
+        )
+        print(
+            f"\u2705 Recommended {workers} worker(s): about "
+            f"{pd.Timedelta(seconds=round(summary['wall_seconds']))}"
+        )
+
+        return summary
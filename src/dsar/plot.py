@@ -1,13 +1,88 @@
 # Standard library imports
 import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from glob import glob
 
 # Third party imports
+import matplotlib
 import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
 import pandas as pd
 
+# Project imports
+from dsar.continuous import smooth
+from dsar.store import ResultStore
+from dsar.utilities import plot_eruptions
+
+
+def plot_dsar_axes(
+    axes: plt.Axes,
+    df: pd.DataFrame,
+    resample: str,
+    interval_day: int = 3,
+    title: str = None,
+    y_min: float = None,
+    y_max: float = None,
+    legend: bool = True,
+) -> plt.Axes:
+    """Draw DSAR values and the 24-hour rolling median on an existing axes.
+
+    Args:
+        axes (plt.Axes): The axes on which to draw.
+        df (pd.DataFrame): Combined DSAR DataFrame with a ``datetime`` index.
+        resample (str): Resampling interval used during DSAR calculation.
+        interval_day (int, optional): X-axis major tick interval in days.
+            Defaults to 3.
+        title (str, optional): Annotation text drawn in the upper-left corner.
+            Defaults to None (no annotation).
+        y_min (float, optional): Minimum y-axis value. Defaults to None.
+        y_max (float, optional): Maximum y-axis value. Defaults to None.
+        legend (bool, optional): Whether to draw the legend. Defaults to True.
+
+    Returns:
+        plt.Axes: The modified axes.
+
+    Example:
+        >>> fig, ax = plt.subplots()
+        >>> plot_dsar_axes(ax, df, resample="10min", title="DSAR - VG.OJN.00.EHZ")
+    """
+    axes.scatter(
+        df.index,
+        df[f"DSAR_{resample}"],
+        c="k",
+        alpha=0.3,
+        s=10,
+        label=resample,
+    )
+
+    axes.plot(df.index, df["DSAR_24h_median"], c="orange", label="24h_median", alpha=1)
+    axes.set_ylabel("DSAR")
+
+    axes.xaxis.set_major_locator(mdates.DayLocator(interval=interval_day))
+
+    axes.set_xlim(df.first_valid_index(), df.last_valid_index())
+
+    if (y_min is not None) and (y_max is not None):
+        axes.set_ylim(y_min, y_max)
+
+    if title is not None:
+        axes.annotate(
+            text=title,
+            xy=(0.01, 0.92),
+            xycoords="axes fraction",
+            fontsize="8",
+            bbox={"facecolor": "white", "alpha": 0.5},
+        )
+
+    if legend:
+        axes.legend(loc="upper right", fontsize="8", ncol=4)
+
+    for label in axes.get_xticklabels(which="major"):
+        label.set(rotation=30, horizontalalignment="right")
+
+    return axes
+
 
 class PlotDsar:
     """Visualization class for DSAR time-series data.
@@ -89,8 +164,9 @@ class PlotDsar:
         """Load, combine, and return all daily DSAR CSV files as a single DataFrame.
 
         Reads all ``*.csv`` files from the DSAR output directory for the configured
-        NSLC and resample interval, concatenates them, removes duplicates, sorts by
-        datetime, and saves a combined CSV file to disk.
+        NSLC and resample interval into one :class:`ResultStore`, one file at a
+        time, drops incomplete rows, recomputes the rolling medians across day
+        boundaries, and saves a combined CSV file to disk.
 
         Returns:
             pd.DataFrame: Combined and sorted DataFrame with a ``datetime`` index
@@ -102,36 +178,54 @@ class PlotDsar:
         Example:
             >>> df = plot.df
         """
-        df_list: list = []
-
         csv_path = os.path.join(self.dsar_dir, self.nslc, self.resample)
 
         csv_files: list[str] = glob(os.path.join(csv_path, "*.csv"))
 
         assert len(csv_files) > 0, f"\u274c No CSV files found in {csv_path}."
 
-        for csv in csv_files:
-            df = pd.read_csv(csv)
-            if not df.empty:
-                df_list.append(df)
+        big_df = ResultStore.read_csv(csv_files, resample=self.resample).to_frame(
+            dropna=True
+        )
 
-        big_df = pd.concat(df_list, ignore_index=True)
-        big_df = big_df.dropna()
-        big_df = big_df.sort_values(by=["datetime"])
-        big_df = big_df.drop_duplicates(keep="last")
-        big_df = big_df.set_index("datetime")
-        big_df.index = pd.to_datetime(big_df.index)
+        # Daily files are smoothed within their own day only
+        column = f"DSAR_{self.resample}"
+        if column in big_df.columns:
+            big_df = smooth(big_df, column)
 
-        combined_csv_file: str = os.path.join(
-            self.dsar_dir,
-            self.nslc,
-            "combined_{}_{}.csv".format(self.resample, self.nslc),
-        )
+        combined_csv_file: str = self.combined_path
 
         big_df.to_csv(combined_csv_file, index=True)
         print(f"\u2705 Combined CSV saved to: {combined_csv_file}")
         return big_df
 
+    @property
+    def combined_path(self) -> str:
+        """Return the path of the combined CSV file saved by :attr:`df`.
+
+        Returns:
+            str: ``{dsar_dir}/{NSLC}/combined_{resample}_{NSLC}.csv``.
+        """
+        return os.path.join(
+            self.dsar_dir,
+            self.nslc,
+            f"combined_{self.resample}_{self.nslc}.csv",
+        )
+
+    def figure_path(self, file_type: str = "png") -> str:
+        """Return the path under which the figure of this NSLC is saved.
+
+        Args:
+            file_type (str, optional): Output file extension. Defaults to ``"png"``.
+
+        Returns:
+            str: ``{figures_dir}/{NSLC}/{NSLC}_{resample}_{start}-{end}.{file_type}``.
+        """
+        filename: str = (
+            f"{self.nslc}_{self.resample}_{self.start_date}-{self.end_date}.{file_type}"
+        )
+        return os.path.join(self.figures_dir, self.nslc, filename)
+
     def save(self, figure: plt.Figure, file_type: str = "png") -> bool:
         """Save a matplotlib figure to disk.
 
@@ -146,13 +240,9 @@ class PlotDsar:
         Example:
             >>> plot.save(fig, file_type="jpg")
         """
-        save_path: str = os.path.join(self.figures_dir, self.nslc)
-        os.makedirs(save_path, exist_ok=True)
+        save_file = self.figure_path(file_type)
+        os.makedirs(os.path.dirname(save_file), exist_ok=True)
 
-        filename: str = (
-            f"{self.nslc}_{self.resample}_{self.start_date}-{self.end_date}.{file_type}"
-        )
-        save_file = os.path.join(save_path, filename)
         try:
             figure.savefig(save_file, dpi=300)
             print(f"\U0001F4F7 Figure saved to: {save_file}")
@@ -169,6 +259,9 @@ class PlotDsar:
         y_max: float = None,
         save: bool = True,
         file_type: str = "png",
+        df: pd.DataFrame = None,
+        axvspans: list[list[str]] = None,
+        axvlines: list[str] = None,
     ) -> plt.Figure:
         """Generate a DSAR time-series plot.
 
@@ -187,6 +280,12 @@ class PlotDsar:
                 Defaults to True.
             file_type (str, optional): File format for saving (e.g., ``"png"``,
                 ``"jpg"``). Defaults to ``"png"``.
+            df (pd.DataFrame, optional): Pre-loaded combined DataFrame. Defaults to
+                None, which reads the daily CSV files through :attr:`df`.
+            axvspans (list[list[str]], optional): ``[start_date, end_date]`` pairs
+                for continuous eruption intervals. Defaults to None.
+            axvlines (list[str], optional): Dates in YYYY-MM-DD format for discrete
+                eruption events. Defaults to None.
 
         Returns:
             plt.Figure: The generated matplotlib Figure.
@@ -199,47 +298,336 @@ class PlotDsar:
             ...     interval_day=7, y_min=85, y_max=225, save=True, file_type="jpg"
             ... )
         """
-        df = self.df
+        df = self.df if df is None else df
 
         assert not df.empty, f"\u274c DataFrame is empty"
 
         fig, axs = plt.subplots(nrows=1, ncols=1, figsize=(12, 3), layout="constrained")
 
-        axs.scatter(
-            df.index,
-            df["DSAR_{}".format(self.resample)],
-            c="k",
-            alpha=0.3,
-            s=10,
-            label="10min",
+        plot_dsar_axes(
+            axs,
+            df=df,
+            resample=self.resample,
+            interval_day=interval_day,
+            title="DSAR - " + self.nslc if title is None else title,
+            y_min=y_min,
+            y_max=y_max,
         )
 
-        axs.plot(
-            df.index, df["DSAR_24h_median"], c="orange", label="24h_median", alpha=1
+        plot_eruptions(axs, axvspans=axvspans, axvlines=axvlines)
+
+        if save:
+            self.save(fig, file_type)
+
+        return fig
+
+
+def _init_worker() -> None:
+    """Switch worker processes to the non-interactive ``Agg`` backend."""
+    matplotlib.use("Agg")
+
+
+def _load_station(task: dict) -> pd.DataFrame:
+    """Load the combined DataFrame of a single NSLC inside a worker process.
+
+    Args:
+        task (dict): Keyword arguments forwarded to :class:`PlotDsar`.
+
+    Returns:
+        pd.DataFrame: Combined DSAR DataFrame of the station.
+    """
+    return PlotDsar(**task).df
+
+
+def _render_station(task: dict) -> tuple[str | None, str | None]:
+    """Load, render and save the figure of a single NSLC inside a worker process.
+
+    The combined DataFrame never leaves the worker: the stacked figure reads it
+    back from the combined CSV file saved by :attr:`PlotDsar.df`.
+
+    Args:
+        task (dict): Rendering options with the :class:`PlotDsar` keyword
+            arguments under ``station``.
+
+    Returns:
+        tuple[str | None, str | None]: Path to the saved figure, or None if
+            saving failed, and path to the combined CSV file, or None if the
+            station has no data.
+    """
+    plotter = PlotDsar(**task["station"])
+    df = plotter.df
+    if df.empty:
+        return None, None
+
+    fig = plotter.plot(
+        interval_day=task["interval_day"],
+        y_min=task["y_min"],
+        y_max=task["y_max"],
+        save=False,
+        df=df,
+        axvspans=task["axvspans"],
+        axvlines=task["axvlines"],
+    )
+    saved = plotter.save(fig, task["file_type"])
+    plt.close(fig)
+
+    figure_file = plotter.figure_path(task["file_type"]) if saved else None
+    return figure_file, plotter.combined_path
+
+
+def _render_stacked(task: dict) -> str | None:
+    """Render and save a shared-time-axis multi-panel figure inside a worker process.
+
+    Args:
+        task (dict): Rendering options with the combined CSV file of every NSLC
+            under ``csv_files``.
+
+    Returns:
+        str | None: Path to the saved figure, or None if saving failed.
+    """
+    columns = ["datetime", f"DSAR_{task['resample']}", "DSAR_24h_median"]
+    dfs: dict[str, pd.DataFrame] = {
+        nslc: pd.read_csv(
+            csv_file, usecols=columns, index_col="datetime", parse_dates=True
+        )
+        for nslc, csv_file in task["csv_files"].items()
+    }
+
+    fig, axs = plt.subplots(
+        nrows=len(dfs),
+        ncols=1,
+        figsize=(12, 2 * len(dfs)),
+        sharex=True,
+        layout="constrained",
+        squeeze=False,
+    )
+
+    for index, (nslc, df) in enumerate(dfs.items()):
+        axes = axs[index, 0]
+        plot_dsar_axes(
+            axes,
+            df=df,
+            resample=task["resample"],
+            interval_day=task["interval_day"],
+            title="DSAR - " + nslc,
+            y_min=task["y_min"],
+            y_max=task["y_max"],
+            legend=index == 0,
         )
-        axs.set_ylabel("DSAR")
+        plot_eruptions(axes, axvspans=task["axvspans"], axvlines=task["axvlines"])
 
-        axs.xaxis.set_major_locator(mdates.DayLocator(interval=interval_day))
+    start = min(df.first_valid_index() for df in dfs.values())
+    end = max(df.last_valid_index() for df in dfs.values())
+    axs[-1, 0].set_xlim(start, end)
 
-        axs.set_xlim(df.first_valid_index(), df.last_valid_index())
+    os.makedirs(task["figures_dir"], exist_ok=True)
+    save_file = os.path.join(task["figures_dir"], task["filename"])
 
-        if (y_min is not None) and (y_max is not None):
-            axs.set_ylim(y_min, y_max)
+    try:
+        fig.savefig(save_file, dpi=300)
+        print(f"\U0001F4F7 Figure saved to: {save_file}")
+        return save_file
+    except Exception as e:
+        print(e)
+        return None
+    finally:
+        plt.close(fig)
 
-        axs.annotate(
-            text="DSAR - " + self.nslc if title is None else title,
-            xy=(0.01, 0.92),
-            xycoords="axes fraction",
-            fontsize="8",
-            bbox=dict(facecolor="white", alpha=0.5),
+
+class PlotDsarBatch:
+    """Render DSAR figures for many stations in parallel.
+
+    Each station's combined DataFrame is loaded and rendered in the same worker
+    process, so no DataFrame is sent between processes. The stacked multi-panel
+    figure with a shared time axis is rendered afterwards from the combined CSV
+    files the station workers saved. Workers use the non-interactive ``Agg``
+    backend, and eruption markers are applied to every panel.
+
+    Example:
+        >>> batch = PlotDsarBatch(
+        ...     start_date="2025-01-01",
+        ...     end_date="2025-01-08",
+        ...     nslcs=["VG.OJN.00.EHZ", "VG.RUA3.00.EHZ"],
+        ...     axvlines=["2025-01-07"],
+        ... )
+        >>> batch.plot(interval_day=2, file_type="jpg")
+    """
+
+    def __init__(
+        self,
+        start_date: str,
+        end_date: str,
+        nslcs: list[str],
+        dsar_dir: str = None,
+        figures_dir: str = None,
+        resample: str = "10min",
+        axvspans: list[list[str]] = None,
+        axvlines: list[str] = None,
+        max_workers: int = None,
+    ):
+        """Initialize the batch plotter.
+
+        Args:
+            start_date (str): Start date of the plot range in ``YYYY-MM-DD`` format.
+            end_date (str): End date of the plot range in ``YYYY-MM-DD`` format.
+            nslcs (list[str]): NSLC identifiers in
+                ``"Network.Station.Location.Channel"`` format.
+            dsar_dir (str, optional): Directory containing calculated DSAR CSV files.
+                Defaults to ``<cwd>/output/dsar``.
+            figures_dir (str, optional): Directory for saving figures.
+                Defaults to ``<cwd>/output/figures/dsar``.
+            resample (str, optional): Pandas offset alias matching the DSAR
+                calculation interval. Defaults to ``"10min"``.
+            axvspans (list[list[str]], optional): ``[start_date, end_date]`` pairs
+                for continuous eruption intervals. Defaults to None.
+            axvlines (list[str], optional): Dates in YYYY-MM-DD format for discrete
+                eruption events. Defaults to None.
+            max_workers (int, optional): Number of worker processes. Defaults to
+                None (number of CPUs).
+
+        Raises:
+            AssertionError: If ``nslcs`` is empty or ``start_date`` is after
+                ``end_date``.
+        """
+        assert len(nslcs) > 0, "\u274c nslcs must contain at least one NSLC"
+
+        self.start_date = start_date
+        self.end_date = end_date
+        self.nslcs = nslcs
+        self.resample = resample
+        self.axvspans = axvspans
+        self.axvlines = axvlines
+        self.max_workers = max_workers
+
+        self.plotters: dict[str, PlotDsar] = {}
+        for nslc in nslcs:
+            network, station, location, channel = nslc.split(".")
+            self.plotters[nslc] = PlotDsar(
+                start_date=start_date,
+                end_date=end_date,
+                station=station,
+                channel=channel,
+                dsar_dir=dsar_dir,
+                figures_dir=figures_dir,
+                network=network,
+                location=location,
+                resample=resample,
+            )
+
+        first_plotter = self.plotters[nslcs[0]]
+        self.dsar_dir = first_plotter.dsar_dir
+        self.figures_dir = first_plotter.figures_dir
+
+        self._dfs: dict[str, pd.DataFrame] | None = None
+
+    def _station_kwargs(self, nslc: str) -> dict:
+        plotter = self.plotters[nslc]
+        return {
+            "start_date": plotter.start_date,
+            "end_date": plotter.end_date,
+            "station": plotter.station,
+            "channel": plotter.channel,
+            "dsar_dir": plotter.dsar_dir,
+            "figures_dir": plotter.figures_dir,
+            "network": plotter.network,
+            "location": plotter.location,
+            "resample": plotter.resample,
+        }
+
+    def _executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers, initializer=_init_worker
         )
 
-        axs.legend(loc="upper right", fontsize="8", ncol=4)
+    @property
+    def dfs(self) -> dict[str, pd.DataFrame]:
+        """Load the combined DataFrame of every station once.
 
-        for label in axs.get_xticklabels(which="major"):
-            label.set(rotation=30, horizontalalignment="right")
+        DataFrames are loaded in parallel on the first access and cached for
+        subsequent calls. :meth:`plot` does not use them: it loads every station
+        inside the worker rendering it.
 
-        if save:
-            self.save(fig, file_type)
+        Returns:
+            dict[str, pd.DataFrame]: Mapping of NSLC to its combined DataFrame.
+        """
+        if self._dfs is None:
+            with self._executor() as executor:
+                dfs = executor.map(
+                    _load_station, [self._station_kwargs(n) for n in self.nslcs]
+                )
+                self._dfs = dict(zip(self.nslcs, dfs, strict=True))
 
-        return fig
+        return self._dfs
+
+    def plot(
+        self,
+        interval_day: int = 3,
+        y_min: float = None,
+        y_max: float = None,
+        file_type: str = "png",
+        stacked: bool = True,
+    ) -> list[str]:
+        """Render individual station figures and the stacked network figure.
+
+        Args:
+            interval_day (int, optional): X-axis major tick interval in days.
+                Defaults to 3.
+            y_min (float, optional): Minimum y-axis value. Defaults to None.
+            y_max (float, optional): Maximum y-axis value. Defaults to None.
+            file_type (str, optional): File format for saving (e.g., ``"png"``,
+                ``"jpg"``). Defaults to ``"png"``.
+            stacked (bool, optional): Whether to also render the stacked
+                multi-panel figure. Defaults to True.
+
+        Returns:
+            list[str]: Paths of the saved figures.
+
+        Example:
+            >>> files = batch.plot(interval_day=7, file_type="jpg")
+        """
+        options = {
+            "interval_day": interval_day,
+            "y_min": y_min,
+            "y_max": y_max,
+            "axvspans": self.axvspans,
+            "axvlines": self.axvlines,
+        }
+
+        with self._executor() as executor:
+            results = list(
+                executor.map(
+                    _render_station,
+                    [
+                        {
+                            "station": self._station_kwargs(nslc),
+                            "file_type": file_type,
+                            **options,
+                        }
+                        for nslc in self.nslcs
+                    ],
+                )
+            )
+
+            files = [figure_file for figure_file, _ in results]
+            csv_files = {
+                nslc: csv_file
+                for nslc, (_, csv_file) in zip(self.nslcs, results, strict=True)
+                if csv_file is not None
+            }
+
+            if stacked and len(csv_files) > 0:
+                files.append(
+                    executor.submit(
+                        _render_stacked,
+                        {
+                            "csv_files": csv_files,
+                            "resample": self.resample,
+                            "figures_dir": self.figures_dir,
+                            "filename": f"stacked_{self.resample}_{self.start_date}-"
+                            f"{self.end_date}.{file_type}",
+                            **options,
+                        },
+                    ).result()
+                )
+
+        return [file for file in files if file is not None]
@@ -0,0 +1,290 @@
+# Third party imports
+import numpy as np
+
+# scipy.signal and scipy.integrate take most of the import time of the processing
+# core, so they are imported on first use.
+
+
+def demean(data: np.ndarray) -> np.ndarray:
+    """Remove the mean of every row along the time (last) axis.
+
+    Args:
+        data (np.ndarray): Samples with time on the last axis.
+
+    Returns:
+        np.ndarray: Demeaned float64 samples.
+    """
+    data = np.asarray(data, dtype=np.float64)
+    return data - data.mean(axis=-1, keepdims=True)
+
+
+def taper(
+    data: np.ndarray,
+    max_percentage: float = 0.05,
+    side: str = "both",
+    max_npts: int = None,
+) -> np.ndarray:
+    """Apply a Hann taper to the ends of every row, like ``Trace.taper``.
+
+    Args:
+        data (np.ndarray): Samples with time on the last axis.
+        max_percentage (float, optional): Tapered fraction at each end.
+            Defaults to 0.05.
+        side (str, optional): ``"both"``, ``"left"`` or ``"right"`` end tapered.
+            Defaults to ``"both"``.
+        max_npts (int, optional): Longest taper at each end in samples, like the
+            ``max_length`` of ``Trace.taper``. Defaults to None (no limit).
+
+    Returns:
+        np.ndarray: Tapered samples.
+    """
+    npts = data.shape[-1]
+    wlen = taper_length(npts, max_percentage, max_npts)
+    if wlen == 0:
+        return data
+
+    sides = np.hanning(2 * wlen if 2 * wlen == npts else 2 * wlen + 1)
+    left = sides[:wlen] if side in ("both", "left") else np.ones(wlen)
+    right = sides[len(sides) - wlen :] if side in ("both", "right") else np.ones(wlen)
+    window = np.concatenate((left, np.ones(npts - 2 * wlen), right))
+    return data * window
+
+
+def taper_length(npts: int, max_percentage: float, max_npts: int = None) -> int:
+    """Return the number of samples tapered at each end by :func:`taper`.
+
+    Args:
+        npts (int): Number of samples of the row.
+        max_percentage (float): Tapered fraction at each end.
+        max_npts (int, optional): Longest taper in samples. Defaults to None.
+
+    Returns:
+        int: Tapered samples at each end.
+    """
+    wlen = int(max_percentage * npts)
+    if max_npts is not None:
+        wlen = min(wlen, int(max_npts))
+    return wlen
+
+
+def butterworth(
+    btype: str, freq: float, sampling_rate: float, corners: int = 4
+) -> np.ndarray:
+    """Design a Butterworth filter as second-order sections, like ObsPy does.
+
+    Args:
+        btype (str): ``"highpass"`` or ``"lowpass"``.
+        freq (float): Corner frequency in Hz.
+        sampling_rate (float): Sampling rate in Hz.
+        corners (int, optional): Filter order. Defaults to 4.
+
+    Returns:
+        np.ndarray: Second-order sections of the filter.
+
+    Raises:
+        ValueError: If ``freq`` is not below the Nyquist frequency.
+    """
+    from scipy.signal import iirfilter, zpk2sos
+
+    f = freq / (0.5 * sampling_rate)
+    if f >= 1:
+        raise ValueError(
+            f"Corner frequency {freq} Hz must be below Nyquist "
+            f"({0.5 * sampling_rate} Hz)"
+        )
+
+    z, p, k = iirfilter(corners, f, btype=btype, ftype="butter", output="zpk")
+    return zpk2sos(z, p, k)
+
+
+def filter_state(data: np.ndarray, corners: int = 4) -> np.ndarray:
+    """Return the zero initial state of a :func:`highpass` or :func:`lowpass`.
+
+    Args:
+        data (np.ndarray): Samples with time on the last axis.
+        corners (int, optional): Filter order. Defaults to 4.
+
+    Returns:
+        np.ndarray: ``(n_sections, ..., 2)`` zeros, the state of a filter at rest.
+    """
+    return np.zeros((-(-corners // 2), *data.shape[:-1], 2))
+
+
+def highpass(
+    data: np.ndarray,
+    freq: float,
+    sampling_rate: float,
+    corners: int = 4,
+    zi: np.ndarray = None,
+) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
+    """Causal Butterworth high-pass filter along the time (last) axis.
+
+    Equivalent to ``Stream.filter("highpass", freq=freq)`` applied to each row.
+
+    Args:
+        data (np.ndarray): Samples with time on the last axis.
+        freq (float): Corner frequency in Hz.
+        sampling_rate (float): Sampling rate in Hz.
+        corners (int, optional): Filter order. Defaults to 4.
+        zi (np.ndarray, optional): Initial state, e.g. the final state of the
+            samples just before ``data`` or :func:`filter_state`. Defaults to
+            None (filter at rest).
+
+    Returns:
+        np.ndarray | tuple[np.ndarray, np.ndarray]: Filtered samples, and the
+            final state when ``zi`` is given, like ``scipy.signal.sosfilt``.
+    """
+    from scipy.signal import sosfilt
+
+    sos = butterworth("highpass", freq, sampling_rate, corners)
+    if zi is None:
+        return sosfilt(sos, data)
+    return sosfilt(sos, data, zi=zi)
+
+
+def lowpass(
+    data: np.ndarray,
+    freq: float,
+    sampling_rate: float,
+    corners: int = 4,
+    zi: np.ndarray = None,
+) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
+    """Causal Butterworth low-pass filter along the time (last) axis.
+
+    Equivalent to ``Stream.filter("lowpass", freq=freq)`` applied to each row.
+
+    Args:
+        data (np.ndarray): Samples with time on the last axis.
+        freq (float): Corner frequency in Hz.
+        sampling_rate (float): Sampling rate in Hz.
+        corners (int, optional): Filter order. Defaults to 4.
+        zi (np.ndarray, optional): Initial state, see :func:`highpass`. Defaults
+            to None (filter at rest).
+
+    Returns:
+        np.ndarray | tuple[np.ndarray, np.ndarray]: Filtered samples, and the
+            final state when ``zi`` is given.
+    """
+    from scipy.signal import sosfilt
+
+    sos = butterworth("lowpass", freq, sampling_rate, corners)
+    if zi is None:
+        return sosfilt(sos, data)
+    return sosfilt(sos, data, zi=zi)
+
+
+def integrate(
+    data: np.ndarray,
+    sampling_rate: float,
+    previous: tuple[np.ndarray, np.ndarray] = None,
+) -> np.ndarray:
+    """Integrate along the time (last) axis with the cumulative trapezoidal rule.
+
+    Equivalent to ``Stream.integrate()`` applied to each row.
+
+    Args:
+        data (np.ndarray): Samples with time on the last axis.
+        sampling_rate (float): Sampling rate in Hz.
+        previous (tuple[np.ndarray, np.ndarray], optional): Last sample and last
+            integrated value of every row just before ``data``, to continue an
+            integral. Defaults to None (start at zero).
+
+    Returns:
+        np.ndarray: Integrated samples, starting at zero without ``previous``.
+    """
+    from scipy.integrate import cumulative_trapezoid
+
+    if previous is None:
+        return cumulative_trapezoid(data, dx=1.0 / sampling_rate, initial=0, axis=-1)
+
+    last_sample, last_value = previous
+    extended = np.concatenate((last_sample[..., None], data), axis=-1)
+    return last_value[..., None] + cumulative_trapezoid(
+        extended, dx=1.0 / sampling_rate, axis=-1
+    )
+
+
+def contiguous_segments(
+    valid: np.ndarray, min_length: int = 1
+) -> list[tuple[int, int]]:
+    """Return the ``[start, end)`` bounds of runs of valid samples.
+
+    Args:
+        valid (np.ndarray): Boolean flag per sample.
+        min_length (int, optional): Runs shorter than this many samples are
+            dropped. Defaults to 1.
+
+    Returns:
+        list[tuple[int, int]]: Start (inclusive) and end (exclusive) index of every
+            run.
+
+    Example:
+        >>> contiguous_segments(np.array([True, True, False, True]))
+        [(0, 2), (3, 4)]
+    """
+    edges = np.diff(np.concatenate(([0], valid.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    return [
+        (int(start), int(end))
+        for start, end in zip(starts, ends, strict=True)
+        if end - start >= max(min_length, 1)
+    ]
+
+
+def decimation_factor(
+    sampling_rate: float, max_frequency: float, oversampling: float = 5.0
+) -> int:
+    """Return the largest integer decimation factor that keeps a band intact.
+
+    The anti-alias filter of :func:`decimate` starts rolling off at 80 % of the
+    new Nyquist frequency, i.e. ``0.4 * sampling_rate / factor``. The factor is
+    chosen so the decimated rate stays at least ``oversampling`` times
+    ``max_frequency``. The default puts that roll-off an octave above
+    ``max_frequency``. 2.5, the smallest useful value, puts it at
+    ``max_frequency``: no band loses power to the anti-alias filter, but the
+    highest band is biased low because the trapezoidal rule of
+    :func:`integrate` and the band-pass filters are then applied close to the
+    new Nyquist frequency (about 13 % at 50 Hz for a 16 Hz corner).
+
+    Args:
+        sampling_rate (float): Sampling rate in Hz.
+        max_frequency (float): Highest frequency of interest in Hz.
+        oversampling (float, optional): Minimum ratio between the decimated rate
+            and ``max_frequency``. Defaults to 5.
+
+    Returns:
+        int: Decimation factor, 1 if no decimation is possible.
+
+    Example:
+        >>> decimation_factor(200.0, 16.0)
+        2
+        >>> decimation_factor(100.0, 16.0)
+        1
+        >>> decimation_factor(100.0, 16.0, oversampling=2.5)
+        2
+    """
+    return max(1, int(sampling_rate // (oversampling * max_frequency)))
+
+
+def decimate(data: np.ndarray, factor: int) -> np.ndarray:
+    """Low-pass filter and downsample along the time (last) axis.
+
+    Uses an order 8 Chebyshev type I anti-alias filter applied forward and
+    backward (zero phase), then keeps every ``factor``-th sample starting with the
+    first one.
+
+    Args:
+        data (np.ndarray): Samples with time on the last axis.
+        factor (int): Decimation factor.
+
+    Returns:
+        np.ndarray: ``ceil(npts / factor)`` samples per row.
+    """
+    if factor <= 1:
+        return data
+
+    from scipy.signal import decimate as scipy_decimate
+
+    return scipy_decimate(data, factor, ftype="iir", axis=-1, zero_phase=True)
@@ -0,0 +1,299 @@
+# Standard library imports
+import os
+from glob import glob
+
+# Third party imports
+import pandas as pd
+
+# Project imports
+from dsar.utilities import atomic_write, combine_csv_files, file_lock
+
+pyramid_levels: tuple[str, ...] = ("1h", "6h", "1d")
+pyramid_statistics: tuple[str, ...] = ("median", "min", "max", "count")
+
+
+class AggregatePyramid:
+    """Multi-resolution aggregates of the daily DSAR CSV files of one NSLC.
+
+    Every level stores the median, min, max and count of the selected columns per
+    epoch-aligned bucket, in one CSV file per year::
+
+        {dsar_dir}/{nslc}/{resample}/pyramid/{level}/{nslc}_{level}_{year}.csv
+
+    Levels must divide a day, so every bucket is covered by a single daily file
+    and the pyramid is updated exactly (medians included) one day at a time with
+    :meth:`update`. The daily CSV files themselves are the finest level.
+
+    Attributes:
+        levels (list[str]): Aggregation levels, from finest to coarsest.
+
+    Example:
+        >>> pyramid = AggregatePyramid("output/dsar", "VG.OJN.00.EHZ")
+        >>> pyramid.build()
+        >>> df = pyramid.read("2020-01-01", "2025-01-01", points=2000)
+    """
+
+    def __init__(
+        self,
+        dsar_dir: str,
+        nslc: str,
+        resample: str = "10min",
+        levels: list[str] = None,
+        columns: list[str] = None,
+    ):
+        """Initialize the pyramid.
+
+        Args:
+            dsar_dir (str): DSAR output directory.
+            nslc (str): NSLC identifier (e.g., ``"VG.OJN.00.EHZ"``).
+            resample (str, optional): Resample interval of the daily CSV files.
+                Defaults to ``"10min"``.
+            levels (list[str], optional): Pandas offset aliases of the levels.
+                Defaults to ``["1h", "6h", "1d"]``.
+            columns (list[str], optional): Columns aggregated. Defaults to None
+                (every column).
+
+        Raises:
+            ValueError: If a level is not a multiple of ``resample`` or does not
+                divide a day.
+        """
+        levels = list(pyramid_levels) if levels is None else list(levels)
+
+        step = pd.Timedelta(resample)
+        day = pd.Timedelta("1d")
+        for level in levels:
+            width = pd.Timedelta(level)
+            if width <= step or width % step != pd.Timedelta(0):
+                raise ValueError(
+                    f"Level '{level}' must be a multiple of resample '{resample}'"
+                )
+            if day % width != pd.Timedelta(0):
+                raise ValueError(f"Level '{level}' must divide a day")
+
+        self.dsar_dir = dsar_dir
+        self.nslc = nslc
+        self.resample = resample
+        self.levels = sorted(levels, key=pd.Timedelta)
+        self.columns = columns
+
+    def __repr__(self) -> str:
+        return (
+            f"AggregatePyramid(dsar_dir={self.dsar_dir}, nslc={self.nslc}, "
+            f"resample={self.resample}, levels={self.levels})"
+        )
+
+    @property
+    def csv_dir(self) -> str:
+        """Return the directory of the daily CSV files (the finest level).
+
+        Returns:
+            str: ``{dsar_dir}/{nslc}/{resample}``.
+        """
+        return os.path.join(self.dsar_dir, self.nslc, self.resample)
+
+    def level_path(self, level: str, year: int) -> str:
+        """Return the CSV file of one level and year.
+
+        Args:
+            level (str): Aggregation level.
+            year (int): Year of the buckets.
+
+        Returns:
+            str: Path of the CSV file.
+        """
+        return os.path.join(
+            self.csv_dir, "pyramid", level, f"{self.nslc}_{level}_{year}.csv"
+        )
+
+    def aggregate(self, df: pd.DataFrame, level: str) -> pd.DataFrame:
+        """Aggregate a DSAR DataFrame into the buckets of one level.
+
+        Args:
+            df (pd.DataFrame): DSAR results with a DatetimeIndex.
+            level (str): Aggregation level.
+
+        Returns:
+            pd.DataFrame: One ``{column}_{statistic}`` column per aggregated column
+                and statistic, indexed by bucket start time.
+        """
+        columns = self.columns if self.columns is not None else list(df.columns)
+
+        aggregated = df[columns].resample(level).agg(list(pyramid_statistics))
+        aggregated.columns = [
+            f"{column}_{statistic}" for column, statistic in aggregated.columns
+        ]
+        aggregated.index.name = "datetime"
+
+        counts = [f"{column}_count" for column in columns]
+        return aggregated.loc[aggregated[counts].sum(axis=1) > 0]
+
+    def _write(self, level: str, aggregated: pd.DataFrame, merge: bool) -> list[str]:
+        """Write the buckets of one level, merged into the existing yearly files.
+
+        Each yearly file is read, merged and written under its lock, so workers
+        saving different days of the same year never drop each other's buckets.
+        """
+        csv_files: list[str] = []
+
+        for year, rows in aggregated.groupby(aggregated.index.year):
+            csv_file = self.level_path(level, int(year))
+
+            with file_lock(csv_file):
+                if merge and os.path.exists(csv_file):
+                    existing = pd.read_csv(
+                        csv_file, index_col="datetime", parse_dates=True
+                    )
+                    existing = existing.loc[~existing.index.isin(rows.index)]
+                    rows = pd.concat([existing, rows]).sort_index()
+
+                with atomic_write(csv_file, newline="") as f:
+                    rows.to_csv(f, index=True)
+
+            csv_files.append(csv_file)
+
+        return csv_files
+
+    def update(self, df: pd.DataFrame) -> list[str]:
+        """Update every level with new DSAR results, e.g. one saved day.
+
+        Buckets covered by ``df`` are replaced, all others are kept. Only the
+        yearly files touched by ``df`` are rewritten.
+
+        Args:
+            df (pd.DataFrame): DSAR results with a DatetimeIndex.
+
+        Returns:
+            list[str]: Paths of the CSV files written.
+
+        Example:
+            >>> pyramid.update(dsar.dfs["VG.OJN.00.EHZ"])
+        """
+        if df.empty:
+            return []
+
+        csv_files: list[str] = []
+        for level in self.levels:
+            csv_files.extend(self._write(level, self.aggregate(df, level), merge=True))
+
+        return csv_files
+
+    def build(self) -> list[str]:
+        """(Re)build every level from the daily CSV files already on disk.
+
+        Returns:
+            list[str]: Paths of the CSV files written.
+
+        Raises:
+            FileNotFoundError: If there are no daily CSV files.
+        """
+        csv_files = glob(os.path.join(self.csv_dir, "*.csv"))
+        if len(csv_files) == 0:
+            raise FileNotFoundError(f"No CSV files found in {self.csv_dir}")
+
+        df = combine_csv_files(csv_files)
+
+        written: list[str] = []
+        for level in self.levels:
+            written.extend(self._write(level, self.aggregate(df, level), merge=False))
+
+        print(f"\u2705 {self.nslc} : Pyramid built for levels {self.levels}")
+        return written
+
+    def level_for(self, resolution: str | pd.Timedelta) -> str:
+        """Return the coarsest level not coarser than ``resolution``.
+
+        Args:
+            resolution (str | pd.Timedelta): Requested time resolution.
+
+        Returns:
+            str: Level alias, or ``self.resample`` when every level is too coarse.
+
+        Example:
+            >>> pyramid.level_for("3h")
+            '1h'
+        """
+        resolution = pd.Timedelta(resolution)
+
+        selected = self.resample
+        for level in self.levels:
+            if pd.Timedelta(level) <= resolution:
+                selected = level
+
+        return selected
+
+    def read(
+        self,
+        start: str = None,
+        end: str = None,
+        resolution: str | pd.Timedelta = None,
+        points: int = None,
+    ) -> pd.DataFrame:
+        """Read the aggregates of a time range at the coarsest adequate level.
+
+        The level is chosen from ``resolution``, or from ``points`` as the time
+        range divided by the number of points. The finest level is read from the
+        daily CSV files, with ``median``, ``min`` and ``max`` equal to the value
+        and a ``count`` of 1.
+
+        Args:
+            start (str, optional): Start of the range, inclusive. Defaults to None.
+            end (str, optional): End of the range, inclusive. Defaults to None.
+            resolution (str | pd.Timedelta, optional): Largest acceptable bucket
+                width. Defaults to None.
+            points (int, optional): Target number of rows, used when
+                ``resolution`` is not given. Requires ``start`` and ``end``.
+                Defaults to None (finest level).
+
+        Returns:
+            pd.DataFrame: Aggregates with ``{column}_{statistic}`` columns.
+
+        Example:
+            >>> df = pyramid.read("2020-01-01", "2025-01-01", resolution="1d")
+        """
+        if resolution is None and points is not None:
+            assert (
+                start is not None and end is not None
+            ), "\u274c start and end are required with points"
+            resolution = (pd.Timestamp(end) - pd.Timestamp(start)) / max(points, 1)
+
+        level = self.resample if resolution is None else self.level_for(resolution)
+
+        if level == self.resample:
+            df = combine_csv_files(glob(os.path.join(self.csv_dir, "*.csv")))
+            if df.empty:
+                return df
+            df = df.loc[start:end]
+            columns = self.columns if self.columns is not None else list(df.columns)
+            return pd.DataFrame(
+                {
+                    f"{column}_{statistic}": (
+                        df[column].notna().astype(int)
+                        if statistic == "count"
+                        else df[column]
+                    )
+                    for column in columns
+                    for statistic in pyramid_statistics
+                },
+                index=df.index,
+            )
+
+        first = pd.Timestamp(start).year if start is not None else None
+        last = pd.Timestamp(end).year if end is not None else None
+
+        df_list: list[pd.DataFrame] = []
+        for csv_file in sorted(
+            glob(os.path.join(self.csv_dir, "pyramid", level, "*.csv"))
+        ):
+            year = int(os.path.splitext(csv_file)[0].rsplit("_", 1)[-1])
+            if (first is not None and year < first) or (
+                last is not None and year > last
+            ):
+                continue
+            df_list.append(
+                pd.read_csv(csv_file, index_col="datetime", parse_dates=True)
+            )
+
+        if len(df_list) == 0:
+            return pd.DataFrame()
+
+        return pd.concat(df_list).sort_index().loc[start:end]
@@ -0,0 +1,274 @@
+# Third party imports
+import numpy as np
+import pandas as pd
+
+# Project imports
+from dsar.reducer import WindowReducer
+
+# Columns added to every window by QualityRules
+quality_columns: tuple[str, ...] = ("filled_fraction", "clipped", "flatline")
+
+
+class QualityRules:
+    """Per-window data-quality metrics and the rules a window must pass.
+
+    The metrics are computed from the raw samples of the day, before any
+    filtering, in the same vectorized window layout as the band statistics:
+
+    - ``coverage``: fraction of the expected samples processed, added by
+      :class:`WindowReducer` (gaps and skipped segments lower it).
+    - ``filled_fraction``: fraction of the expected samples that were not
+      recorded but filled when merging the traces, see
+      :func:`~dsar.utilities.merge_stream`.
+    - ``clipped``: number of recorded samples at or above ``clip_level``. Only
+      added when ``clip_level`` is set, as the digitizer full scale cannot be
+      told from the data: a day's peak is reached by several samples whenever
+      the signal is coarsely quantized.
+    - ``flatline``: whether the window holds a run of identical recorded samples
+      of at least ``flatline_length`` seconds, as left by a dead channel.
+
+    In multi-component mode the combined row gets the largest
+    ``filled_fraction``, the sum of ``clipped`` and any ``flatline`` of its
+    components.
+
+    Windows failing any rule are dropped by :meth:`DSAR.calculate` before the
+    ratio is smoothed. Every rule is off by default, so the metrics are only
+    recorded.
+
+    Example:
+        >>> quality = QualityRules(max_filled_fraction=0.1, drop_flatline=True)
+        >>> dsar = DSAR(..., quality=quality)
+    """
+
+    def __init__(
+        self,
+        clip_level: float = None,
+        flatline_length: float = 10.0,
+        min_coverage: float = 0.0,
+        max_filled_fraction: float = 1.0,
+        max_clipped: int = None,
+        drop_flatline: bool = False,
+    ):
+        """Initialize the metrics and rules.
+
+        Args:
+            clip_level (float, optional): Absolute count at which the digitizer
+                clips, e.g. ``2**23 - 1`` for a 24-bit digitizer. Defaults to None
+                (no ``clipped`` column).
+            flatline_length (float, optional): Shortest run of identical samples,
+                in seconds, flagged as a flat line. Defaults to 10.0.
+            min_coverage (float, optional): Windows with a lower ``coverage`` are
+                dropped. Defaults to 0.0.
+            max_filled_fraction (float, optional): Windows with a higher
+                ``filled_fraction`` are dropped. Defaults to 1.0.
+            max_clipped (int, optional): Windows with more clipped samples are
+                dropped. Requires ``clip_level``. Defaults to None (no limit).
+            drop_flatline (bool, optional): Drop windows holding a flat line.
+                Defaults to False.
+
+        Raises:
+            AssertionError: If a length, fraction or count is out of range, or
+                ``max_clipped`` is set without ``clip_level``.
+        """
+        assert (
+            flatline_length > 0
+        ), f"\u274c flatline_length must be positive. Got {flatline_length}"
+        assert (
+            0 <= min_coverage <= 1
+        ), f"\u274c min_coverage must be between 0 and 1. Got {min_coverage}"
+        assert 0 <= max_filled_fraction <= 1, (
+            "\u274c max_filled_fraction must be between 0 and 1. "
+            f"Got {max_filled_fraction}"
+        )
+        assert (
+            max_clipped is None or max_clipped >= 0
+        ), f"\u274c max_clipped must not be negative. Got {max_clipped}"
+        assert (
+            max_clipped is None or clip_level is not None
+        ), "\u274c max_clipped requires clip_level, the digitizer full scale"
+
+        self.clip_level = clip_level
+        self.flatline_length = flatline_length
+        self.min_coverage = min_coverage
+        self.max_filled_fraction = max_filled_fraction
+        self.max_clipped = max_clipped
+        self.drop_flatline = drop_flatline
+
+    def __repr__(self) -> str:
+        return (
+            f"QualityRules(clip_level={self.clip_level}, "
+            f"flatline_length={self.flatline_length}, "
+            f"min_coverage={self.min_coverage}, "
+            f"max_filled_fraction={self.max_filled_fraction}, "
+            f"max_clipped={self.max_clipped}, drop_flatline={self.drop_flatline})"
+        )
+
+    def clipped_samples(self, data: np.ndarray, recorded: np.ndarray) -> np.ndarray:
+        """Flag the recorded samples at or above ``clip_level``.
+
+        Args:
+            data (np.ndarray): ``(n_rows, npts)`` raw samples.
+            recorded (np.ndarray): ``(n_rows, npts)`` boolean flag of the samples
+                recorded, i.e. neither missing nor filled.
+
+        Returns:
+            np.ndarray: ``(n_rows, npts)`` boolean flag.
+        """
+        return recorded & ((data >= self.clip_level) | (data <= -self.clip_level))
+
+    def flatline_runs(
+        self, data: np.ndarray, recorded: np.ndarray, sampling_rate: float
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Find the runs of identical recorded samples of every row.
+
+        Args:
+            data (np.ndarray): ``(n_rows, npts)`` raw samples.
+            recorded (np.ndarray): ``(n_rows, npts)`` boolean flag of the samples
+                recorded. Other samples end a run.
+            sampling_rate (float): Sampling rate in Hz.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: Row, first sample and last
+                sample (inclusive) of every run of at least ``flatline_length``
+                seconds.
+        """
+        length = max(int(round(self.flatline_length * sampling_rate)), 2)
+
+        # Sample i equals sample i + 1; consecutive positions chain into a run,
+        # unless they fall on different rows
+        same = (data[:, 1:] == data[:, :-1]) & recorded[:, 1:] & recorded[:, :-1]
+        width = same.shape[-1]
+        positions = np.flatnonzero(same)
+        if len(positions) == 0:
+            return positions, positions, positions
+
+        breaks = (
+            np.flatnonzero((np.diff(positions) != 1) | (positions[1:] % width == 0)) + 1
+        )
+        starts = positions[np.concatenate(([0], breaks))]
+        ends = positions[np.concatenate((breaks - 1, [len(positions) - 1]))] + 1
+
+        long = (ends - starts) >= length - 1
+        rows, first = np.divmod(starts[long], width)
+        return rows, first, ends[long] - rows * width
+
+    def compute(
+        self,
+        data: np.ndarray,
+        filled: np.ndarray,
+        starttime: pd.Timestamp,
+        sampling_rate: float,
+        reducer: WindowReducer,
+        combined: bool = False,
+    ) -> list[pd.DataFrame]:
+        """Compute the quality metrics of every window of every row.
+
+        All rows are flagged at once, and only the flagged samples are counted
+        into their windows, as flags are usually rare.
+
+        Args:
+            data (np.ndarray): ``(n_rows, npts)`` raw samples, ``NaN`` where
+                missing.
+            filled (np.ndarray): ``(n_rows, npts)`` boolean flag of the samples
+                filled in gaps, see :func:`~dsar.utilities.filled_samples`.
+            starttime (pd.Timestamp): Time of the first sample.
+            sampling_rate (float): Sampling rate in Hz.
+            reducer (WindowReducer): Reducer whose windows are used.
+            combined (bool, optional): Append a row aggregating every row, like
+                the combined vector sum of multi-component mode. Defaults to
+                False.
+
+        Returns:
+            list[pd.DataFrame]: ``filled_fraction``, ``flatline`` and, with
+                ``clip_level``, ``clipped`` of every window, in row order.
+
+        Example:
+            >>> rules = QualityRules()
+            >>> z, n, e = rules.compute(data, filled, starttime, 100.0, reducer)
+        """
+        window, windows = reducer.window_index(starttime, sampling_rate, data.shape[-1])
+        n_windows = len(windows)
+        expected = reducer.window_ns * sampling_rate / 1e9
+
+        # Only recorded samples can be clipped or flat
+        recorded = ~filled & np.isfinite(data)
+
+        metrics: dict[str, np.ndarray] = {
+            "filled_fraction": _window_counts(filled, window, n_windows) / expected
+        }
+        if self.clip_level is not None:
+            metrics["clipped"] = _window_counts(
+                self.clipped_samples(data, recorded), window, n_windows
+            )
+
+        # A run flags every window from the one of its first sample to the one
+        # of its last sample
+        rows, first, last = self.flatline_runs(data, recorded, sampling_rate)
+        spans = np.zeros((len(data), n_windows + 1), dtype=np.int64)
+        np.add.at(spans, (rows, window[first]), 1)
+        np.add.at(spans, (rows, window[last] + 1), -1)
+        metrics["flatline"] = np.cumsum(spans[:, :-1], axis=-1) > 0
+
+        if combined:
+            aggregate = {
+                "filled_fraction": np.max,
+                "clipped": np.sum,
+                "flatline": np.any,
+            }
+            metrics = {
+                name: np.vstack([values, aggregate[name](values, axis=0)])
+                for name, values in metrics.items()
+            }
+
+        index = pd.DatetimeIndex(windows.view("datetime64[ns]"), name="datetime")
+        return [
+            pd.DataFrame(
+                {name: values[row] for name, values in metrics.items()}, index=index
+            )
+            for row in range(len(metrics["filled_fraction"]))
+        ]
+
+    def passes(self, df: pd.DataFrame) -> pd.Series:
+        """Return which windows pass every rule.
+
+        Args:
+            df (pd.DataFrame): Window results with the quality columns. Rules on
+                a missing column are skipped.
+
+        Returns:
+            pd.Series: Boolean flag of every window.
+
+        Example:
+            >>> df = df.loc[quality.passes(df)]
+        """
+        passes = pd.Series(True, index=df.index)
+
+        if self.min_coverage > 0 and "coverage" in df:
+            passes &= df["coverage"] >= self.min_coverage
+        if self.max_filled_fraction < 1 and "filled_fraction" in df:
+            passes &= df["filled_fraction"] <= self.max_filled_fraction
+        if self.max_clipped is not None and "clipped" in df:
+            passes &= df["clipped"] <= self.max_clipped
+        if self.drop_flatline and "flatline" in df:
+            passes &= ~df["flatline"].astype(bool)
+
+        return passes
+
+
+def _window_counts(flags: np.ndarray, window: np.ndarray, n_windows: int) -> np.ndarray:
+    """Count the flagged samples of every row in every window.
+
+    Args:
+        flags (np.ndarray): ``(n_rows, npts)`` boolean flag.
+        window (np.ndarray): Window number of each sample, see
+            :meth:`WindowReducer.window_index`.
+        n_windows (int): Number of windows.
+
+    Returns:
+        np.ndarray: ``(n_rows, n_windows)`` counts.
+    """
+    rows, samples = np.divmod(np.flatnonzero(flags), flags.shape[-1])
+    counts = np.bincount(
+        rows * n_windows + window[samples], minlength=len(flags) * n_windows
+    )
+    return counts.reshape(len(flags), n_windows)
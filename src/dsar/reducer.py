@@ -0,0 +1,286 @@
+# Standard library imports
+import re
+
+# Third party imports
+import numpy as np
+import pandas as pd
+
+statistics_available: tuple[str, ...] = (
+    "median",
+    "mean",
+    "rms",
+    "std",
+    "min",
+    "max",
+    "count",
+)
+
+_percentile_pattern = re.compile(r"^p(\d{1,2}(\.\d+)?|100)$")
+
+
+class WindowReducer:
+    """Reduce absolute amplitudes to per-window statistics in one vectorized pass.
+
+    Samples are assigned to epoch-aligned windows of ``resample`` length and laid
+    out once as a ``(n_windows, window_length)`` array. Order statistics (median,
+    percentiles, min, max) share a single sort of that array, while moment
+    statistics (mean, rms, std) and sample counts are taken from the same layout.
+    Missing samples (``NaN``) are ignored.
+
+    Supported statistics are ``median``, ``mean``, ``rms``, ``std``, ``min``,
+    ``max``, ``count`` and percentiles written as ``p<q>`` (e.g. ``p10``, ``p90``).
+
+    Attributes:
+        resample (str): Pandas offset alias of the window length.
+        statistics (list[str]): Statistics computed for every window. The first
+            one is the primary statistic used for the DSAR ratio.
+
+    Example:
+        >>> reducer = WindowReducer("10min", ["median", "mean", "rms", "p10", "p90"])
+        >>> (df,) = reducer.reduce_rows(data, starttime, 100.0)
+        >>> df.columns.tolist()
+        ['median', 'mean', 'rms', 'p10', 'p90']
+    """
+
+    def __init__(self, resample: str = "10min", statistics: list[str] = None):
+        """Initialize the window reducer.
+
+        Args:
+            resample (str, optional): Pandas offset alias for the window length.
+                Defaults to ``"10min"``.
+            statistics (list[str], optional): Statistics to compute. Defaults to
+                ``["median"]``.
+
+        Raises:
+            ValueError: If a statistic is not supported or listed twice.
+        """
+        statistics = ["median"] if statistics is None else list(statistics)
+
+        if len(statistics) == 0:
+            raise ValueError("At least one statistic must be given")
+        if len(set(statistics)) != len(statistics):
+            raise ValueError(f"Statistics must be unique. Got {statistics}")
+        for statistic in statistics:
+            if statistic not in statistics_available and not _percentile_pattern.match(
+                statistic
+            ):
+                raise ValueError(
+                    f"Unknown statistic '{statistic}'. Use one of "
+                    f"{list(statistics_available)} or a percentile such as 'p90'"
+                )
+
+        self.resample = resample
+        self.statistics = statistics
+        self.window_ns: int = pd.Timedelta(resample).value
+
+    def __repr__(self) -> str:
+        return f"WindowReducer(resample={self.resample}, statistics={self.statistics})"
+
+    @property
+    def primary(self) -> str:
+        """Return the statistic used as the band amplitude.
+
+        Returns:
+            str: The first configured statistic.
+        """
+        return self.statistics[0]
+
+    def window_index(
+        self, starttime: pd.Timestamp, sampling_rate: float, npts: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Assign each sample to its epoch-aligned window.
+
+        Args:
+            starttime (pd.Timestamp): Time of the first sample.
+            sampling_rate (float): Sampling rate in Hz.
+            npts (int): Number of samples.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Window number of each sample relative to
+                the first window, and the start time (ns since epoch) of every
+                window.
+        """
+        offsets = np.round(np.arange(npts) * (1e9 / sampling_rate)).astype(np.int64)
+        bins = (pd.Timestamp(starttime).value + offsets) // self.window_ns
+        first_bin = bins[0] if npts > 0 else 0
+        n_windows = int(bins[-1] - first_bin + 1) if npts > 0 else 0
+
+        windows = (first_bin + np.arange(n_windows, dtype=np.int64)) * self.window_ns
+
+        return bins - first_bin, windows
+
+    def layout(self, data: np.ndarray, window: np.ndarray) -> np.ndarray:
+        """Lay out samples as a ``NaN``-padded ``(..., n_windows, window_length)`` array.
+
+        Args:
+            data (np.ndarray): Sample values with time on the last axis.
+            window (np.ndarray): Window number of each sample, as returned by
+                :meth:`window_index`.
+
+        Returns:
+            np.ndarray: Padded array with one row per window for every leading
+                index of ``data``.
+        """
+        n_windows = int(window[-1]) + 1 if len(window) > 0 else 0
+        counts = np.bincount(window, minlength=n_windows)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+        padded = np.full(
+            data.shape[:-1] + (n_windows, int(counts.max(initial=0))), np.nan
+        )
+        padded[..., window, np.arange(len(window)) - starts[window]] = data
+
+        return padded
+
+    def reduce_rows(
+        self,
+        data: np.ndarray,
+        starttime: pd.Timestamp,
+        sampling_rate: float,
+        coverage: bool = False,
+        mask: np.ndarray = None,
+    ) -> list[pd.DataFrame]:
+        """Compute the configured statistics of every row of a 2-D array at once.
+
+        All rows share the same sample grid, so the window layout and the sort of
+        order statistics are done in a single vectorized call for all of them.
+
+        Args:
+            data (np.ndarray): ``(n_rows, npts)`` sample values. ``NaN`` samples
+                are ignored.
+            starttime (pd.Timestamp): Time of the first sample.
+            sampling_rate (float): Sampling rate in Hz.
+            coverage (bool, optional): Add a ``coverage`` column with the
+                fraction of expected samples present in each window. Defaults to
+                False.
+            mask (np.ndarray, optional): ``(npts,)`` boolean flag of the samples
+                left out of the statistics of every row, such as the transients
+                found by :class:`~dsar.masking.TransientMask`. They still count
+                as recorded in ``coverage``, and a ``masked_fraction`` column
+                holds the fraction of expected samples masked in each window.
+                Defaults to None.
+
+        Returns:
+            list[pd.DataFrame]: Window statistics of every row, in row order.
+
+        Example:
+            >>> z, n, e = reducer.reduce_rows(data, starttime, 100.0)
+        """
+        window, windows = self.window_index(starttime, sampling_rate, data.shape[-1])
+        data = np.abs(np.asarray(data, dtype=np.float64))
+
+        masked = None
+        if mask is not None:
+            excluded = mask & np.isfinite(data)
+            masked = np.stack(
+                [
+                    np.bincount(window, weights=row, minlength=len(windows))
+                    for row in excluded
+                ]
+            )
+            np.putmask(data, excluded, np.nan)
+
+        values = self.layout(data, window)
+
+        index = pd.DatetimeIndex(windows.view("datetime64[ns]"), name="datetime")
+        statistics = self.statistics_of(values)
+
+        expected = self.window_ns * sampling_rate / 1e9
+        if coverage:
+            # Masked samples were recorded, they are only left out of the statistics
+            recorded = np.isfinite(values).sum(axis=-1)
+            if masked is not None:
+                recorded = recorded + masked
+            statistics["coverage"] = recorded / expected
+        if masked is not None:
+            statistics["masked_fraction"] = masked / expected
+
+        return [
+            pd.DataFrame(
+                {name: result[row] for name, result in statistics.items()},
+                index=index,
+            )
+            for row in range(data.shape[0])
+        ]
+
+    def statistics_of(self, values: np.ndarray) -> dict[str, np.ndarray]:
+        """Compute the configured statistics along the last axis.
+
+        Args:
+            values (np.ndarray): ``NaN``-padded array with windows on the
+                second-to-last axis and samples on the last axis.
+
+        Returns:
+            dict[str, np.ndarray]: Mapping of statistic name to per-window values.
+        """
+        finite = np.isfinite(values)
+        counts = finite.sum(axis=-1)
+        empty = counts == 0
+        safe_counts = np.where(empty, 1, counts)
+
+        needs_sort = any(
+            s in ("median", "min", "max") or _percentile_pattern.match(s)
+            for s in self.statistics
+        )
+        ordered = np.sort(values, axis=-1) if needs_sort else None
+
+        needs_sum = any(s in ("mean", "std") for s in self.statistics)
+        total = np.where(finite, values, 0.0).sum(axis=-1) if needs_sum else None
+
+        needs_squares = any(s in ("rms", "std") for s in self.statistics)
+        squares = (
+            np.where(finite, values * values, 0.0).sum(axis=-1)
+            if needs_squares
+            else None
+        )
+
+        results: dict[str, np.ndarray] = {}
+        for statistic in self.statistics:
+            if statistic == "count":
+                results[statistic] = counts
+                continue
+
+            if statistic == "median":
+                result = _sorted_quantile(ordered, counts, 0.5)
+            elif statistic == "min":
+                result = _sorted_quantile(ordered, counts, 0.0)
+            elif statistic == "max":
+                result = _sorted_quantile(ordered, counts, 1.0)
+            elif statistic == "mean":
+                result = total / safe_counts
+            elif statistic == "rms":
+                result = np.sqrt(squares / safe_counts)
+            elif statistic == "std":
+                mean = total / safe_counts
+                result = np.sqrt(np.maximum(squares / safe_counts - mean * mean, 0.0))
+            else:
+                result = _sorted_quantile(ordered, counts, float(statistic[1:]) / 100)
+
+            results[statistic] = np.where(empty, np.nan, result)
+
+        return results
+
+
+def _sorted_quantile(ordered: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+    """Linearly interpolated quantile of rows sorted with ``NaN`` values last.
+
+    Matches :func:`numpy.quantile` with the default ``"linear"`` method while
+    reusing a single sort for every requested quantile.
+
+    Args:
+        ordered (np.ndarray): Rows sorted along the last axis.
+        counts (np.ndarray): Number of finite values of each row.
+        q (float): Quantile between 0 and 1.
+
+    Returns:
+        np.ndarray: Quantile of each row. Rows without values yield garbage that
+            callers must mask with ``counts == 0``.
+    """
+    position = q * np.maximum(counts - 1, 0)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.ceil(position).astype(np.int64)
+
+    low = np.take_along_axis(ordered, lower[..., None], axis=-1)[..., 0]
+    high = np.take_along_axis(ordered, upper[..., None], axis=-1)[..., 0]
+
+    return low + (high - low) * (position - lower)
@@ -1,12 +1,16 @@
 # Standard library imports
 import os
 from datetime import datetime
-from pathlib import Path
 from typing import Any
 
 # Third party imports
 from obspy import ObsPyReadingError, Stream, Trace, read
 
+# Project imports
+from dsar.cache import WaveformCache
+from dsar.storage import LocalStorage, Storage, get_storage
+from dsar.utilities import merge_stream
+
 
 class SDS:
     """SeisComP Data Structure (SDS) reader for seismic data.
@@ -16,12 +20,28 @@ class SDS:
 
     More information: https://www.seiscomp.de/seiscomp3/doc/applications/slarchive/SDS.html
 
+    The archive can live on a local filesystem or in object storage, see
+    :mod:`dsar.storage`.
+
     Args:
-        sds_dir (str): Root path to SDS directory.
+        sds_dir (str): Root path to SDS directory, or URL of the archive root in
+            object storage (e.g. ``"s3://bucket/sds"``, requires fsspec).
         station (str): Station code (e.g., "OJN").
         channel (str): Channel code (e.g., "EHZ").
         network (str, optional): Network code. Defaults to "VG".
         location (str, optional): Location code. Defaults to "00".
+        fill_value (str | float | None, optional): Value used to merge gaps, passed
+            to ``Stream.merge``. ``None`` keeps gaps as masked samples.
+            Defaults to "interpolate".
+        cache (WaveformCache, optional): On-disk cache of decoded days. Merged
+            streams are read from it when the source file is unchanged and stored
+            in it after decoding. Defaults to None (always decode).
+        storage (Storage, optional): Store the archive is read from, e.g. an
+            :class:`~dsar.storage.S3Storage` with a read-through cache. Defaults
+            to None (local directory, or fsspec for a URL ``sds_dir``).
+        raise_errors (bool, optional): Raise the errors of reading an existing
+            file instead of returning an empty Stream, so a job queue can retry
+            the day. Defaults to False.
         verbose (bool, optional): Enable verbose logging. Defaults to False.
         debug (bool, optional): Enable debug logging. Defaults to False.
 
@@ -31,6 +51,11 @@ class SDS:
         channel (str): Channel code (uppercase).
         network (str): Network code (uppercase).
         location (str): Location code (uppercase).
+        fill_value (str | float | None): Value used to merge gaps.
+        cache (WaveformCache | None): On-disk cache of decoded days.
+        storage (Storage): Store the archive is read from.
+        raise_errors (bool): Raise read errors instead of returning an empty
+            Stream.
         nslc (str): Network.Station.Location.Channel identifier.
         files (list[dict[str, Any]]): Metadata of loaded files.
 
@@ -50,6 +75,10 @@ class SDS:
         channel: str,
         network: str = "VG",
         location: str = "00",
+        fill_value: str | float | None = "interpolate",
+        cache: WaveformCache = None,
+        storage: Storage = None,
+        raise_errors: bool = False,
         verbose: bool = False,
         debug: bool = False,
     ):
@@ -59,18 +88,28 @@ class SDS:
         if not channel or not isinstance(channel, str):
             raise ValueError("Channel code must be a non-empty string")
 
+        storage = get_storage(sds_dir) if storage is None else storage
+
         # Check if SDS directory exists
-        sds_path = Path(sds_dir)
-        if not sds_path.exists():
+        if isinstance(storage, LocalStorage):
+            if not os.path.exists(storage.root):
+                raise FileNotFoundError(f"SDS directory does not exist: {sds_dir}")
+            if not os.path.isdir(storage.root):
+                raise NotADirectoryError(f"SDS path is not a directory: {sds_dir}")
+            sds_dir = os.path.realpath(storage.root)
+            storage.root = sds_dir
+        elif not storage.isdir():
             raise FileNotFoundError(f"SDS directory does not exist: {sds_dir}")
-        if not sds_path.is_dir():
-            raise NotADirectoryError(f"SDS path is not a directory: {sds_dir}")
 
-        self.sds_dir = str(sds_path.resolve())
+        self.sds_dir = sds_dir
+        self.storage = storage
         self.station = station.upper()
         self.channel = channel.upper()
         self.network = network.upper()
         self.location = location.upper()
+        self.fill_value = fill_value
+        self.cache = cache
+        self.raise_errors = raise_errors
         self.verbose = verbose
         self.debug = debug
 
@@ -90,7 +129,7 @@ class SDS:
             date (datetime): Date for which to construct the filepath.
 
         Returns:
-            str: Absolute path to the SDS miniSEED file.
+            str: Absolute path to the SDS miniSEED file, or its path in the store.
 
         Raises:
             TypeError: If date is not a datetime object.
@@ -106,39 +145,80 @@ class SDS:
         julian_day = date.strftime("%j")  # Day of year as zero-padded decimal (001-366)
 
         # Construct SDS directory structure
-        data_dir = os.path.join(
-            self.sds_dir, str(year), self.network, self.station, f"{self.channel}.D"
-        )
+        directories = [str(year), self.network, self.station, f"{self.channel}.D"]
+        data_dir = self.storage.join(*directories)
 
         if self.debug:
             print(f"Data directory: {data_dir}")
 
         # Construct filename
         filename = f"{self.nslc}.D.{year}.{julian_day}"
-        filepath = os.path.join(data_dir, filename)
+        filepath = self.storage.join(*directories, filename)
 
         return filepath
 
     def load_stream(self, filepath: str, date_str: str) -> Stream:
         """Load seismic stream from miniSEED file.
 
-        Reads the miniSEED file using ObsPy and merges any gaps using interpolation.
+        Reads the miniSEED file using ObsPy and merges any gaps using
+        ``self.fill_value`` (interpolation by default, masked samples if ``None``).
+        Files in object storage are fetched through ``self.storage`` first.
+        When ``self.cache`` is set, an unchanged file is memory-mapped from the
+        cache instead of being decoded, and a decoded file is added to the cache.
         Tracks successfully loaded files in self.files.
 
         Args:
-            filepath (str): Absolute path to miniSEED file.
+            filepath (str): Absolute path to miniSEED file, or its path in the store.
             date_str (str): Date string (YYYY-MM-DD) for logging purposes.
 
         Returns:
             Stream: ObsPy Stream object, or empty Stream if loading fails.
 
+        Raises:
+            Exception: The error of opening or reading the file, only with
+                ``raise_errors``.
+
         Note:
-            Returns an empty Stream on error instead of raising an exception, so
-            callers should always check ``len(stream)`` before use.
+            Returns an empty Stream on error instead of raising an exception
+            unless ``raise_errors`` is set, so callers should always check
+            ``len(stream)`` before use.
         """
+        try:
+            # Local path of the file, or its content for a store without cache
+            source = self.storage.open(filepath)
+        except Exception as e:
+            print(f"{date_str} :: Unexpected error loading {filepath}: {e}")
+            if self.raise_errors:
+                raise
+            return Stream()
+
+        # Decoded days are cached by local path only
+        cacheable = self.cache is not None and isinstance(source, str)
+
+        if cacheable:
+            stream = self.cache.get(source, self.fill_value)
+            if stream is not None:
+                self.files.append(
+                    {
+                        "date": date_str,
+                        "filepath": filepath,
+                        "n_traces": len(stream),
+                        "loaded_at": datetime.now().isoformat(),
+                        "cached": True,
+                    }
+                )
+
+                if self.debug:
+                    print(
+                        f"{date_str} :: \U0001f4be Loaded {len(stream)} trace(s) "
+                        f"from cache of {filepath}"
+                    )
+
+                return stream
+
         try:
             # Read miniSEED file
-            stream = read(filepath, format="MSEED")
+            stream = read(source, format="MSEED")
 
             # Log file metadata
             file_metadata = {
@@ -148,26 +228,31 @@ class SDS:
                 "loaded_at": datetime.now().isoformat(),
             }
 
-            # Merge traces if there are gaps (interpolate missing data)
-            stream = stream.merge(fill_value="interpolate")
+            # Merge traces if there are gaps (interpolate missing data by default)
+            stream = merge_stream(stream, fill_value=self.fill_value)
+
+            if cacheable:
+                self.cache.put(source, stream, self.fill_value)
 
             # Track successfully loaded files
             self.files.append(file_metadata)
 
             if self.debug:
-                print(
-                    f"{date_str} :: Loaded {len(stream)} trace(s) from {filepath}"
-                )
+                print(f"{date_str} :: Loaded {len(stream)} trace(s) from {filepath}")
 
             return stream
 
         except ObsPyReadingError as e:
             print(f"{date_str} :: Failed to read miniSEED file: {filepath}")
             print(f"{date_str} :: Error: {e}")
+            if self.raise_errors:
+                raise
             return Stream()
 
         except Exception as e:
             print(f"{date_str} :: Unexpected error loading {filepath}: {e}")
+            if self.raise_errors:
+                raise
             return Stream()
 
     def get(self, date: datetime) -> Stream:
@@ -197,7 +282,7 @@ class SDS:
         filepath = self.get_filepath(date)
 
         # Check if file exists
-        if not os.path.exists(filepath):
+        if not self.storage.exists(filepath):
             if self.debug:
                 print(f"{date_str} :: miniSEED file not found: {filepath}")
             return Stream()
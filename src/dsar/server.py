@@ -0,0 +1,490 @@
+# Standard library imports
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from glob import glob
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+# Third party imports
+import pandas as pd
+
+# Project imports
+from dsar.continuous import ContinuousSeries, smooth, smoothing_windows
+from dsar.pyramid import AggregatePyramid
+from dsar.store import ResultStore
+
+downsample_methods: tuple[str, ...] = ("median", "mean", "min", "max", "first", "last")
+
+# Downsampling methods a pyramid level can answer from its bucket statistics
+pyramid_methods: tuple[str, ...] = ("median", "min", "max")
+
+
+class DsarService:
+    """Query DSAR series from the ``output/dsar`` tree with in-memory caching.
+
+    Series are read from the continuous series of an NSLC when it exists (see
+    :class:`ContinuousSeries`), otherwise from its daily CSV files with the
+    rolling medians recomputed across day boundaries, like :attr:`PlotDsar.df`.
+    They are kept in memory, the tree is re-checked at most every
+    ``refresh_interval`` seconds, and a series is reloaded only when its files
+    changed.
+
+    Query results are downsampled on the server to a target number of points.
+    Downsampled queries of columns kept in the aggregate pyramid (see
+    :class:`AggregatePyramid`) are answered from its coarsest adequate level
+    instead of the full series. The encoded responses of hot ranges are kept in
+    an LRU cache. Every response carries an ``ETag`` derived from the query and
+    the state of the source files, so clients can send conditional requests.
+
+    Example:
+        >>> service = DsarService("output/dsar")
+        >>> status, headers, body = service.series(
+        ...     {"nslc": "VG.OJN.00.EHZ", "start": "2020-01-01", "points": "2000"}
+        ... )
+    """
+
+    def __init__(
+        self,
+        dsar_dir: str = None,
+        max_series: int = 64,
+        max_responses: int = 256,
+        refresh_interval: float = 5.0,
+    ):
+        """Initialize the service.
+
+        Args:
+            dsar_dir (str, optional): DSAR output directory. Defaults to
+                ``<cwd>/output/dsar``.
+            max_series (int, optional): Number of combined series kept in memory.
+                Defaults to 64.
+            max_responses (int, optional): Number of encoded responses kept in
+                memory. Defaults to 256.
+            refresh_interval (float, optional): Minimum number of seconds between
+                two checks of the source files of a series. Defaults to 5.
+        """
+        if dsar_dir is None:
+            dsar_dir = os.path.join(os.getcwd(), "output", "dsar")
+
+        self.dsar_dir = dsar_dir
+        self.max_series = max_series
+        self.max_responses = max_responses
+        self.refresh_interval = refresh_interval
+
+        self._series: OrderedDict[tuple[str, ...], dict[str, Any]] = OrderedDict()
+        self._responses: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return (
+            f"DsarService(dsar_dir={self.dsar_dir}, max_series={self.max_series}, "
+            f"max_responses={self.max_responses})"
+        )
+
+    def stations(self) -> dict[str, list[str]]:
+        """List the NSLC identifiers and resample intervals available.
+
+        Returns:
+            dict[str, list[str]]: Mapping of NSLC to its resample intervals.
+        """
+        stations: dict[str, list[str]] = {}
+
+        if not os.path.isdir(self.dsar_dir):
+            return stations
+
+        for nslc in sorted(os.listdir(self.dsar_dir)):
+            nslc_dir = os.path.join(self.dsar_dir, nslc)
+            if not os.path.isdir(nslc_dir):
+                continue
+            resamples = [
+                resample
+                for resample in sorted(os.listdir(nslc_dir))
+                if os.path.isdir(os.path.join(nslc_dir, resample))
+            ]
+            if len(resamples) > 0:
+                stations[nslc] = resamples
+
+        return stations
+
+    def _signature(self, csv_files: list[str]) -> str:
+        """Fingerprint a set of files by name, size and modification time."""
+        digest = hashlib.sha1()
+        for csv_file in sorted(csv_files):
+            stat = os.stat(csv_file)
+            digest.update(f"{csv_file}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+        return digest.hexdigest()
+
+    def pyramid_levels(self, nslc: str, resample: str) -> list[str]:
+        """List the aggregate pyramid levels available for an NSLC.
+
+        Args:
+            nslc (str): NSLC identifier (e.g., ``"VG.OJN.00.EHZ"``).
+            resample (str): Resample interval used during DSAR calculation.
+
+        Returns:
+            list[str]: Levels with at least one CSV file, from finest to coarsest.
+        """
+        pyramid_dir = os.path.join(self.dsar_dir, nslc, resample, "pyramid")
+        if not os.path.isdir(pyramid_dir):
+            return []
+
+        levels = [
+            level
+            for level in os.listdir(pyramid_dir)
+            if len(glob(os.path.join(pyramid_dir, level, "*.csv"))) > 0
+        ]
+        return sorted(levels, key=pd.Timedelta)
+
+    def _read(
+        self, nslc: str, resample: str, level: str = None
+    ) -> tuple[list[str], Callable[[list[str]], pd.DataFrame]]:
+        """Return the source files of a series and the function reading them."""
+        if level is not None:
+            pyramid = AggregatePyramid(self.dsar_dir, nslc, resample, levels=[level])
+            csv_files = glob(os.path.join(pyramid.csv_dir, "pyramid", level, "*.csv"))
+            return csv_files, lambda _: pyramid.read(resolution=level)
+
+        continuous = ContinuousSeries(self.dsar_dir, nslc, resample)
+        csv_files = glob(os.path.join(continuous.csv_dir, "*.csv"))
+        if len(csv_files) > 0:
+            return csv_files, lambda _: continuous.read().dropna()
+
+        def read_daily(csv_files: list[str]) -> pd.DataFrame:
+            df = ResultStore.read_csv(csv_files, resample=resample).to_frame(
+                dropna=True
+            )
+            # Daily files are smoothed within their own day only
+            if continuous.column in df.columns:
+                df = smooth(df, continuous.column)
+            return df
+
+        return glob(os.path.join(self.dsar_dir, nslc, resample, "*.csv")), read_daily
+
+    def load(
+        self, nslc: str, resample: str, level: str = None
+    ) -> tuple[pd.DataFrame, str]:
+        """Return the series of an NSLC and its source signature.
+
+        Args:
+            nslc (str): NSLC identifier (e.g., ``"VG.OJN.00.EHZ"``).
+            resample (str): Resample interval used during DSAR calculation.
+            level (str, optional): Aggregate pyramid level read instead of the
+                series. Defaults to None.
+
+        Returns:
+            tuple[pd.DataFrame, str]: Series and the signature of the files it was
+                built from.
+
+        Raises:
+            FileNotFoundError: If the NSLC and resample interval are not in
+                :meth:`stations`, or there are no CSV files for them.
+        """
+        if resample not in self.stations().get(nslc, []):
+            raise FileNotFoundError(f"Unknown NSLC '{nslc}' or resample '{resample}'")
+
+        key = (nslc, resample) if level is None else (nslc, resample, level)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._series.get(key)
+            if entry is not None and now - entry["checked_at"] < self.refresh_interval:
+                self._series.move_to_end(key)
+                return entry["df"], entry["signature"]
+
+        csv_files, read = self._read(nslc, resample, level)
+        if len(csv_files) == 0:
+            raise FileNotFoundError(f"No CSV files found for {nslc} {resample}")
+
+        signature = self._signature(csv_files)
+
+        if entry is None or entry["signature"] != signature:
+            df = read(csv_files)
+        else:
+            df = entry["df"]
+
+        with self._lock:
+            self._series[key] = {"df": df, "signature": signature, "checked_at": now}
+            self._series.move_to_end(key)
+            while len(self._series) > self.max_series:
+                self._series.popitem(last=False)
+
+        return df, signature
+
+    @staticmethod
+    def downsample(
+        df: pd.DataFrame, points: int, resample: str, method: str = "median"
+    ) -> pd.DataFrame:
+        """Aggregate a series into at most ``points`` time buckets.
+
+        The bucket width is the smallest multiple of ``resample`` that fits the
+        time range into ``points`` buckets.
+
+        Args:
+            df (pd.DataFrame): Series with a sorted DatetimeIndex.
+            points (int): Maximum number of rows returned.
+            resample (str): Resample interval of the series.
+            method (str, optional): Aggregation applied per bucket. Defaults to
+                ``"median"``.
+
+        Returns:
+            pd.DataFrame: Downsampled series, or ``df`` itself if it already fits.
+        """
+        if points <= 0 or len(df) <= points:
+            return df
+
+        step = pd.Timedelta(resample)
+        span = df.index[-1] - df.index[0]
+        factor = max(1, int(-(-span // (step * points))))
+
+        return df.resample(step * factor).agg(method).dropna(how="all")
+
+    def pyramid_level(
+        self, nslc: str, resample: str, params: dict[str, str], points: int, method: str
+    ) -> str | None:
+        """Return the pyramid level answering a downsampled query, if any.
+
+        A level is used for ``median``, ``min`` and ``max`` queries with a
+        ``start``, an ``end`` and explicit ``columns``, none of them a rolling
+        median: those are smoothed per day in the pyramid.
+
+        Args:
+            nslc (str): NSLC identifier.
+            resample (str): Resample interval used during DSAR calculation.
+            params (dict[str, str]): Query parameters.
+            points (int): Target number of points.
+            method (str): Bucket aggregation.
+
+        Returns:
+            str | None: Coarsest level not coarser than the requested resolution,
+                or None to answer from the series.
+        """
+        start = params.get("start")
+        end = params.get("end")
+        columns = params.get("columns")
+        if points <= 0 or method not in pyramid_methods:
+            return None
+        if not (start and end and columns):
+            return None
+        if any(column in smoothing_windows for column in columns.split(",")):
+            return None
+
+        levels = self.pyramid_levels(nslc, resample)
+        if len(levels) == 0:
+            return None
+
+        resolution = (pd.Timestamp(end) - pd.Timestamp(start)) / points
+        level = AggregatePyramid(
+            self.dsar_dir, nslc, resample, levels=levels
+        ).level_for(resolution)
+        return None if level == resample else level
+
+    def series(
+        self, params: dict[str, str], if_none_match: str = None
+    ) -> tuple[int, dict[str, str], bytes]:
+        """Answer a series query.
+
+        Query parameters are ``nslc`` (required), ``resample`` (default
+        ``"10min"``), ``start`` and ``end`` (any pandas-parsable datetime, both
+        inclusive), ``points`` (target number of points, default 0 = all),
+        ``method`` (bucket aggregation, default ``"median"``) and ``columns``
+        (comma-separated, default all).
+
+        Args:
+            params (dict[str, str]): Query parameters.
+            if_none_match (str, optional): Value of the ``If-None-Match`` header.
+                Defaults to None.
+
+        Returns:
+            tuple[int, dict[str, str], bytes]: HTTP status, headers and JSON body.
+        """
+        nslc = params.get("nslc")
+        if not nslc:
+            return self._error(HTTPStatus.BAD_REQUEST, "Missing 'nslc' parameter")
+
+        resample = params.get("resample", "10min")
+        method = params.get("method", "median")
+        if method not in downsample_methods:
+            return self._error(
+                HTTPStatus.BAD_REQUEST,
+                f"Unknown method '{method}'. Use one of {list(downsample_methods)}",
+            )
+
+        if resample not in self.stations().get(nslc, []):
+            return self._error(
+                HTTPStatus.NOT_FOUND, f"Unknown NSLC '{nslc}' or resample '{resample}'"
+            )
+
+        try:
+            points = int(params.get("points", 0))
+            level = self.pyramid_level(nslc, resample, params, points, method)
+            if level is not None:
+                df, signature = self.load(nslc, resample, level)
+                if any(
+                    f"{column}_{method}" not in df.columns
+                    for column in params["columns"].split(",")
+                ):
+                    level = None
+            if level is None:
+                df, signature = self.load(nslc, resample)
+        except ValueError as e:
+            return self._error(HTTPStatus.BAD_REQUEST, str(e))
+        except FileNotFoundError as e:
+            return self._error(HTTPStatus.NOT_FOUND, str(e))
+
+        query = json.dumps(
+            [
+                nslc,
+                resample,
+                params.get("start"),
+                params.get("end"),
+                points,
+                method,
+                params.get("columns"),
+                level,
+            ]
+        )
+        etag = '"{}"'.format(hashlib.sha1(f"{query}{signature}".encode()).hexdigest())
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if if_none_match is not None and etag in [
+            tag.strip() for tag in if_none_match.split(",")
+        ]:
+            return HTTPStatus.NOT_MODIFIED, headers, b""
+
+        with self._lock:
+            body = self._responses.get(etag)
+            if body is not None:
+                self._responses.move_to_end(etag)
+
+        if body is None:
+            try:
+                body = self._encode(df, params, points, resample, method, level)
+            except (KeyError, ValueError) as e:
+                return self._error(HTTPStatus.BAD_REQUEST, str(e))
+
+            with self._lock:
+                self._responses[etag] = body
+                while len(self._responses) > self.max_responses:
+                    self._responses.popitem(last=False)
+
+        headers["Content-Type"] = "application/json"
+        return HTTPStatus.OK, headers, body
+
+    def _encode(
+        self,
+        df: pd.DataFrame,
+        params: dict[str, str],
+        points: int,
+        resample: str,
+        method: str,
+        level: str = None,
+    ) -> bytes:
+        """Slice, downsample and encode a series or a pyramid level as JSON."""
+        df = df.loc[params.get("start") : params.get("end")]
+
+        columns = params.get("columns")
+        if level is not None:
+            # The bucket statistic of every column, named like the column itself
+            columns = columns.split(",")
+            df = df[[f"{column}_{method}" for column in columns]]
+            df.columns = columns
+        elif columns:
+            df = df[columns.split(",")]
+
+        df = self.downsample(df, points, level or resample, method)
+
+        return df.to_json(orient="split", date_format="iso", date_unit="s").encode()
+
+    @staticmethod
+    def _error(status: HTTPStatus, message: str) -> tuple[int, dict[str, str], bytes]:
+        body = json.dumps({"error": message}).encode()
+        return status, {"Content-Type": "application/json"}, body
+
+
+def _handler(service: DsarService) -> type[BaseHTTPRequestHandler]:
+    """Build a request handler class bound to a :class:`DsarService`."""
+
+    class DsarRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+            if url.path == "/series":
+                status, headers, body = service.series(
+                    params, if_none_match=self.headers.get("If-None-Match")
+                )
+            elif url.path == "/stations":
+                status, headers, body = (
+                    HTTPStatus.OK,
+                    {"Content-Type": "application/json"},
+                    json.dumps(service.stations()).encode(),
+                )
+            else:
+                status, headers, body = service._error(
+                    HTTPStatus.NOT_FOUND, f"Unknown path {url.path}"
+                )
+
+            if len(body) > 1024 and "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = gzip.compress(body, compresslevel=5)
+                headers["Content-Encoding"] = "gzip"
+
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if status != HTTPStatus.NOT_MODIFIED:
+                self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return DsarRequestHandler
+
+
+def serve(
+    dsar_dir: str = None, host: str = "127.0.0.1", port: int = 8000, **kwargs: Any
+) -> None:
+    """Serve DSAR series over HTTP until interrupted.
+
+    Endpoints are ``GET /stations`` and ``GET /series`` (see
+    :meth:`DsarService.series` for its query parameters).
+
+    Args:
+        dsar_dir (str, optional): DSAR output directory. Defaults to
+            ``<cwd>/output/dsar``.
+        host (str, optional): Interface to bind. Defaults to ``"127.0.0.1"``.
+        port (int, optional): Port to listen on. Defaults to 8000.
+        **kwargs: Extra keyword arguments passed to :class:`DsarService`.
+
+    Example:
+        >>> serve("output/dsar", port=8000)
+    """
+    service = DsarService(dsar_dir, **kwargs)
+    server = ThreadingHTTPServer((host, port), _handler(service))
+
+    print(f"\U0001f310 Serving {service.dsar_dir} on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve DSAR series over HTTP.")
+    parser.add_argument("--dsar-dir", default=None, help="DSAR output directory")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    serve(args.dsar_dir, host=args.host, port=args.port)
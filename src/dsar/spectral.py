@@ -0,0 +1,298 @@
+# Third party imports
+import numpy as np
+import pandas as pd
+
+# Project imports
+from dsar.processing import butterworth
+from dsar.reducer import WindowReducer
+
+# Ratio between a statistic of |x| and the standard deviation of a zero-mean
+# Gaussian signal x. Only exact for rms (Parseval); median and mean are biased
+# for signals that are not Gaussian, such as a tremor tone.
+gaussian_scales: dict[str, float] = {
+    "median": 0.6744897501960817,
+    "mean": float(np.sqrt(2 / np.pi)),
+    "rms": 1.0,
+}
+
+# Quasi-random standard normal draws used to reduce the vector sum of several
+# components, 2**12 per component
+_vector_sum_draws: dict[int, np.ndarray] = {}
+
+
+def vector_sum_amplitude(powers: np.ndarray, statistic: str) -> np.ndarray:
+    """Return a statistic of the vector-sum amplitude of Gaussian components.
+
+    Models the combined row of the time-domain estimator,
+    ``statistic(sqrt(x_1² + ... + x_k²))``, for independent zero-mean Gaussian
+    components ``x_i`` with the given powers (variances). ``rms`` is exact; the
+    ``median`` and ``mean`` are taken over a fixed set of quasi-random draws,
+    which keeps them deterministic and within about 0.1 % of the exact value.
+
+    Args:
+        powers (np.ndarray): ``(k, ...)`` power of every component.
+        statistic (str): ``"median"``, ``"mean"`` or ``"rms"``.
+
+    Returns:
+        np.ndarray: Statistic with the shape of ``powers[0]``.
+    """
+    total = powers.sum(axis=0)
+    if statistic == "rms":
+        return np.sqrt(total)
+
+    k = powers.shape[0]
+    if k not in _vector_sum_draws:
+        from scipy.stats import norm, qmc
+
+        sample = qmc.Sobol(d=k, scramble=True, seed=0).random_base2(12)
+        _vector_sum_draws[k] = norm.ppf(sample) ** 2
+
+    # Share of the total power of every component, NaN where it is missing
+    with np.errstate(invalid="ignore", divide="ignore"):
+        shares = np.moveaxis(powers / total, 0, -1)
+    magnitude = np.sqrt(shares @ _vector_sum_draws[k].T)
+
+    if statistic == "median":
+        result = np.median(magnitude, axis=-1)
+    else:
+        result = magnitude.mean(axis=-1)
+    return result * np.sqrt(total)
+
+
+class SpectralEstimator:
+    """Estimate band amplitudes from one power spectrum per resample window.
+
+    Each epoch-aligned window is split into Hann-tapered, 50 % overlapping
+    segments whose periodograms are averaged (Welch's method). Segments touching
+    a gap are skipped. The velocity spectrum is converted to displacement by
+    dividing by ``ω²``, after which the amplitude of any band is a weighted
+    sum over frequency bins: the weights are the squared magnitude responses of
+    the same Butterworth filters used by :meth:`DayData.band_displacement`.
+
+    The band power is the variance of the band-passed displacement, so its
+    square root is the ``rms`` of the time-domain estimator whatever the signal
+    (Parseval). ``median`` and ``mean`` amplitudes are derived from it by
+    assuming Gaussian noise, e.g. ``median(|x|) = 0.6745 σ``, and come out low
+    for tonal signals: about 13 % on LF for noise plus a 3 Hz tone, where
+    ``rms`` stays within 1 %. The combined row of several components is reduced
+    like the time-domain one, as the statistic of the vector-sum amplitude, see
+    :func:`vector_sum_amplitude`.
+
+    Attributes:
+        reducer (WindowReducer): Provides the epoch-aligned window layout.
+        segment_length (float): Length of a Welch segment in seconds.
+        statistic (str): Time-domain statistic the amplitude is scaled to.
+
+    Example:
+        >>> estimator = SpectralEstimator("10min")
+        >>> (df,) = estimator.reduce_bands(data, starttime, 100.0, dsar.bands)
+        >>> df.columns.tolist()
+        ['LF', 'HF']
+    """
+
+    def __init__(
+        self,
+        resample: str = "10min",
+        segment_length: float = 20.48,
+        statistic: str = "rms",
+        corners: int = 4,
+    ):
+        """Initialize the estimator.
+
+        Args:
+            resample (str, optional): Pandas offset alias for the window length.
+                Defaults to ``"10min"``.
+            segment_length (float, optional): Length of a Welch segment in seconds.
+                Sets the frequency resolution. Defaults to 20.48.
+            statistic (str, optional): Statistic of the absolute displacement the
+                amplitude is scaled to: ``"rms"``, or ``"median"`` and ``"mean"``
+                which are only valid for Gaussian noise. Defaults to ``"rms"``.
+            corners (int, optional): Order of the Butterworth filters whose
+                responses weight the bins. Defaults to 4.
+
+        Raises:
+            ValueError: If ``statistic`` is not supported.
+        """
+        if statistic not in gaussian_scales:
+            raise ValueError(
+                f"Spectral estimator supports {list(gaussian_scales)}. "
+                f"Got '{statistic}'"
+            )
+
+        self.reducer = WindowReducer(resample, [statistic])
+        self.segment_length = segment_length
+        self.statistic = statistic
+        self.corners = corners
+
+    def __repr__(self) -> str:
+        return (
+            f"SpectralEstimator(resample={self.reducer.resample}, "
+            f"segment_length={self.segment_length}, statistic={self.statistic})"
+        )
+
+    def psd(
+        self, data: np.ndarray, starttime: pd.Timestamp, sampling_rate: float
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Compute the velocity power spectral density of every window.
+
+        Args:
+            data (np.ndarray): ``(n_rows, npts)`` velocity samples. ``NaN``
+                samples mark gaps.
+            starttime (pd.Timestamp): Time of the first sample.
+            sampling_rate (float): Sampling rate in Hz.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Frequencies of
+                the bins, ``(n_rows, n_windows, n_freqs)`` one-sided velocity
+                PSD (``NaN`` for windows without a complete segment), window start
+                times (ns since epoch) and ``(n_rows, n_windows)`` coverage.
+        """
+        nperseg = int(round(self.segment_length * sampling_rate))
+        step = nperseg // 2
+
+        window, windows = self.reducer.window_index(
+            starttime, sampling_rate, data.shape[-1]
+        )
+        values = self.reducer.layout(np.asarray(data, dtype=np.float64), window)
+
+        expected = self.reducer.window_ns * sampling_rate / 1e9
+        coverage = np.isfinite(values).sum(axis=-1) / expected
+
+        freqs = np.fft.rfftfreq(nperseg, d=1.0 / sampling_rate)
+        psd = np.full(values.shape[:-1] + (len(freqs),), np.nan)
+
+        if values.shape[-1] < nperseg:
+            return freqs, psd, windows, coverage
+
+        taper = np.hanning(nperseg)
+        scale = 1.0 / (sampling_rate * np.sum(taper * taper))
+
+        for w in range(values.shape[-2]):
+            segments = np.lib.stride_tricks.sliding_window_view(
+                values[..., w, :], nperseg, axis=-1
+            )[..., ::step, :]
+            valid = np.isfinite(segments).all(axis=-1)
+
+            segments = np.where(valid[..., None], segments, 0.0)
+            segments = segments - segments.mean(axis=-1, keepdims=True)
+            power = np.abs(np.fft.rfft(segments * taper, axis=-1)) ** 2 * scale
+            power[..., 1:] *= 2
+            if nperseg % 2 == 0:
+                power[..., -1] /= 2
+
+            n_valid = valid.sum(axis=-1)
+            mean = (power * valid[..., None]).sum(axis=-2) / np.maximum(n_valid, 1)[
+                ..., None
+            ]
+            psd[..., w, :] = np.where((n_valid > 0)[..., None], mean, np.nan)
+
+        return freqs, psd, windows, coverage
+
+    def band_weights(
+        self, freqs: np.ndarray, band_frequencies: list[float], sampling_rate: float
+    ) -> np.ndarray:
+        """Return the squared magnitude response of a band's filter chain.
+
+        Args:
+            freqs (np.ndarray): Frequencies of the bins.
+            band_frequencies (list[float]): ``[high_pass, bandpass_low,
+                bandpass_high]`` in Hz.
+            sampling_rate (float): Sampling rate in Hz.
+
+        Returns:
+            np.ndarray: Weight of every bin.
+        """
+        from scipy.signal import sosfreqz
+
+        weights = np.ones(len(freqs))
+        for btype, freq in zip(
+            ("highpass", "highpass", "lowpass"), band_frequencies, strict=True
+        ):
+            sos = butterworth(btype, freq, sampling_rate, self.corners)
+            _, response = sosfreqz(sos, worN=freqs, fs=sampling_rate)
+            weights *= np.abs(response) ** 2
+
+        return weights
+
+    def reduce_bands(
+        self,
+        data: np.ndarray,
+        starttime: pd.Timestamp,
+        sampling_rate: float,
+        bands: dict[str, list[float]],
+        combined: bool = False,
+        coverage: bool = False,
+        spectrum: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray] = None,
+    ) -> list[pd.DataFrame]:
+        """Compute the amplitude of every band for every row and window.
+
+        Args:
+            data (np.ndarray): ``(n_rows, npts)`` velocity samples. ``NaN``
+                samples mark gaps.
+            starttime (pd.Timestamp): Time of the first sample.
+            sampling_rate (float): Sampling rate in Hz.
+            bands (dict[str, list[float]]): Mapping of band name to its frequency
+                triplet.
+            combined (bool, optional): Append a row for the vector sum of all
+                rows, reduced with :func:`vector_sum_amplitude` from the row
+                powers. Defaults to False.
+            coverage (bool, optional): Add a ``coverage`` column with the fraction
+                of expected samples present in each window. Defaults to False.
+            spectrum (tuple, optional): Output of :meth:`psd` for ``data``, when it
+                was already computed. Defaults to None.
+
+        Returns:
+            list[pd.DataFrame]: One DataFrame per row (plus the combined row), with
+                one column per band and a ``"datetime"``-named DatetimeIndex.
+        """
+        if spectrum is None:
+            spectrum = self.psd(data, starttime, sampling_rate)
+        freqs, psd, windows, window_coverage = spectrum
+        df_bin = freqs[1] - freqs[0]
+
+        omega2 = (2 * np.pi * freqs) ** 2
+        omega2[0] = np.inf
+        psd = psd / omega2
+
+        powers = {
+            band_name: np.sum(
+                psd * self.band_weights(freqs, band_frequencies, sampling_rate),
+                axis=-1,
+            )
+            * df_bin
+            for band_name, band_frequencies in bands.items()
+        }
+
+        scale = gaussian_scales[self.statistic]
+        amplitudes = {
+            band_name: scale * np.sqrt(power) for band_name, power in powers.items()
+        }
+
+        if combined:
+            amplitudes = {
+                band_name: np.vstack(
+                    [
+                        amplitude,
+                        vector_sum_amplitude(powers[band_name], self.statistic),
+                    ]
+                )
+                for band_name, amplitude in amplitudes.items()
+            }
+            window_coverage = np.vstack([window_coverage, window_coverage.min(axis=0)])
+
+        index = pd.DatetimeIndex(windows.view("datetime64[ns]"), name="datetime")
+
+        dfs: list[pd.DataFrame] = []
+        for row in range(window_coverage.shape[0]):
+            df = pd.DataFrame(
+                {
+                    band_name: amplitude[row]
+                    for band_name, amplitude in amplitudes.items()
+                },
+                index=index,
+            )
+            if coverage:
+                df["coverage"] = window_coverage[row]
+            dfs.append(df)
+
+        return dfs
@@ -0,0 +1,523 @@
+# Standard library imports
+import hashlib
+import io
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from glob import glob
+from typing import Any
+
+# Project imports
+from dsar.utilities import atomic_write
+
+
+class Storage:
+    """Base class of the stores an :class:`SDS` archive can be read from.
+
+    Subclasses implement :meth:`exists`, :meth:`glob`, :meth:`info` and
+    :meth:`read_range`. :meth:`read` splits an object into ``chunk_size`` byte
+    ranges fetched concurrently on up to ``max_connections`` connections. When
+    ``cache_dir`` is set, :meth:`open` keeps a local copy of every object read (a
+    read-through cache), refreshed when the object's size or version changes and
+    capped at ``cache_max_bytes`` by evicting the least recently used copies.
+
+    Attributes:
+        root (str): Root of the SDS archive in the store.
+        max_connections (int): Concurrent range requests per object.
+        chunk_size (int): Size of a range request in bytes.
+        cache_dir (str | None): Directory of the read-through cache.
+        cache_max_bytes (int): Size cap of the read-through cache.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        max_connections: int = 8,
+        chunk_size: int = 8 * 1024**2,
+        cache_dir: str = None,
+        cache_max_bytes: int = 10 * 1024**3,
+    ):
+        """Initialize the store.
+
+        Args:
+            root (str): Root of the SDS archive in the store.
+            max_connections (int, optional): Concurrent range requests per object.
+                Defaults to 8.
+            chunk_size (int, optional): Size of a range request in bytes. Defaults
+                to 8 MiB.
+            cache_dir (str, optional): Directory of the read-through cache.
+                Defaults to None (no cache).
+            cache_max_bytes (int, optional): Size cap of the read-through cache in
+                bytes. Defaults to 10 GiB.
+        """
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        self.root = root.rstrip("/")
+        self.max_connections = max_connections
+        self.chunk_size = chunk_size
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(root={self.root}, "
+            f"max_connections={self.max_connections}, cache_dir={self.cache_dir})"
+        )
+
+    def join(self, *parts: str) -> str:
+        """Join path components below :attr:`root`.
+
+        Args:
+            *parts (str): Path components.
+
+        Returns:
+            str: Path of the object in the store.
+        """
+        return "/".join([self.root, *parts])
+
+    def isdir(self) -> bool:
+        """Return whether :attr:`root` can be read.
+
+        Returns:
+            bool: True if the archive root exists.
+        """
+        return True
+
+    def exists(self, path: str) -> bool:
+        """Return whether an object exists.
+
+        Args:
+            path (str): Path of the object.
+
+        Returns:
+            bool: True if the object exists.
+        """
+        raise NotImplementedError
+
+    def glob(self, pattern: str) -> list[str]:
+        """List the objects matching a shell-style pattern.
+
+        Args:
+            pattern (str): Pattern relative to :attr:`root`, e.g.
+                ``"2025/VG/OJN/EHZ.D/*"``.
+
+        Returns:
+            list[str]: Sorted paths of the matching objects.
+        """
+        raise NotImplementedError
+
+    def info(self, path: str) -> dict[str, Any]:
+        """Return the size and version of an object.
+
+        Args:
+            path (str): Path of the object.
+
+        Returns:
+            dict[str, Any]: ``size`` in bytes and ``version``, any value that
+                changes when the object is rewritten (ETag, modification time).
+        """
+        raise NotImplementedError
+
+    def read_range(self, path: str, start: int, end: int) -> bytes:
+        """Read the ``[start, end)`` byte range of an object.
+
+        Args:
+            path (str): Path of the object.
+            start (int): First byte.
+            end (int): Byte after the last one.
+
+        Returns:
+            bytes: Content of the range.
+        """
+        raise NotImplementedError
+
+    def read(self, path: str, size: int = None) -> bytes:
+        """Read a whole object with concurrent range requests.
+
+        Args:
+            path (str): Path of the object.
+            size (int, optional): Size of the object, if already known.
+
+        Returns:
+            bytes: Content of the object.
+        """
+        size = self.info(path)["size"] if size is None else size
+        ranges = [
+            (start, min(start + self.chunk_size, size))
+            for start in range(0, size, self.chunk_size)
+        ]
+
+        if len(ranges) <= 1:
+            return self.read_range(path, 0, size) if size > 0 else b""
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_connections, len(ranges))
+        ) as executor:
+            chunks = executor.map(lambda r: self.read_range(path, *r), ranges)
+            return b"".join(chunks)
+
+    def open(self, path: str) -> str | io.BytesIO:
+        """Return a source ObsPy can read an object from.
+
+        Args:
+            path (str): Path of the object.
+
+        Returns:
+            str | io.BytesIO: Path of the local copy when the read-through cache
+                is enabled, otherwise the content of the object in memory.
+        """
+        if self.cache_dir is None:
+            return io.BytesIO(self.read(path))
+
+        info = self.info(path)
+        key = hashlib.sha1(path.encode()).hexdigest()
+        local_path = os.path.join(self.cache_dir, key)
+
+        try:
+            with open(f"{local_path}.json", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            cached = None
+
+        if (
+            cached is not None
+            and cached["size"] == info["size"]
+            and cached["version"] == str(info["version"])
+            and os.path.exists(local_path)
+        ):
+            # Touch the header so eviction sees this copy as recently used
+            os.utime(f"{local_path}.json")
+            return local_path
+
+        data = self.read(path, size=info["size"])
+
+        with atomic_write(local_path, "wb") as f:
+            f.write(data)
+
+        with atomic_write(f"{local_path}.json", encoding="utf-8") as f:
+            json.dump(
+                {"path": path, "size": info["size"], "version": str(info["version"])},
+                f,
+            )
+
+        self.evict()
+
+        return local_path
+
+    def evict(self) -> list[str]:
+        """Drop least recently used copies until the cache fits its size cap.
+
+        Returns:
+            list[str]: Paths of the objects whose copies were dropped.
+        """
+        if self.cache_dir is None:
+            return []
+
+        entries: list[tuple[float, str, int, str]] = []
+        for header_file in glob(os.path.join(self.cache_dir, "*.json")):
+            local_path = header_file[: -len(".json")]
+            if not os.path.exists(local_path):
+                continue
+            with open(header_file, encoding="utf-8") as f:
+                path = json.load(f)["path"]
+            entries.append(
+                (
+                    os.path.getmtime(header_file),
+                    local_path,
+                    os.path.getsize(local_path),
+                    path,
+                )
+            )
+
+        total = sum(size for _, _, size, _ in entries)
+
+        evicted: list[str] = []
+        for _, local_path, size, path in sorted(entries):
+            if total <= self.cache_max_bytes:
+                break
+            for filename in (f"{local_path}.json", local_path):
+                try:
+                    os.remove(filename)
+                except FileNotFoundError:
+                    pass
+            total -= size
+            evicted.append(path)
+
+        return evicted
+
+
+class LocalStorage(Storage):
+    """SDS archive on a local or mounted POSIX filesystem.
+
+    Objects are files read directly by ObsPy, so range requests and the
+    read-through cache are not used.
+    """
+
+    def __init__(self, root: str):
+        """Initialize the store.
+
+        Args:
+            root (str): Root directory of the SDS archive.
+        """
+        super().__init__(root)
+        self.root = os.path.abspath(root)
+
+    def join(self, *parts: str) -> str:
+        return os.path.join(self.root, *parts)
+
+    def isdir(self) -> bool:
+        return os.path.isdir(self.root)
+
+    def exists(self, path: str) -> bool:
+        return os.path.exists(path)
+
+    def glob(self, pattern: str) -> list[str]:
+        return sorted(path for path in glob(self.join(pattern)) if os.path.isfile(path))
+
+    def info(self, path: str) -> dict[str, Any]:
+        stat = os.stat(path)
+        return {"size": stat.st_size, "version": stat.st_mtime_ns}
+
+    def read_range(self, path: str, start: int, end: int) -> bytes:
+        with open(path, "rb") as f:
+            f.seek(start)
+            return f.read(end - start)
+
+    def open(self, path: str) -> str:
+        return path
+
+
+class FsspecStorage(Storage):
+    """SDS archive in any filesystem supported by fsspec (``s3://``, ``gs://``,
+    ``az://``, ``https://``, ...).
+
+    Range requests of one object are sent together with ``cat_ranges``, which
+    asynchronous filesystems such as s3fs run concurrently on their own pooled
+    session. Requires ``fsspec`` and the package of the protocol (e.g. ``s3fs``).
+
+    Example:
+        >>> storage = FsspecStorage(
+        ...     "s3://seismic/sds",
+        ...     cache_dir="output/sds-cache",
+        ...     client_kwargs={"endpoint_url": "http://minio:9000"},
+        ... )
+        >>> sds = SDS("s3://seismic/sds", station="OJN", channel="EHZ", storage=storage)
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_connections: int = 8,
+        chunk_size: int = 8 * 1024**2,
+        cache_dir: str = None,
+        cache_max_bytes: int = 10 * 1024**3,
+        **storage_options: Any,
+    ):
+        """Initialize the store.
+
+        Args:
+            url (str): URL of the SDS archive root, e.g. ``"s3://bucket/sds"``.
+            max_connections (int, optional): Concurrent range requests per object.
+                Defaults to 8.
+            chunk_size (int, optional): Size of a range request in bytes. Defaults
+                to 8 MiB.
+            cache_dir (str, optional): Directory of the read-through cache.
+                Defaults to None (no cache).
+            cache_max_bytes (int, optional): Size cap of the read-through cache in
+                bytes. Defaults to 10 GiB.
+            **storage_options (Any): Options of the fsspec filesystem, e.g.
+                ``key``, ``secret`` or ``client_kwargs`` for s3fs.
+
+        Raises:
+            ImportError: If fsspec is not installed.
+        """
+        try:
+            import fsspec
+        except ImportError:
+            raise ImportError(
+                "FsspecStorage requires fsspec. Install it with "
+                "`pip install dsar[fsspec]`"
+            )
+
+        self.fs, root = fsspec.core.url_to_fs(url, **storage_options)
+        super().__init__(root, max_connections, chunk_size, cache_dir, cache_max_bytes)
+
+    def isdir(self) -> bool:
+        return self.fs.isdir(self.root)
+
+    def exists(self, path: str) -> bool:
+        return self.fs.exists(path)
+
+    def glob(self, pattern: str) -> list[str]:
+        return sorted(
+            path for path in self.fs.glob(self.join(pattern)) if self.fs.isfile(path)
+        )
+
+    def info(self, path: str) -> dict[str, Any]:
+        info = self.fs.info(path)
+        version = (
+            info.get("ETag")
+            or info.get("etag")
+            or info.get("mtime")
+            or info.get("LastModified")
+            or info.get("created")
+        )
+        return {"size": info["size"], "version": version}
+
+    def read_range(self, path: str, start: int, end: int) -> bytes:
+        return self.fs.cat_file(path, start=start, end=end)
+
+    def read(self, path: str, size: int = None) -> bytes:
+        size = self.info(path)["size"] if size is None else size
+        starts = list(range(0, size, self.chunk_size))
+        if len(starts) <= 1:
+            return self.fs.cat_file(path)
+
+        ends = [min(start + self.chunk_size, size) for start in starts]
+        chunks = self.fs.cat_ranges(
+            [path] * len(starts), starts, ends, batch_size=self.max_connections
+        )
+        return b"".join(chunks)
+
+
+class S3Storage(Storage):
+    """SDS archive in Amazon S3 or an S3-compatible store (MinIO, Ceph, ...).
+
+    Uses a single thread-safe boto3 client whose connection pool holds
+    ``max_connections`` connections, shared by the concurrent range requests.
+    Requires ``boto3``.
+
+    Example:
+        >>> storage = S3Storage(
+        ...     "seismic",
+        ...     prefix="sds",
+        ...     endpoint_url="http://minio:9000",
+        ...     cache_dir="output/sds-cache",
+        ... )
+        >>> sds = SDS("s3://seismic/sds", station="OJN", channel="EHZ", storage=storage)
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: str = None,
+        max_connections: int = 8,
+        chunk_size: int = 8 * 1024**2,
+        cache_dir: str = None,
+        cache_max_bytes: int = 10 * 1024**3,
+        **client_kwargs: Any,
+    ):
+        """Initialize the store.
+
+        Args:
+            bucket (str): Bucket name.
+            prefix (str, optional): Key prefix of the SDS archive root. Defaults
+                to the bucket root.
+            endpoint_url (str, optional): Endpoint of an S3-compatible store.
+                Defaults to None (AWS).
+            max_connections (int, optional): Size of the connection pool and
+                concurrent range requests per object. Defaults to 8.
+            chunk_size (int, optional): Size of a range request in bytes. Defaults
+                to 8 MiB.
+            cache_dir (str, optional): Directory of the read-through cache.
+                Defaults to None (no cache).
+            cache_max_bytes (int, optional): Size cap of the read-through cache in
+                bytes. Defaults to 10 GiB.
+            **client_kwargs (Any): Other arguments of ``boto3.client``, e.g.
+                ``aws_access_key_id`` or ``region_name``.
+
+        Raises:
+            ImportError: If boto3 is not installed.
+        """
+        try:
+            import boto3
+            from botocore.config import Config
+        except ImportError:
+            raise ImportError(
+                "S3Storage requires boto3. Install it with `pip install dsar[s3]`"
+            )
+
+        super().__init__(
+            prefix.strip("/"), max_connections, chunk_size, cache_dir, cache_max_bytes
+        )
+        self.bucket = bucket
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            config=Config(max_pool_connections=max_connections),
+            **client_kwargs,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"S3Storage(bucket={self.bucket}, prefix={self.root}, "
+            f"max_connections={self.max_connections}, cache_dir={self.cache_dir})"
+        )
+
+    def join(self, *parts: str) -> str:
+        return "/".join([self.root, *parts]) if self.root else "/".join(parts)
+
+    def isdir(self) -> bool:
+        # The trailing slash keeps "sds" from matching "sds-other/..."
+        response = self.client.list_objects_v2(
+            Bucket=self.bucket, Prefix=f"{self.root}/" if self.root else "", MaxKeys=1
+        )
+        return response.get("KeyCount", 0) > 0
+
+    def glob(self, pattern: str) -> list[str]:
+        pattern = self.join(pattern)
+        # Only the keys below the literal part of the pattern are listed
+        prefix = re.split(r"[*?[]", pattern, maxsplit=1)[0]
+        depth = pattern.count("/")
+
+        paths: list[str] = []
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            # Wildcards match within one path component, like glob.glob
+            paths.extend(
+                obj["Key"]
+                for obj in page.get("Contents", [])
+                if obj["Key"].count("/") == depth and fnmatchcase(obj["Key"], pattern)
+            )
+        return sorted(paths)
+
+    def exists(self, path: str) -> bool:
+        try:
+            self.info(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def info(self, path: str) -> dict[str, Any]:
+        try:
+            response = self.client.head_object(Bucket=self.bucket, Key=path)
+        except self.client.exceptions.ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                raise FileNotFoundError(f"s3://{self.bucket}/{path}")
+            raise
+        return {"size": response["ContentLength"], "version": response["ETag"]}
+
+    def read_range(self, path: str, start: int, end: int) -> bytes:
+        response = self.client.get_object(
+            Bucket=self.bucket, Key=path, Range=f"bytes={start}-{end - 1}"
+        )
+        return response["Body"].read()
+
+
+def get_storage(sds_dir: str, **options: Any) -> Storage:
+    """Return the store of an SDS archive from its path or URL.
+
+    Args:
+        sds_dir (str): Local directory, or URL such as ``"s3://bucket/sds"``.
+        **options (Any): Options of :class:`FsspecStorage` for URLs.
+
+    Returns:
+        Storage: :class:`LocalStorage` for paths, :class:`FsspecStorage` for URLs.
+    """
+    if "://" in sds_dir and not sds_dir.startswith("file://"):
+        return FsspecStorage(sds_dir, **options)
+    return LocalStorage(sds_dir.removeprefix("file://"))
@@ -0,0 +1,336 @@
+# Standard library imports
+import json
+import os
+
+# Third party imports
+import numpy as np
+import pandas as pd
+
+# Project imports
+from dsar.utilities import atomic_write
+
+
+class ResultStore:
+    """Compact column store of window results on an epoch-aligned time grid.
+
+    Every column is one preallocated NumPy array with a row per resample window,
+    next to an ``int64`` array of the window start times in nanoseconds since the
+    epoch. Appending a day writes its rows in place at their grid position, so a
+    series of many years is a handful of contiguous arrays instead of thousands
+    of daily DataFrames to concatenate. Capacity grows by doubling, in either
+    direction, so days can be appended out of order. A row appended again is
+    overwritten, like ``drop_duplicates(keep="last")``.
+
+    :meth:`to_frame` returns pandas objects that are views on the arrays: build
+    them as often as needed, and copy them before modifying their values.
+
+    Attributes:
+        resample (str): Window length of the grid.
+        step (int): Window length in nanoseconds.
+        dtype (np.dtype): Dtype of new columns.
+
+    Example:
+        >>> store = ResultStore("10min", dtype=np.float32)
+        >>> for _, dfs in dsar.iter_days():
+        ...     store.append(dfs["VG.OJN.00.EHZ"])
+        >>> df = store.to_frame()
+    """
+
+    def __init__(
+        self,
+        resample: str = "10min",
+        dtype: np.dtype = np.float64,
+        capacity: int = 1024,
+    ):
+        """Initialize an empty store.
+
+        Args:
+            resample (str, optional): Window length of the grid. Appended rows must
+                start on a multiple of it since the epoch, like the windows of
+                :class:`WindowReducer`. Defaults to ``"10min"``.
+            dtype (np.dtype, optional): Floating point dtype of the columns.
+                ``np.float32`` halves the memory. Defaults to ``np.float64``.
+            capacity (int, optional): Number of rows allocated up front.
+                Defaults to 1024.
+
+        Raises:
+            AssertionError: If ``dtype`` is not a floating point dtype.
+        """
+        self.resample = resample
+        self.step: int = pd.Timedelta(resample).value
+        self.dtype = np.dtype(dtype)
+
+        assert (
+            self.dtype.kind == "f"
+        ), f"\u274c dtype must be a floating point dtype. Got {self.dtype}"
+
+        self._capacity = max(int(capacity), 1)
+        self._origin: int | None = None
+        self._first = 0
+        self._end = 0
+        self._times = np.empty(0, dtype=np.int64)
+        self._columns: dict[str, np.ndarray] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"ResultStore(resample={self.resample}, dtype={self.dtype}, "
+            f"rows={len(self)}, columns={self.columns})"
+        )
+
+    def __len__(self) -> int:
+        return self._end - self._first
+
+    @property
+    def columns(self) -> list[str]:
+        """Return the column names in the order they were first appended.
+
+        Returns:
+            list[str]: Column names.
+        """
+        return list(self._columns)
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory allocated by the store.
+
+        Returns:
+            int: Size of the time and value arrays in bytes.
+        """
+        return self._times.nbytes + sum(
+            column.nbytes for column in self._columns.values()
+        )
+
+    @property
+    def times(self) -> np.ndarray:
+        """Return the window start times of the stored rows.
+
+        Returns:
+            np.ndarray: ``int64`` nanoseconds since the epoch, a view.
+        """
+        return self._times[self._first : self._end]
+
+    def _allocate(self, start: int, end: int) -> None:
+        """Reallocate the arrays so grid rows ``[start, end)`` fit, keeping data.
+
+        Rows are relative to the current origin and may be negative.
+        """
+        size = len(self._times)
+        if start >= 0 and end <= size:
+            return
+
+        capacity = max(size, self._capacity)
+        while capacity < max(end, size) - min(start, 0):
+            capacity *= 2
+
+        # Leave the spare rows on the side that overflowed
+        shift = capacity - max(end, size) if start < 0 else 0
+        origin = self._origin - shift * self.step
+
+        times = origin + np.arange(capacity, dtype=np.int64) * self.step
+        for name, values in self._columns.items():
+            column = np.full(capacity, np.nan, dtype=values.dtype)
+            column[shift : shift + size] = values
+            self._columns[name] = column
+
+        self._times = times
+        self._origin = origin
+        self._first += shift
+        self._end += shift
+
+    def append(self, df: pd.DataFrame) -> None:
+        """Write the rows of a DataFrame at their grid position.
+
+        Args:
+            df (pd.DataFrame): Results with a DatetimeIndex of window start times,
+                e.g. one day of :attr:`DSAR.dfs`. Non-numeric columns are
+                skipped.
+
+        Raises:
+            ValueError: If a timestamp is not on the grid.
+
+        Example:
+            >>> store.append(dsar.dfs["VG.OJN.00.EHZ"])
+        """
+        if df.empty:
+            return
+
+        times = pd.DatetimeIndex(df.index).as_unit("ns").asi8
+        if np.any(times % self.step != 0):
+            raise ValueError(
+                f"Timestamps are not aligned to {self.resample} windows since "
+                f"the epoch"
+            )
+
+        if self._origin is None:
+            self._origin = int(times.min())
+            self._first = self._end = 0
+
+        rows = (times - self._origin) // self.step
+        self._allocate(int(rows.min()), int(rows.max()) + 1)
+        rows = (times - self._origin) // self.step
+        first, end = int(rows.min()), int(rows.max()) + 1
+
+        # A day of sorted windows without holes is written as a slice
+        if end - first == len(rows) and np.all(rows[1:] > rows[:-1]):
+            rows = slice(first, end)
+
+        names = [name for name, dtype in df.dtypes.items() if dtype.kind in "biuf"]
+        if len(names) < df.shape[1]:
+            df = df[names]
+        values = df.to_numpy(dtype=self.dtype)
+        for position, name in enumerate(names):
+            if name not in self._columns:
+                self._columns[name] = np.full(len(self._times), np.nan, self.dtype)
+            self._columns[name][rows] = values[:, position]
+
+        if self._end == self._first:
+            self._first, self._end = first, end
+        else:
+            self._first = min(self._first, first)
+            self._end = max(self._end, end)
+
+    def to_frame(
+        self,
+        columns: list[str] = None,
+        start: str = None,
+        end: str = None,
+        dropna: bool = False,
+    ) -> pd.DataFrame:
+        """Return the stored rows as a DataFrame backed by the store's arrays.
+
+        Args:
+            columns (list[str], optional): Columns returned. Defaults to all.
+            start (str, optional): First window returned, inclusive. Defaults to
+                the first stored row.
+            end (str, optional): Last window returned, inclusive. Defaults to the
+                last stored row.
+            dropna (bool, optional): Drop rows with any missing value, including
+                the empty grid rows between appended days. The result is then a
+                copy. Defaults to False (zero-copy view).
+
+        Returns:
+            pd.DataFrame: Rows on the grid with a ``"datetime"``-named
+                DatetimeIndex.
+
+        Example:
+            >>> store.to_frame(["DSAR_10min"], start="2025-01-01")
+        """
+        columns = self.columns if columns is None else columns
+
+        first, stop = self._first, self._end
+        if self._origin is not None:
+            if start is not None:
+                row = -(-(pd.Timestamp(start).value - self._origin) // self.step)
+                first = min(max(first, row), stop)
+            if end is not None:
+                row = (pd.Timestamp(end).value - self._origin) // self.step + 1
+                stop = max(min(stop, row), first)
+
+        index = pd.DatetimeIndex(
+            self._times[first:stop].view("datetime64[ns]"), name="datetime"
+        )
+        df = pd.DataFrame(
+            {name: self._columns[name][first:stop] for name in columns},
+            index=index,
+            copy=False,
+        )
+
+        return df.dropna() if dropna else df
+
+    def save(self, directory: str) -> str:
+        """Write the stored rows as one ``.npy`` file per column.
+
+        Args:
+            directory (str): Output directory, created if needed.
+
+        Returns:
+            str: Path of the ``store.json`` header.
+        """
+        os.makedirs(directory, exist_ok=True)
+
+        arrays = {"times": self.times}
+        for index, values in enumerate(self._columns.values()):
+            arrays[f"column_{index}"] = values[self._first : self._end]
+
+        for key, values in arrays.items():
+            with atomic_write(os.path.join(directory, f"{key}.npy"), "wb") as f:
+                np.save(f, values)
+
+        header_file = os.path.join(directory, "store.json")
+        with atomic_write(header_file, encoding="utf-8") as f:
+            json.dump(
+                {
+                    "resample": self.resample,
+                    "dtype": self.dtype.str,
+                    "columns": self.columns,
+                },
+                f,
+            )
+
+        return header_file
+
+    @classmethod
+    def load(cls, directory: str, mmap_mode: str = None) -> "ResultStore":
+        """Read a store written by :meth:`save`.
+
+        Args:
+            directory (str): Directory of the store.
+            mmap_mode (str, optional): ``"r"`` or ``"c"`` to memory-map the
+                columns instead of reading them, see :func:`numpy.load`. Use
+                ``"c"`` to append to a memory-mapped store; it is copied into
+                memory on the first append that grows it. Defaults to None.
+
+        Returns:
+            ResultStore: The store.
+        """
+        with open(os.path.join(directory, "store.json"), encoding="utf-8") as f:
+            header = json.load(f)
+
+        store = cls(header["resample"], dtype=np.dtype(header["dtype"]))
+
+        times = np.load(os.path.join(directory, "times.npy"), mmap_mode=mmap_mode)
+        if len(times) == 0:
+            return store
+
+        store._times = times
+        store._origin = int(times[0])
+        store._first, store._end = 0, len(times)
+        store._columns = {
+            name: np.load(
+                os.path.join(directory, f"column_{index}.npy"), mmap_mode=mmap_mode
+            )
+            for index, name in enumerate(header["columns"])
+        }
+
+        return store
+
+    @classmethod
+    def read_csv(
+        cls, csv_files: list[str], resample: str = "10min", dtype: np.dtype = np.float64
+    ) -> "ResultStore":
+        """Build a store from daily CSV files written by :meth:`DSAR.save`.
+
+        Files are read one at a time and written in place, so no list of daily
+        DataFrames is kept nor concatenated.
+
+        Args:
+            csv_files (list[str]): Paths of the daily CSV files. Where files
+                overlap, the last one wins.
+            resample (str, optional): Window length of the files. Defaults to
+                ``"10min"``.
+            dtype (np.dtype, optional): Dtype of the columns. Defaults to
+                ``np.float64``.
+
+        Returns:
+            ResultStore: Store holding every row.
+
+        Example:
+            >>> store = ResultStore.read_csv(glob("output/dsar/VG.OJN.00.EHZ/10min/*.csv"))
+        """
+        store = cls(resample, dtype=dtype)
+        for csv_file in csv_files:
+            df = pd.read_csv(csv_file)
+            if df.empty:
+                continue
+            store.append(df.set_index(pd.to_datetime(df.pop("datetime"))))
+        return store
@@ -0,0 +1,362 @@
+# Standard library imports
+import itertools
+import os
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+# Third party imports
+import numpy as np
+import pandas as pd
+from obspy import Stream
+from typing_extensions import Self
+
+# Project imports
+from dsar.frequency_bands import FrequencyBands
+from dsar.utilities import atomic_write
+
+if TYPE_CHECKING:
+    from dsar.core import DSAR
+
+
+def band_key(frequencies: "FrequencyBands | list[float]") -> str:
+    """Return the name of a band in a sweep, built from its frequencies.
+
+    Args:
+        frequencies (FrequencyBands | list[float]): Band or frequency triplet.
+
+    Returns:
+        str: Frequencies joined with ``-``, e.g. ``"0.1-4.5-8"``.
+
+    Example:
+        >>> band_key([0.1, 4.5, 8.0])
+        '0.1-4.5-8'
+    """
+    if isinstance(frequencies, FrequencyBands):
+        frequencies = frequencies.frequencies
+    return "-".join(f"{frequency:g}" for frequency in frequencies)
+
+
+class BandSweep:
+    """Compare many first/second band pairs with a single decode of every day.
+
+    Every day of the DSAR run is loaded and prepared once (alignment, gap
+    segmentation, decimation and transient mask as configured on the DSAR).
+    The distinct bands of all configurations are then reduced in one pass over
+    the decoded day, grouped by high-pass corner so each integration is shared
+    by every band using it and released before the next corner. Each
+    configuration's ratio is the division of two of those band amplitudes, so a
+    sweep costs about one run with as many bands as the grid has distinct bands,
+    instead of one run per configuration.
+
+    Attributes:
+        dsar (DSAR): DSAR calculator providing the data and the processing options.
+        configurations (dict[str, tuple[list[float], list[float]]]): First and
+            second band frequencies of every configuration, by name
+            ``{first}/{second}`` (e.g. ``"0.1-4.5-8/0.1-8-16"``).
+        bands (dict[str, list[float]]): Distinct bands of all configurations.
+        ratios (dict[str, pd.DataFrame]): Ratio of every configuration per NSLC,
+            one column per configuration, filled by :meth:`run`.
+
+    Example:
+        >>> sweep = BandSweep(
+        ...     dsar,
+        ...     BandSweep.grid(
+        ...         first=[[0.1, 1.0, 4.5], [0.1, 2.0, 4.5], [0.1, 4.5, 8.0]],
+        ...         second=[[0.1, 8.0, 16.0], [0.1, 10.0, 20.0]],
+        ...     ),
+        ... ).run()
+        >>> sweep.summary(events=["2025-01-21"])
+    """
+
+    def __init__(
+        self,
+        dsar: "DSAR",
+        configurations: list[
+            tuple[FrequencyBands | list[float], FrequencyBands | list[float]]
+        ],
+    ):
+        """Initialize the sweep.
+
+        Args:
+            dsar (DSAR): DSAR calculator providing the SDS archive (or FDSN
+                source), the date range and the processing options. Its own bands
+                and metrics are not used.
+            configurations (list[tuple[FrequencyBands | list[float],
+                FrequencyBands | list[float]]]): First (numerator) and second
+                (denominator) band of every configuration, see :meth:`grid`.
+
+        Raises:
+            AssertionError: If there is no configuration or a band is not a valid
+                frequency triplet.
+        """
+        assert len(configurations) > 0, "\u274c configurations must not be empty"
+
+        self.dsar = dsar
+        self.configurations: dict[str, tuple[list[float], list[float]]] = {}
+        self.bands: dict[str, list[float]] = {}
+
+        for first, second in configurations:
+            pair = []
+            for band in (first, second):
+                if not isinstance(band, FrequencyBands):
+                    assert len(band) == 3, (
+                        f"\u274c A band must contain exactly 3 values. "
+                        f"Example: [0.1, 8.0, 16.0]. Got {band}"
+                    )
+                    band = FrequencyBands(band_key(band), *band)
+                self.bands[band_key(band)] = band.frequencies
+                pair.append(band.frequencies)
+
+            self.configurations[f"{band_key(pair[0])}/{band_key(pair[1])}"] = (
+                pair[0],
+                pair[1],
+            )
+
+        self.ratios: dict[str, pd.DataFrame] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"BandSweep(nslc={self.dsar.nslc}, "
+            f"configurations={len(self.configurations)}, bands={len(self.bands)})"
+        )
+
+    @staticmethod
+    def grid(
+        first: list[FrequencyBands | list[float]],
+        second: list[FrequencyBands | list[float]],
+    ) -> list[tuple[FrequencyBands | list[float], FrequencyBands | list[float]]]:
+        """Return every pair of a candidate first band and a candidate second band.
+
+        Args:
+            first (list[FrequencyBands | list[float]]): Candidate first bands.
+            second (list[FrequencyBands | list[float]]): Candidate second bands.
+
+        Returns:
+            list[tuple[FrequencyBands | list[float], FrequencyBands | list[float]]]:
+                Configurations, skipping pairs of a band with itself.
+
+        Example:
+            >>> BandSweep.grid([[0.1, 4.5, 8.0]], [[0.1, 8.0, 16.0]])
+            [([0.1, 4.5, 8.0], [0.1, 8.0, 16.0])]
+        """
+        return [
+            (a, b)
+            for a, b in itertools.product(first, second)
+            if band_key(a) != band_key(b)
+        ]
+
+    @property
+    def highpass_groups(self) -> dict[float, dict[str, list[float]]]:
+        """Return the distinct bands grouped by high-pass corner.
+
+        Returns:
+            dict[float, dict[str, list[float]]]: Mapping of high-pass corner to the
+                bands integrated after it.
+        """
+        groups: dict[float, dict[str, list[float]]] = {}
+        for name, frequencies in self.bands.items():
+            groups.setdefault(frequencies[0], {})[name] = frequencies
+        return groups
+
+    def process_day(self, date_str: str, stream: Stream) -> dict[str, pd.DataFrame]:
+        """Compute the ratio of every configuration for a single day.
+
+        Args:
+            date_str (str): Date string in ``YYYY-MM-DD`` format, used for log messages.
+            stream (Stream): Stream returned by :meth:`DSAR.load`.
+
+        Returns:
+            dict[str, pd.DataFrame]: Mapping of NSLC to the window ratios, one
+                column per configuration. Empty if no segment is long enough.
+        """
+        day = self.dsar.prepare_day(date_str, stream, bands=self.bands)
+        if day is None:
+            return {}
+
+        # Band amplitudes (primary statistic) of every NSLC
+        amplitudes: dict[str, dict[str, pd.Series]] = {}
+        for freq, bands in self.highpass_groups.items():
+            dfs = self.dsar.reduce_bands(date_str, day, bands)
+            day.release(freq)
+            for nslc, df in dfs.items():
+                for name in bands:
+                    amplitudes.setdefault(nslc, {})[name] = df[name]
+
+        return {
+            nslc: pd.DataFrame(
+                {
+                    name: columns[band_key(first)] / columns[band_key(second)]
+                    for name, (first, second) in self.configurations.items()
+                }
+            )
+            for nslc, columns in amplitudes.items()
+        }
+
+    def run(self, save: bool = False) -> Self:
+        """Compute the ratios of every configuration over the DSAR date range.
+
+        Args:
+            save (bool, optional): Also write the ratios and the summary with
+                :meth:`save`. Defaults to False.
+
+        Returns:
+            Self: The current sweep with :attr:`ratios` populated.
+
+        Example:
+            >>> sweep = BandSweep(dsar, configurations).run()
+        """
+        print(
+            f"\U0001f9ee {self.dsar.nslc} : Sweeping {len(self.configurations)} "
+            f"configuration(s) over {len(self.bands)} band(s) and "
+            f"{len(self.highpass_groups)} high-pass corner(s)"
+        )
+
+        df_lists: dict[str, list[pd.DataFrame]] = {}
+        for date_str in self.dsar.dates:
+            print(f"\u231b {date_str} : Get stream for {date_str}")
+            stream = self.dsar.load(datetime.strptime(date_str, "%Y-%m-%d"))
+
+            if stream.count() == 0:
+                print(f"\u274c {date_str} : No trace(s) found. Skipping")
+                continue
+
+            try:
+                dfs = self.process_day(date_str, stream)
+            except ValueError as e:
+                print(f"\u274c {date_str} : {e}. Skipping")
+                continue
+
+            for nslc, df in dfs.items():
+                df_lists.setdefault(nslc, []).append(df)
+
+        self.ratios = {}
+        for nslc, df_list in df_lists.items():
+            df = pd.concat(df_list).sort_index()
+            self.ratios[nslc] = df.loc[~df.index.duplicated(keep="last"), :]
+
+        if save:
+            self.save()
+
+        return self
+
+    @property
+    def default_nslc(self) -> str:
+        """Return the NSLC summarized by default.
+
+        Returns:
+            str: The combined NSLC in multi-component mode, otherwise the DSAR
+                NSLC.
+        """
+        if self.dsar.combined_id is not None:
+            return self.dsar.combined_id
+        return self.dsar.nslc
+
+    def summary(
+        self, nslc: str = None, events: list[str] = None, before: str = "7D"
+    ) -> pd.DataFrame:
+        """Summarize every configuration to rank them.
+
+        Columns:
+
+        - ``windows``: number of windows with a ratio.
+        - ``median``, ``p5``, ``p95``: distribution of the ratio.
+        - ``range``: ``p95 / p5``, how far the ratio moves over the period.
+        - ``jitter``: median absolute change of ``log10`` of the ratio from one
+          window to the next, the short-term noise of the series.
+        - ``daily_std``: standard deviation of ``log10`` of the daily medians,
+          the day-to-day variability.
+        - ``contrast``: with ``events``, the median ratio within ``before`` each
+          event divided by the median ratio outside those periods.
+
+        Configurations are ranked by decreasing ``contrast`` when ``events`` are
+        given, otherwise by increasing ``jitter``.
+
+        Args:
+            nslc (str, optional): NSLC summarized. Defaults to :attr:`default_nslc`.
+            events (list[str], optional): Dates or times of known events (e.g.
+                eruptions) the ratio should rise before. Defaults to None.
+            before (str, optional): Period before each event compared with the
+                rest of the series. Defaults to ``"7D"``.
+
+        Returns:
+            pd.DataFrame: One row per configuration, indexed by name, with a
+                ``rank`` column.
+
+        Example:
+            >>> sweep.summary(events=["2025-01-21", "2025-03-02"]).head()
+        """
+        nslc = self.default_nslc if nslc is None else nslc
+        assert nslc in self.ratios, f"\u274c No ratios for {nslc}. Run the sweep first"
+
+        df = self.ratios[nslc]
+        logs = np.log10(df.where(df > 0))
+
+        summary = pd.DataFrame(
+            {
+                "windows": df.count(),
+                "median": df.median(),
+                "p5": df.quantile(0.05),
+                "p95": df.quantile(0.95),
+                "jitter": logs.diff().abs().median(),
+                "daily_std": logs.resample("1D").median().std(),
+            }
+        )
+        summary.insert(4, "range", summary["p95"] / summary["p5"])
+        summary.index.name = "configuration"
+
+        if events is not None:
+            precursory = np.zeros(len(df), dtype=bool)
+            for event in events:
+                event = pd.Timestamp(event)
+                precursory |= (df.index >= event - pd.Timedelta(before)) & (
+                    df.index < event
+                )
+            summary["contrast"] = df[precursory].median() / df[~precursory].median()
+            summary = summary.sort_values("contrast", ascending=False)
+        else:
+            summary = summary.sort_values("jitter")
+
+        summary["rank"] = np.arange(1, len(summary) + 1)
+        return summary
+
+    def save(self, output_dir: str = None) -> list[str]:
+        """Write the ratios and the summary of every NSLC to CSV files.
+
+        Files are written to ``{output_dir}/{nslc}/{resample}`` as
+        ``{nslc}_{start_date}_{end_date}_ratios.csv`` and
+        ``{nslc}_{start_date}_{end_date}_summary.csv``.
+
+        Args:
+            output_dir (str, optional): Output directory. Defaults to ``sweep``
+                next to the DSAR output directory (e.g. ``output/sweep``).
+
+        Returns:
+            list[str]: Paths of the CSV files written.
+        """
+        if output_dir is None:
+            dsar_dir = self.dsar.output_dir or os.path.join(
+                os.getcwd(), "output", "dsar"
+            )
+            output_dir = os.path.join(
+                os.path.dirname(os.path.normpath(dsar_dir)), "sweep"
+            )
+
+        csv_files: list[str] = []
+        for nslc, df in self.ratios.items():
+            csv_directory = os.path.join(output_dir, nslc, self.dsar.resample)
+            os.makedirs(csv_directory, exist_ok=True)
+
+            prefix = os.path.join(
+                csv_directory,
+                f"{nslc}_{self.dsar.start_date}_{self.dsar.end_date}",
+            )
+            for csv_file, table in (
+                (f"{prefix}_ratios.csv", df),
+                (f"{prefix}_summary.csv", self.summary(nslc)),
+            ):
+                with atomic_write(csv_file, newline="") as f:
+                    table.to_csv(f, index=True)
+                print(f"\U0001f4be {nslc} : Saved to {csv_file}")
+                csv_files.append(csv_file)
+
+        return csv_files
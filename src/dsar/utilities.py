@@ -1,5 +1,10 @@
 # Standard library imports
+import os
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from typing import IO, Any
 
 # Third party imports
 import numpy as np
@@ -7,6 +12,94 @@ import pandas as pd
 from obspy import Stream, Trace, UTCDateTime
 from obspy.clients.filesystem.sds import Client
 
+# Permissions of files created by atomic_write, as open() would create them
+_umask = os.umask(0)
+os.umask(_umask)
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = "w", **kwargs: Any) -> Iterator[IO]:
+    """Write a file through a unique temporary file renamed over ``path``.
+
+    Readers never see a truncated file, and concurrent writers of the same
+    ``path`` never share a temporary file: the last rename wins. The temporary
+    file is removed if writing fails.
+
+    Args:
+        path (str): Path of the file written.
+        mode (str, optional): Mode the temporary file is opened with, ``"w"`` or
+            ``"wb"``. Defaults to ``"w"``.
+        **kwargs (Any): Passed to :func:`os.fdopen`, e.g. ``encoding``.
+
+    Yields:
+        IO: The open temporary file.
+
+    Example:
+        >>> with atomic_write("output/state.json", encoding="utf-8") as f:
+        ...     json.dump(state, f)
+    """
+    directory, filename = os.path.split(path)
+    fd, tmp_file = tempfile.mkstemp(
+        dir=directory or None, prefix=f".{filename}.", suffix=".tmp"
+    )
+    try:
+        os.chmod(tmp_file, 0o666 & ~_umask)
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp_file, path)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive lock on ``path`` shared by every thread and process.
+
+    The lock is taken on a ``{path}.lock`` file next to ``path``, so the
+    read-modify-write of a file shared by several workers is not interleaved.
+
+    Args:
+        path (str): Path of the file protected by the lock.
+
+    Yields:
+        None: While the lock is held.
+
+    Example:
+        >>> with file_lock(csv_file):
+        ...     df = pd.read_csv(csv_file)
+        ...     df.to_csv(csv_file)
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(f"{path}.lock", "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
 
 def fill_streams(client: Client, station: str, date: UTCDateTime) -> Stream:
     """Load a seismic stream from an SDS client for a given station and date.
@@ -97,6 +190,126 @@ def trace_to_series(trace: Trace) -> pd.Series:
     return _series
 
 
+def stream_to_array(stream: Stream) -> tuple[np.ndarray, UTCDateTime, float, list[str]]:
+    """Align the traces of a Stream on a common sample grid, one row per trace ID.
+
+    Traces sharing an ID (e.g. the segments of a gappy day) are placed on the same
+    row. Samples that are missing or masked are set to ``NaN``.
+
+    Args:
+        stream (Stream): ObsPy Stream whose traces share the same sampling rate.
+
+    Returns:
+        tuple[np.ndarray, UTCDateTime, float, list[str]]: The ``(n_ids, npts)``
+            float64 array, the time of its first sample, the sampling rate in Hz,
+            and the trace ID of every row.
+
+    Raises:
+        ValueError: If the stream is empty or its traces have different sampling
+            rates.
+
+    Example:
+        >>> data, starttime, sampling_rate, ids = stream_to_array(stream)
+    """
+    if len(stream) == 0:
+        raise ValueError("Stream is empty")
+
+    sampling_rates = {trace.stats.sampling_rate for trace in stream}
+    if len(sampling_rates) > 1:
+        raise ValueError(f"Traces have different sampling rates: {sampling_rates}")
+    sampling_rate = sampling_rates.pop()
+
+    starttime: UTCDateTime = min(trace.stats.starttime for trace in stream)
+    endtime: UTCDateTime = max(trace.stats.endtime for trace in stream)
+    ids: list[str] = list(dict.fromkeys(trace.id for trace in stream))
+
+    npts = int(round((endtime - starttime) * sampling_rate)) + 1
+    data = np.full((len(ids), npts), np.nan)
+
+    for trace in stream:
+        offset = int(round((trace.stats.starttime - starttime) * sampling_rate))
+        data[ids.index(trace.id), offset : offset + trace.stats.npts] = np.ma.filled(
+            np.ma.asarray(trace.data, dtype=np.float64), np.nan
+        )
+
+    return data, starttime, sampling_rate, ids
+
+
+def merge_stream(stream: Stream, fill_value: Any = "interpolate") -> Stream:
+    """Merge the traces of a Stream and record the samples filled in its gaps.
+
+    Calls ``Stream.merge``. When gaps are filled (``fill_value`` is not None), the
+    ``[start, end)`` sample offsets of every filled span are stored in the
+    ``stats.filled`` list of each merged trace, so filled samples can be told
+    apart from recorded ones later on, see :func:`filled_samples`.
+
+    Args:
+        stream (Stream): Stream read from a miniSEED file.
+        fill_value (Any, optional): Value used to merge gaps, passed to
+            ``Stream.merge``. Defaults to ``"interpolate"``.
+
+    Returns:
+        Stream: The merged stream.
+
+    Example:
+        >>> stream = merge_stream(read(filepath), fill_value="interpolate")
+        >>> stream[0].stats.filled
+        [[2160000, 2880000]]
+    """
+    if fill_value is None:
+        return stream.merge(fill_value=fill_value)
+
+    # (id, time of the last sample before the gap, number of missing samples)
+    gaps = [
+        (".".join(gap[:4]), gap[4], int(gap[7]))
+        for gap in stream.get_gaps()
+        if gap[6] > 0
+    ]
+
+    stream = stream.merge(fill_value=fill_value)
+    for trace in stream:
+        filled: list[list[int]] = []
+        for trace_id, before, nsamples in gaps:
+            if trace_id != trace.id:
+                continue
+            start = (
+                int(round((before - trace.stats.starttime) * trace.stats.sampling_rate))
+                + 1
+            )
+            filled.append([start, start + nsamples])
+        trace.stats.filled = filled
+
+    return stream
+
+
+def filled_samples(
+    stream: Stream, starttime: UTCDateTime, npts: int, ids: list[str]
+) -> np.ndarray:
+    """Flag the samples of the :func:`stream_to_array` grid filled by a merge.
+
+    Args:
+        stream (Stream): Stream aligned by :func:`stream_to_array`, merged by
+            :func:`merge_stream`. Traces without ``stats.filled`` are taken as
+            fully recorded.
+        starttime (UTCDateTime): Time of the first sample of the grid.
+        npts (int): Number of samples of the grid.
+        ids (list[str]): Trace ID of every row of the grid.
+
+    Returns:
+        np.ndarray: ``(n_ids, npts)`` boolean flag, True where a sample was filled
+            in a gap.
+    """
+    filled = np.zeros((len(ids), npts), dtype=bool)
+    for trace in stream:
+        offset = int(
+            round((trace.stats.starttime - starttime) * trace.stats.sampling_rate)
+        )
+        row = filled[ids.index(trace.id)]
+        for start, end in trace.stats.get("filled", []):
+            row[offset + start : offset + end] = True
+    return filled
+
+
 def trace_to_dataframe(trace: Trace) -> pd.DataFrame:
     """Convert an ObsPy Trace to a single-column pandas DataFrame.
 
@@ -115,7 +328,9 @@ def trace_to_dataframe(trace: Trace) -> pd.DataFrame:
     return trace_to_series(trace).to_frame()
 
 
-def calculate_per_band(frequencies: list[float], trace: Trace, corners: int = 4) -> pd.Series:
+def calculate_per_band(
+    frequencies: list[float], trace: Trace, corners: int = 4
+) -> pd.Series:
     """Apply a bandpass filter to a trace and return amplitude as a Series.
 
     Filters the trace between the first and last values in ``frequencies`` using a
@@ -253,3 +468,40 @@ def get_combined_csv(directory: str, station: str, resample: str) -> pd.DataFram
     )
 
     return df
+
+
+def combine_csv_files(csv_files: list[str]) -> pd.DataFrame:
+    """Combine daily DSAR CSV files into a single DataFrame.
+
+    Empty files are skipped; rows with missing values and duplicated rows are
+    removed, and the result is sorted by datetime.
+
+    Args:
+        csv_files (list[str]): Paths of the daily CSV files written by
+            :meth:`DSAR.save`.
+
+    Returns:
+        pd.DataFrame: Combined DataFrame with a ``datetime`` DatetimeIndex, or an
+            empty DataFrame if every file is empty.
+
+    Example:
+        >>> df = combine_csv_files(glob("output/dsar/VG.OJN.00.EHZ/10min/*.csv"))
+    """
+    df_list: list[pd.DataFrame] = []
+
+    for csv in csv_files:
+        df = pd.read_csv(csv)
+        if not df.empty:
+            df_list.append(df)
+
+    if len(df_list) == 0:
+        return pd.DataFrame()
+
+    big_df = pd.concat(df_list, ignore_index=True)
+    big_df = big_df.dropna()
+    big_df = big_df.sort_values(by=["datetime"])
+    big_df = big_df.drop_duplicates(keep="last")
+    big_df = big_df.set_index("datetime")
+    big_df.index = pd.to_datetime(big_df.index)
+
+    return big_df
@@ -0,0 +1,64 @@
+# Standard library imports
+import io
+from collections.abc import Callable
+from datetime import datetime
+
+# Third party imports
+import numpy as np
+import pytest
+from obspy import Trace, UTCDateTime
+
+# Sampling rate of the test days, high enough for the default DSAR bands
+sampling_rate: float = 40.0
+
+
+def make_day(
+    date: datetime,
+    network: str = "VG",
+    station: str = "OJN",
+    location: str = "00",
+    channel: str = "EHZ",
+    seconds: float = 86400.0,
+) -> bytes:
+    """Return a day of miniSEED: noise plus a 3 Hz tone, as int32 counts.
+
+    Args:
+        date (datetime): Day of the samples.
+        network (str, optional): Network code. Defaults to ``"VG"``.
+        station (str, optional): Station code. Defaults to ``"OJN"``.
+        location (str, optional): Location code. Defaults to ``"00"``.
+        channel (str, optional): Channel code. Defaults to ``"EHZ"``.
+        seconds (float, optional): Length of the record from midnight. Defaults
+            to a whole day.
+
+    Returns:
+        bytes: STEIM2 compressed miniSEED records.
+    """
+    npts = int(seconds * sampling_rate)
+    rng = np.random.default_rng(date.toordinal())
+    time = np.arange(npts) / sampling_rate
+    data = 500 * np.sin(2 * np.pi * 3.0 * time) + rng.normal(0, 200, npts)
+
+    trace = Trace(data=np.round(data).astype(np.int32))
+    trace.stats.network = network
+    trace.stats.station = station
+    trace.stats.location = location
+    trace.stats.channel = channel
+    trace.stats.sampling_rate = sampling_rate
+    trace.stats.starttime = UTCDateTime(date)
+
+    buffer = io.BytesIO()
+    trace.write(buffer, format="MSEED", encoding="STEIM2")
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope="session")
+def mseed_day() -> Callable[..., bytes]:
+    """Builder of miniSEED days, see :func:`make_day`."""
+    return make_day
+
+
+@pytest.fixture(scope="session")
+def day() -> bytes:
+    """An hour of miniSEED recorded on 2025-01-01."""
+    return make_day(datetime(2025, 1, 1), seconds=3600.0)
@@ -0,0 +1,169 @@
+# Standard library imports
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Third party imports
+import pytest
+import requests
+
+# Project imports
+from dsar.core import DSAR
+from dsar.fdsn import FDSNClient, FDSNSource
+
+days: tuple[str, ...] = ("2025-01-01", "2025-01-03")
+
+
+class FakeDataselect(BaseHTTPRequestHandler):
+    """Dataselect ``query`` endpoint serving the canned days of its server.
+
+    The server holds ``days`` (miniSEED of every ``(nslc, date)``), ``failures``
+    (error status codes answered first, one per request) and ``queries`` (the
+    body of every request received).
+    """
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"])).decode()
+        self.server.queries.append(body)
+
+        if len(self.server.failures) > 0:
+            self.send_response(self.server.failures.pop(0))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        data = b""
+        for line in body.splitlines():
+            fields = line.split()
+            if len(fields) != 6:
+                continue
+            network, station, location, channel, start, _ = fields
+            location = "" if location == "--" else location
+            nslc = f"{network}.{station}.{location}.{channel}"
+            data += self.server.days.get((nslc, start[:10]), b"")
+
+        if len(data) == 0:
+            self.send_response(204)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/vnd.fdsn.mseed")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def canned_days(mseed_day) -> dict[tuple[str, str], bytes]:
+    return {
+        ("VG.OJN.00.EHZ", date_str): mseed_day(datetime.strptime(date_str, "%Y-%m-%d"))
+        for date_str in days
+    }
+
+
+@pytest.fixture
+def server(canned_days):
+    """A local FDSN web service with whole days of 2025-01-01 and 2025-01-03."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FakeDataselect)
+    httpd.days = canned_days
+    httpd.failures = []
+    httpd.queries = []
+
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def base_url(server) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_get_full_day(server):
+    client = FDSNClient(base_url(server))
+    source = FDSNSource(client, station="OJN", channel="EHZ")
+
+    stream = source.get(datetime(2025, 1, 1))
+
+    assert len(stream) == 1
+    assert stream[0].id == "VG.OJN.00.EHZ"
+    assert stream[0].stats.npts == 86400 * stream[0].stats.sampling_rate
+    assert source.files[0]["date"] == "2025-01-01"
+
+
+def test_get_fetches_days_in_bulk(server, tmp_path):
+    client = FDSNClient(base_url(server), sds_dir=str(tmp_path))
+    client.add("VG.OJN.00.EHZ", ["2025-01-01", "2025-01-02", "2025-01-03"])
+    source = FDSNSource(client, station="OJN", channel="EHZ")
+
+    assert len(source.get(datetime(2025, 1, 1))) == 1
+    assert len(source.get(datetime(2025, 1, 3))) == 1
+    assert len(server.queries) == 1
+    assert sorted(p.name for p in tmp_path.glob("2025/VG/OJN/EHZ.D/*")) == [
+        "VG.OJN.00.EHZ.D.2025.001",
+        "VG.OJN.00.EHZ.D.2025.003",
+    ]
+
+
+def test_get_empty_day(server):
+    source = FDSNSource(FDSNClient(base_url(server)), station="OJN", channel="EHZ")
+
+    stream = source.get(datetime(2025, 1, 2))
+
+    assert len(stream) == 0
+    assert source.files == []
+
+
+def test_get_retries_http_error(server):
+    server.failures = [503]
+    source = FDSNSource(FDSNClient(base_url(server)), station="OJN", channel="EHZ")
+
+    stream = source.get(datetime(2025, 1, 1))
+
+    assert len(stream) == 1
+    assert len(server.queries) == 2
+
+
+def test_get_http_error_after_retries(server):
+    server.failures = [500, 500]
+    client = FDSNClient(base_url(server), retries=1)
+
+    assert (
+        len(FDSNSource(client, station="OJN", channel="EHZ").get(datetime(2025, 1, 1)))
+        == 0
+    )
+
+    server.failures = [500, 500]
+    client = FDSNClient(base_url(server), retries=1)
+    source = FDSNSource(client, station="OJN", channel="EHZ", raise_errors=True)
+    with pytest.raises(requests.RequestException):
+        source.get(datetime(2025, 1, 1))
+
+
+def test_dsar_run_through_fdsn(server, tmp_path):
+    client = FDSNClient(base_url(server))
+    dsar = DSAR(
+        station="OJN",
+        channel="EHZ",
+        network="VG",
+        location="00",
+        input_dir=str(tmp_path),
+        start_date="2025-01-01",
+        end_date="2025-01-03",
+        output_dir=str(tmp_path / "output"),
+        source=client,
+    )
+
+    dfs = dict(dsar.iter_days())
+
+    assert sorted(dfs) == ["2025-01-01", "2025-01-03"]
+    df = dfs["2025-01-01"]["VG.OJN.00.EHZ"]
+    assert len(df) == 144
+    assert df["DSAR_10min"].notna().all()
+    # All three days were requested together
+    assert len(server.queries) == 1
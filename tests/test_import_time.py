@@ -0,0 +1,61 @@
+# Standard library imports
+import subprocess
+import sys
+
+# Budget of ``import dsar`` in milliseconds. It takes about 3 ms, as every
+# submodule is imported on first attribute access.
+import_budget_ms: float = 25.0
+
+# Modules ``import dsar.core`` must not load: they are only needed to plot, to
+# decimate or filter, or to fetch days from an FDSN web service.
+heavy_modules: tuple[str, ...] = ("matplotlib", "scipy.signal", "requests")
+
+
+def import_times(statement: str) -> dict[str, int]:
+    """Run a statement with ``-X importtime`` in a fresh interpreter.
+
+    Args:
+        statement (str): Python statement, e.g. ``"import dsar"``.
+
+    Returns:
+        dict[str, int]: Cumulative import time of every module, in microseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_dsar_within_budget():
+    # Best of three runs, so a busy machine does not fail the test
+    elapsed_ms = min(import_times("import dsar")["dsar"] for _ in range(3)) / 1000
+
+    assert (
+        elapsed_ms < import_budget_ms
+    ), f"import dsar took {elapsed_ms:.1f} ms, budget is {import_budget_ms} ms"
+
+
+def test_import_dsar_core_skips_heavy_modules():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, dsar.core; "
+            f"print(','.join(m for m in {heavy_modules!r} if m in sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == "", f"dsar.core loaded {result.stdout.strip()}"
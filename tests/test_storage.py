@@ -0,0 +1,148 @@
+# Standard library imports
+import os
+from datetime import datetime
+
+# Third party imports
+import pytest
+from obspy import read
+
+# Project imports
+from dsar.sds import SDS
+from dsar.storage import S3Storage
+
+boto3 = pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+
+bucket: str = "seismic"
+key: str = "sds/2025/VG/OJN/EHZ.D/VG.OJN.00.EHZ.D.2025.001"
+
+
+@pytest.fixture
+def s3(monkeypatch, day):
+    """A mocked S3 bucket holding one day of the SDS archive below ``sds/``."""
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    with moto.mock_aws():
+        client = boto3.client("s3")
+        client.create_bucket(Bucket=bucket)
+        client.put_object(Bucket=bucket, Key=key, Body=day)
+        client.put_object(Bucket=bucket, Key="sds-other/README", Body=b"other")
+        yield client
+
+
+def test_exists_and_info(s3, day):
+    storage = S3Storage(bucket, prefix="sds")
+
+    assert storage.exists(key)
+    assert not storage.exists("sds/2025/VG/OJN/EHZ.D/VG.OJN.00.EHZ.D.2025.002")
+
+    info = storage.info(key)
+    assert info["size"] == len(day)
+    assert info["version"] == s3.head_object(Bucket=bucket, Key=key)["ETag"]
+
+    with pytest.raises(FileNotFoundError):
+        storage.info("sds/missing")
+
+
+def test_isdir_matches_whole_prefix(s3):
+    assert S3Storage(bucket, prefix="sds").isdir()
+    assert S3Storage(bucket).isdir()
+    assert not S3Storage(bucket, prefix="sd").isdir()
+
+    s3.delete_object(Bucket=bucket, Key=key)
+    # Only "sds-other/README" is left, which is not below "sds/"
+    assert not S3Storage(bucket, prefix="sds").isdir()
+
+
+def test_glob(s3, day):
+    s3.put_object(Bucket=bucket, Key=key.replace("2025.001", "2025.002"), Body=day)
+    s3.put_object(Bucket=bucket, Key="sds/2025/VG/OJN/EHN.D/nested/file", Body=b"")
+    storage = S3Storage(bucket, prefix="sds")
+
+    assert storage.glob("2025/VG/OJN/EHZ.D/*") == [
+        key,
+        key.replace("2025.001", "2025.002"),
+    ]
+    assert storage.glob("2025/VG/OJN/*.D/VG.OJN.00.EHZ.D.2025.00[2-9]") == [
+        key.replace("2025.001", "2025.002")
+    ]
+    # Wildcards do not cross "/"
+    assert storage.glob("2025/VG/OJN/EHN.D/*") == []
+    assert storage.glob("2024/*/*/*/*") == []
+
+
+def test_open_reads_concurrent_ranges(s3, day):
+    storage = S3Storage(bucket, prefix="sds", chunk_size=1024, max_connections=4)
+
+    source = storage.open(key)
+
+    assert source.read() == day
+    assert read(storage.open(key), format="MSEED")[0].stats.npts == 3600 * 40
+
+
+def test_sds_reads_day_from_s3(s3, tmp_path):
+    storage = S3Storage(bucket, prefix="sds", cache_dir=str(tmp_path / "cache"))
+    sds = SDS("s3://seismic/sds", station="OJN", channel="EHZ", storage=storage)
+
+    stream = sds.get(datetime(2025, 1, 1))
+
+    assert len(stream) == 1
+    assert stream[0].id == "VG.OJN.00.EHZ"
+    assert stream[0].stats.npts == 3600 * 40
+    assert len(sds.get(datetime(2025, 1, 2))) == 0
+
+
+def test_sds_rejects_missing_prefix(s3):
+    with pytest.raises(FileNotFoundError):
+        SDS(
+            "s3://seismic/sd",
+            station="OJN",
+            channel="EHZ",
+            storage=S3Storage(bucket, prefix="sd"),
+        )
+
+
+def test_read_through_cache_hit(s3, tmp_path, day, monkeypatch):
+    storage = S3Storage(bucket, prefix="sds", cache_dir=str(tmp_path))
+    local_path = storage.open(key)
+
+    with open(local_path, "rb") as f:
+        assert f.read() == day
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached object read again")
+
+    monkeypatch.setattr(storage, "read", fail)
+    assert storage.open(key) == local_path
+    # Only the copy and its header, no temporary file left behind
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        [os.path.basename(local_path), f"{os.path.basename(local_path)}.json"]
+    )
+
+
+def test_read_through_cache_invalidated_on_change(s3, tmp_path):
+    storage = S3Storage(bucket, prefix="sds", cache_dir=str(tmp_path))
+    local_path = storage.open(key)
+
+    s3.put_object(Bucket=bucket, Key=key, Body=b"rewritten")
+
+    assert storage.open(key) == local_path
+    with open(local_path, "rb") as f:
+        assert f.read() == b"rewritten"
+
+
+def test_read_through_cache_evicts_least_recently_used(s3, tmp_path, day):
+    other = key.replace("2025.001", "2025.002")
+    s3.put_object(Bucket=bucket, Key=other, Body=day)
+    storage = S3Storage(
+        bucket, prefix="sds", cache_dir=str(tmp_path), cache_max_bytes=len(day)
+    )
+
+    first = storage.open(key)
+    os.utime(f"{first}.json", (0, 0))
+    second = storage.open(other)
+
+    assert not os.path.exists(first)
+    assert os.path.exists(second)